@@ -0,0 +1,8 @@
+#!/bin/sh
+set -e
+
+echo "--- Delivering Pending Outbox Events ---"
+
+python manage.py consume_outbox --once --purge-after-hours 24
+
+echo "--- Outbox Delivery Finished ---"
@@ -0,0 +1,8 @@
+#!/bin/sh
+set -e
+
+echo "--- Detecting Favorite Price Drops And Restocks ---"
+
+python manage.py detect_favorite_alerts
+
+echo "--- Favorite Alerts Detection Finished ---"
@@ -0,0 +1,8 @@
+#!/bin/sh
+set -e
+
+echo "--- Running Expired Carts GC ---"
+
+python manage.py gc_carts --sleep 0.05
+
+echo "--- Expired Carts GC Finished ---"
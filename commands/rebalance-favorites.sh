@@ -0,0 +1,8 @@
+#!/bin/sh
+set -e
+
+echo "--- Rebalancing Favorite Item Positions ---"
+
+python manage.py rebalance_favorite_positions --sleep 0.05
+
+echo "--- Favorite Positions Rebalance Finished ---"
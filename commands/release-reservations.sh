@@ -0,0 +1,8 @@
+#!/bin/sh
+set -e
+
+echo "--- Releasing Expired Stock Reservations ---"
+
+python manage.py release_expired_reservations --sleep 0.05 --reconcile
+
+echo "--- Stock Reservations Sweep Finished ---"
@@ -0,0 +1,8 @@
+#!/bin/sh
+set -e
+
+echo "--- Syncing Catalog From The CSV Feed ---"
+
+python manage.py sync_catalog
+
+echo "--- Catalog Sync Finished ---"
@@ -18,13 +18,18 @@ from .favorites import (
     FavoriteItemSerializer,
     FavoriteCollectionPrivacyToggleResponseSerializer,
     FavoriteItemsBulkDeleteRequestSerializer,
+    FavoriteItemsBulkAddRequestSerializer,
+    FavoriteItemsMoveRequestSerializer,
+    FavoriteItemsBulkResponseSerializer,
+    FavoriteCollectionDuplicateRequestSerializer,
     FavoriteCountResponseSerializer,
     FavoriteTotalValueResponseSerializer
 )
 
 from .cart import (
     CartToggleResponseSerializer,
-    CartSummarySerializer
+    CartSummarySerializer,
+    CheckoutResponseSerializer
 )
 
 from .common import (
@@ -37,6 +42,7 @@ __all__ = [
     # Cart serializers
     'CartToggleResponseSerializer',
     'CartSummarySerializer',
+    'CheckoutResponseSerializer',
 
     # Rating serializers
     'RatingCreateUpdateRequestSerializer',
@@ -57,6 +63,10 @@ __all__ = [
     'FavoriteItemSerializer',
     'FavoriteCollectionPrivacyToggleResponseSerializer',
     'FavoriteItemsBulkDeleteRequestSerializer',
+    'FavoriteItemsBulkAddRequestSerializer',
+    'FavoriteItemsMoveRequestSerializer',
+    'FavoriteItemsBulkResponseSerializer',
+    'FavoriteCollectionDuplicateRequestSerializer',
     'FavoriteCountResponseSerializer',
     'FavoriteTotalValueResponseSerializer',
 
@@ -13,3 +13,12 @@ class CartSummarySerializer(serializers.Serializer):
     total_value = serializers.DecimalField(max_digits=14, decimal_places=2)
     total_quantity = serializers.IntegerField()
     items_count = serializers.IntegerField()
+
+
+class CheckoutResponseSerializer(serializers.Serializer):
+    order_id = serializers.IntegerField()
+    status = serializers.CharField()
+    currency = serializers.CharField()
+    items_count = serializers.IntegerField()
+    total_quantity = serializers.IntegerField()
+    total_amount = serializers.DecimalField(max_digits=14, decimal_places=2)
@@ -55,56 +55,41 @@ class UserFavoritesCountResponseSerializer(serializers.Serializer):
     count = serializers.IntegerField()
 
 
-class FavoriteItemPositionSerializer(serializers.Serializer):
-    item_id = serializers.IntegerField()
-    position = serializers.IntegerField(min_value=1)
+class FavoriteItemMoveSerializer(serializers.Serializer):
+    item_id = serializers.IntegerField(min_value=1)
+    before_id = serializers.IntegerField(
+        min_value=1,
+        required=False,
+        allow_null=True,
+        default=None,
+        help_text="Item to place the moved item in front of",
+    )
+    after_id = serializers.IntegerField(
+        min_value=1,
+        required=False,
+        allow_null=True,
+        default=None,
+        help_text="Item to place the moved item right behind; with neither id the item moves to the end",
+    )
 
-    def validate_item_id(self, value):
-        if value <= 0:
-            raise serializers.ValidationError('Item ID must be a positive integer')
-        return value
+    def validate(self, attrs):
+        if attrs.get('before_id') is not None and attrs.get('after_id') is not None:
+            raise serializers.ValidationError('Provide either before_id or after_id, not both')
+        return attrs
 
 
 class FavoriteCollectionReorderRequestSerializer(serializers.Serializer):
-    items = FavoriteItemPositionSerializer(many=True)
+    moves = FavoriteItemMoveSerializer(many=True)
 
-    def validate_items(self, value):
+    def validate_moves(self, value):
         if not value:
-            raise serializers.ValidationError('At least one item is required')
+            raise serializers.ValidationError('At least one move is required')
 
         if len(value) > 100:
-            raise serializers.ValidationError('Too many items. Maximum 100 items per request')
-
-        item_ids = []
-        positions = []
-        for item in value:
-            item_ids.append(item['item_id'])
-            positions.append(item['position'])
-
-        if len(item_ids) != len(set(item_ids)):
-            raise serializers.ValidationError('Duplicate item IDs are not allowed')
-
-        if len(positions) != len(set(positions)):
-            raise serializers.ValidationError('Duplicate positions are not allowed')
-
-        positions.sort()
-        expected_positions = list(range(1, len(positions) + 1))
-        if positions != expected_positions:
-            raise serializers.ValidationError(
-                f'Positions must be sequential starting from 1. '
-                f'Expected: {expected_positions}, got: {positions}'
-            )
+            raise serializers.ValidationError('Too many moves. Maximum 100 moves per request')
 
         return value
 
-    def validate(self, attrs):
-        items = attrs.get('items', [])
-
-        if not items:
-            raise serializers.ValidationError('Items list cannot be empty')
-
-        return attrs
-
 
 class CurrencySerializer(serializers.ModelSerializer):
     class Meta:
@@ -183,10 +168,54 @@ class FavoriteItemsBulkDeleteRequestSerializer(serializers.Serializer):
         return list(set(value))
 
 
+class FavoriteItemsBulkAddRequestSerializer(serializers.Serializer):
+    product_ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False
+    )
+
+    def validate_product_ids(self, value):
+        if len(value) > 500:
+            raise serializers.ValidationError('Too many products. Max 500 per request.')
+        return list(dict.fromkeys(value))
+
+
+class FavoriteItemsMoveRequestSerializer(serializers.Serializer):
+    target_collection_id = serializers.IntegerField(min_value=1)
+    item_ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False
+    )
+
+    def validate_item_ids(self, value):
+        if len(value) > 500:
+            raise serializers.ValidationError('Too many items. Max 500 per request.')
+        return list(set(value))
+
+
+class FavoriteItemsBulkResponseSerializer(serializers.Serializer):
+    success = serializers.BooleanField(default=True)
+    affected = serializers.IntegerField()
+    skipped = serializers.IntegerField()
+
+
+class FavoriteCollectionDuplicateRequestSerializer(serializers.Serializer):
+    name = serializers.CharField(max_length=255, required=True)
+    description = serializers.CharField(max_length=1000, required=False, allow_blank=True, default='')
+    is_public = serializers.BooleanField(required=False, default=False)
+
+
 class FavoriteCountResponseSerializer(serializers.Serializer):
     count = serializers.IntegerField()
 
 
+class FavoriteCurrencyTotalSerializer(serializers.Serializer):
+    currency = serializers.CharField()
+    symbol = serializers.CharField(allow_blank=True)
+    amount = serializers.DecimalField(max_digits=14, decimal_places=2)
+
+
 class FavoriteTotalValueResponseSerializer(serializers.Serializer):
     total_value = serializers.DecimalField(max_digits=14, decimal_places=2)
     currency_symbol = serializers.CharField(allow_null=True, required=False)
+    totals = FavoriteCurrencyTotalSerializer(many=True, required=False)
@@ -1,3 +1,147 @@
-from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
 
-# Create your tests here.
+from apps.favorites.models import FavoriteCollection, FavoriteItem
+from fixtures.factories.catalog import ProductFactory
+from fixtures.factories.users import UserFactory
+
+
+def make_collection(user, name='Wishlist', products=(), is_public=False):
+    collection = FavoriteCollection.objects.create(user=user, name=name, is_public=is_public)
+    for product in products:
+        collection.add_product(product)
+    return collection
+
+
+class FavoriteBulkAPITests(APITestCase):
+
+    def setUp(self):
+        self.owner = UserFactory()
+        self.stranger = UserFactory()
+        self.products = [ProductFactory() for _ in range(3)]
+        self.collection = make_collection(self.owner, products=self.products[:1])
+        self.client.force_authenticate(self.owner)
+
+    def product_ids(self, collection):
+        return list(
+            FavoriteItem.objects.filter(collection=collection)
+            .order_by('position')
+            .values_list('product_id', flat=True)
+        )
+
+    def bulk_add(self, collection, product_ids):
+        url = reverse('api:favorite_collection_items_bulk_add', kwargs={'collection_id': collection.pk})
+        return self.client.post(url, {'product_ids': product_ids}, format='json')
+
+    def move(self, collection, target, item_ids):
+        url = reverse('api:favorite_collection_items_move', kwargs={'collection_id': collection.pk})
+        return self.client.post(url, {'target_collection_id': target.pk, 'item_ids': item_ids}, format='json')
+
+    def duplicate(self, collection, name):
+        url = reverse('api:favorite_collection_duplicate', kwargs={'collection_id': collection.pk})
+        return self.client.post(url, {'name': name}, format='json')
+
+    def test_bulk_add_appends_new_products_in_order(self):
+        existing, first, second = self.products
+
+        response = self.bulk_add(self.collection, [second.pk, existing.pk, first.pk, 999999])
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual((response.data['affected'], response.data['skipped']), (2, 2))
+        self.assertEqual(self.product_ids(self.collection), [existing.pk, second.pk, first.pk])
+        self.collection.refresh_from_db()
+        self.assertEqual(self.collection.items_count, 3)
+
+    def test_bulk_add_requires_ownership(self):
+        foreign = make_collection(self.stranger, is_public=True)
+
+        response = self.bulk_add(foreign, [self.products[1].pk])
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(response.data['message'], 'You do not have permission to add items to this collection.')
+        self.assertEqual(self.product_ids(foreign), [])
+
+    def test_bulk_add_requires_authentication(self):
+        self.client.force_authenticate(None)
+
+        response = self.bulk_add(self.collection, [self.products[1].pk])
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(self.product_ids(self.collection), [self.products[0].pk])
+
+    def test_move_skips_products_already_in_target(self):
+        source = make_collection(self.owner, name='Source', products=self.products)
+        item_ids = list(FavoriteItem.objects.filter(collection=source).values_list('id', flat=True))
+
+        response = self.move(source, self.collection, item_ids)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual((response.data['affected'], response.data['skipped']), (2, 1))
+        self.assertEqual(self.product_ids(self.collection), [product.pk for product in self.products])
+        self.assertEqual(self.product_ids(source), [self.products[0].pk])
+
+    def test_move_from_foreign_collection_is_forbidden(self):
+        foreign = make_collection(self.stranger, products=self.products[1:], is_public=True)
+        item_ids = list(FavoriteItem.objects.filter(collection=foreign).values_list('id', flat=True))
+
+        response = self.move(foreign, self.collection, item_ids)
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(
+            response.data['message'], 'You do not have permission to move items between these collections.'
+        )
+        self.assertEqual(self.product_ids(foreign), [product.pk for product in self.products[1:]])
+
+    def test_move_into_foreign_collection_is_not_found(self):
+        foreign = make_collection(self.stranger, is_public=True)
+        item_ids = list(FavoriteItem.objects.filter(collection=self.collection).values_list('id', flat=True))
+
+        response = self.move(self.collection, foreign, item_ids)
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(self.product_ids(foreign), [])
+
+    def test_move_rejects_items_of_other_collections(self):
+        target = make_collection(self.owner, name='Target')
+        foreign = make_collection(self.stranger, products=self.products[1:2])
+        foreign_item_id = FavoriteItem.objects.get(collection=foreign).pk
+
+        response = self.move(self.collection, target, [foreign_item_id])
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(FavoriteItem.objects.get(pk=foreign_item_id).collection_id, foreign.pk)
+
+    def test_move_to_same_collection_is_rejected(self):
+        item_ids = list(FavoriteItem.objects.filter(collection=self.collection).values_list('id', flat=True))
+
+        response = self.move(self.collection, self.collection, item_ids)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_duplicate_public_collection_of_another_user(self):
+        public = make_collection(self.stranger, products=self.products[1:], is_public=True)
+
+        response = self.duplicate(public, 'Copied')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        copy = FavoriteCollection.objects.get(pk=response.data['collection']['id'])
+        self.assertEqual(copy.user, self.owner)
+        self.assertFalse(copy.is_public)
+        self.assertEqual(self.product_ids(copy), [product.pk for product in self.products[1:]])
+        self.assertEqual(copy.items_count, 2)
+
+    def test_duplicate_private_collection_of_another_user_is_forbidden(self):
+        private = make_collection(self.stranger, products=self.products[1:])
+
+        response = self.duplicate(private, 'Copied')
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(response.data['message'], 'You do not have permission to duplicate this collection.')
+        self.assertFalse(FavoriteCollection.objects.filter(user=self.owner, name='Copied').exists())
+
+    def test_duplicate_with_taken_name_is_rejected(self):
+        response = self.duplicate(self.collection, self.collection.name)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(FavoriteCollection.objects.filter(user=self.owner).count(), 1)
@@ -16,6 +16,11 @@ urlpatterns = [
         views.CartSummaryAPIView.as_view(),
         name="cart_summary"
     ),
+    path(
+        "cart/checkout/",
+        views.CheckoutAPIView.as_view(),
+        name="cart_checkout"
+    ),
 
     # Rating System APIs
     path(
@@ -57,6 +62,21 @@ urlpatterns = [
         views.FavoriteItemsBulkDeleteAPIView.as_view(),
         name='favorite_collection_items_bulk_delete',
     ),
+    path(
+        'favorites/collections/<int:collection_id>/items/bulk-add/',
+        views.FavoriteItemsBulkAddAPIView.as_view(),
+        name='favorite_collection_items_bulk_add',
+    ),
+    path(
+        'favorites/collections/<int:collection_id>/items/move/',
+        views.FavoriteItemsMoveAPIView.as_view(),
+        name='favorite_collection_items_move',
+    ),
+    path(
+        'favorites/collections/<int:collection_id>/duplicate/',
+        views.FavoriteCollectionDuplicateAPIView.as_view(),
+        name='favorite_collection_duplicate',
+    ),
     path(
         'favorites/collections/<int:collection_id>/reorder/',
         views.FavoriteCollectionReorderAPIView.as_view(),
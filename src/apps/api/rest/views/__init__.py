@@ -15,19 +15,24 @@ from .favorites import (
     FavoriteItemsListAPIView,
     FavoriteCollectionPrivacyToggleAPIView,
     FavoriteItemsBulkDeleteAPIView,
+    FavoriteItemsBulkAddAPIView,
+    FavoriteItemsMoveAPIView,
+    FavoriteCollectionDuplicateAPIView,
     FavoriteCollectionItemsCountAPIView,
     FavoriteCollectionTotalValueAPIView
 )
 
 from .cart import (
     CartToggleAPIView,
-    CartSummaryAPIView
+    CartSummaryAPIView,
+    CheckoutAPIView
 )
 
 __all__ = [
     # Cart views
     'CartToggleAPIView',
     'CartSummaryAPIView',
+    'CheckoutAPIView',
 
     # Rating views
     'LikeToggleAPIView',
@@ -45,6 +50,9 @@ __all__ = [
     'FavoriteItemsListAPIView',
     'FavoriteCollectionPrivacyToggleAPIView',
     'FavoriteItemsBulkDeleteAPIView',
+    'FavoriteItemsBulkAddAPIView',
+    'FavoriteItemsMoveAPIView',
+    'FavoriteCollectionDuplicateAPIView',
     'FavoriteCollectionItemsCountAPIView',
     'FavoriteCollectionTotalValueAPIView'
 ]
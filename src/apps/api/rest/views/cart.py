@@ -1,11 +1,18 @@
+from dataclasses import asdict
+
 from rest_framework import status
 from rest_framework.generics import get_object_or_404
-from rest_framework.permissions import AllowAny
+from rest_framework.permissions import AllowAny, IsAuthenticated
 
 from apps.api.rest.choices import CartActionChoices
-from apps.api.rest.serializers import CartToggleResponseSerializer, CartSummarySerializer
+from apps.api.rest.serializers import (
+    CartToggleResponseSerializer,
+    CartSummarySerializer,
+    CheckoutResponseSerializer,
+)
 from apps.api.rest.views.base import BaseAPIView
 from apps.catalog.models import Product
+from apps.orders.checkout import CheckoutError, CheckoutService, OutOfStockError
 
 
 class CartToggleAPIView(BaseAPIView):
@@ -54,3 +61,32 @@ class CartSummaryAPIView(BaseAPIView):
             serializer_class=CartSummarySerializer,
             status_code=status.HTTP_200_OK,
         )
+
+
+class CheckoutAPIView(BaseAPIView):
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        try:
+            order = CheckoutService(request.cart).place_order()
+        except OutOfStockError as exc:
+            return self.return_validation_error(
+                errors={"short_items": [asdict(item) for item in exc.short_items]},
+                status_code=status.HTTP_409_CONFLICT,
+            )
+        except CheckoutError as exc:
+            return self.return_message_error(str(exc))
+
+        data = {
+            "order_id": order.pk,
+            "status": order.status,
+            "currency": order.currency_id,
+            "items_count": order.items_count,
+            "total_quantity": order.total_quantity,
+            "total_amount": order.total_amount,
+        }
+        return self.return_success_response(
+            data=data,
+            serializer_class=CheckoutResponseSerializer,
+            status_code=status.HTTP_201_CREATED,
+        )
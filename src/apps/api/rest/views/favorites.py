@@ -1,4 +1,4 @@
-from django.db.models import Q, Sum, F
+from django.db.models import Q, Sum
 from django.db.models.functions import Coalesce
 from rest_framework.generics import get_object_or_404, ListAPIView
 from rest_framework.permissions import AllowAny
@@ -10,6 +10,9 @@ from django.db import transaction
 from apps.catalog.models import Product
 from apps.favorites.mixins import FavoriteItemsQuerysetMixin
 from apps.favorites.models import FavoriteCollection, FavoriteItem
+from apps.favorites.bulk import DuplicateCollectionNameError, FavoriteBulkOperations
+from apps.favorites.positions import FavoritePositionsService, ItemMove, UnknownItemsError
+from apps.outbox.publisher import FAVORITE_CHANGED, publish
 
 from .base import BaseAPIView
 from ..mixins import FavoriteCollectionPermissionMixin
@@ -26,12 +29,33 @@ from ..serializers import (
     FavoriteItemSerializer,
     FavoriteCollectionPrivacyToggleResponseSerializer,
     FavoriteItemsBulkDeleteRequestSerializer,
+    FavoriteItemsBulkAddRequestSerializer,
+    FavoriteItemsMoveRequestSerializer,
+    FavoriteItemsBulkResponseSerializer,
+    FavoriteCollectionDuplicateRequestSerializer,
     FavoriteCountResponseSerializer,
     FavoriteTotalValueResponseSerializer
 )
 from ..choices import FavoriteActionChoices
 
 
+def get_collection_data(collection):
+    return {
+        'id': collection.id,
+        'name': collection.name,
+        'description': collection.description,
+        'slug': collection.slug,
+        'is_default': collection.is_default,
+        'is_public': collection.is_public,
+        'total_items_count': collection.items_count,
+        'created_at': collection.created_at.isoformat(),
+        'updated_at': collection.updated_at.isoformat(),
+        'formatted_updated_at': collection.updated_at.strftime('%b %d, %Y'),
+        'slider_items': [],
+        'absolute_url': collection.get_absolute_url()
+    }
+
+
 class FavoriteToggleAPIView(BaseAPIView):
 
     def post(self, request, product_id):
@@ -43,8 +67,11 @@ class FavoriteToggleAPIView(BaseAPIView):
                 collection__user=user,
                 product=product
             )
-            if user_favorites_qs.exists():
+            collection_ids = list(user_favorites_qs.values_list('collection_id', flat=True))
+            if collection_ids:
                 user_favorites_qs.delete()
+                FavoriteCollection.refresh_summaries(collection_ids)
+                publish(FAVORITE_CHANGED, [product.pk], {'collection_ids': collection_ids})
                 action = FavoriteActionChoices.REMOVED
             else:
                 default_collection, _ = FavoriteCollection.get_or_create_default(user)
@@ -101,24 +128,9 @@ class FavoriteCollectionCreateAPIView(BaseAPIView):
                 is_default=is_default
             )
 
-        collection_data = {
-            'id': collection.id,
-            'name': collection.name,
-            'description': collection.description,
-            'slug': collection.slug,
-            'is_default': collection.is_default,
-            'is_public': collection.is_public,
-            'total_items_count': 0,
-            'created_at': collection.created_at.isoformat(),
-            'updated_at': collection.updated_at.isoformat(),
-            'formatted_updated_at': collection.updated_at.strftime('%b %d, %Y'),
-            'slider_items': [],
-            'absolute_url': collection.get_absolute_url()
-        }
-
         response_data = {
             'success': True,
-            'collection': collection_data
+            'collection': get_collection_data(collection)
         }
 
         return self.return_success_response(
@@ -195,7 +207,7 @@ class FavoriteCollectionClearView(FavoriteCollectionPermissionMixin, BaseAPIView
 
         self.check_owner_permission(request, collection)
 
-        items_deleted_count, _ = collection.favorite_items.all().delete()
+        items_deleted_count = collection.remove_items()
 
         response_data = {
             'success': True,
@@ -207,7 +219,11 @@ class FavoriteCollectionClearView(FavoriteCollectionPermissionMixin, BaseAPIView
 class UserFavoritesCountView(BaseAPIView):
 
     def get(self, request, *args, **kwargs):
-        count = FavoriteItem.objects.filter(collection__user=request.user).count()
+        count = (
+            FavoriteCollection.objects
+            .filter(user=request.user)
+            .aggregate(count=Coalesce(Sum('items_count'), 0))['count']
+        )
 
         return self.return_success_response(
             data={'count': count},
@@ -227,19 +243,12 @@ class FavoriteCollectionReorderAPIView(FavoriteCollectionPermissionMixin, BaseAP
         if not request_serializer.is_valid():
             return self.return_validation_error(request_serializer.errors)
 
-        items_data = request_serializer.validated_data['items']
-
-        requested_item_ids, position_map = self._extract_items_data(items_data)
-
-        existing_items, missing_ids = self._validate_items_exist(collection, requested_item_ids)
-        if missing_ids:
-            return self.return_validation_error({
-                'items': [f'Items with IDs {list(missing_ids)} do not exist in this collection']
-            })
-
-        self._update_items_positions(existing_items, position_map)
+        moves = [ItemMove(**move) for move in request_serializer.validated_data['moves']]
 
-        self._save_reorder_changes(collection, existing_items)
+        try:
+            FavoritePositionsService(collection).apply_moves(moves)
+        except UnknownItemsError as exc:
+            return self.return_validation_error({'moves': [str(exc)]})
 
         response_data = {
             'success': True,
@@ -252,37 +261,6 @@ class FavoriteCollectionReorderAPIView(FavoriteCollectionPermissionMixin, BaseAP
             status.HTTP_200_OK
         )
 
-    def _extract_items_data(self, items_data):
-        requested_item_ids = []
-        position_map = {}
-        for item in items_data:
-            item_id = item['item_id']
-            requested_item_ids.append(item_id)
-            position_map[item_id] = item['position']
-        return requested_item_ids, position_map
-
-    def _validate_items_exist(self, collection, requested_item_ids):
-        existing_items = FavoriteItem.objects.filter(
-            collection=collection,
-            id__in=requested_item_ids
-        )
-
-        existing_item_ids = set(existing_items.values_list('id', flat=True))
-        if len(existing_item_ids) != len(requested_item_ids):
-            missing_ids = set(requested_item_ids) - existing_item_ids
-            return None, missing_ids
-
-        return existing_items, None
-
-    def _update_items_positions(self, existing_items, position_map):
-        for item in existing_items:
-            item.position = position_map[item.id]
-
-    def _save_reorder_changes(self, collection, existing_items):
-        with transaction.atomic():
-            FavoriteItem.objects.bulk_update(existing_items, ['position'])
-            collection.save(update_fields=['updated_at'])
-
 
 class FavoriteItemsListAPIView(FavoriteItemsQuerysetMixin, ListAPIView):
     serializer_class = FavoriteItemSerializer
@@ -345,16 +323,103 @@ class FavoriteItemsBulkDeleteAPIView(FavoriteCollectionPermissionMixin, BaseAPIV
         serializer.is_valid(raise_exception=True)
         item_ids = serializer.validated_data['item_ids']
 
-        with transaction.atomic():
-            (
-                FavoriteItem.objects
-                .filter(collection=collection, id__in=item_ids)
-                .delete()
-            )
+        collection.remove_items(item_ids)
 
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
+class FavoriteItemsBulkAddAPIView(FavoriteCollectionPermissionMixin, BaseAPIView):
+
+    def post(self, request, collection_id: int):
+        collection = get_object_or_404(FavoriteCollection, id=collection_id)
+
+        denied = self.check_owner_permission(
+            request, collection,
+            message='You do not have permission to add items to this collection.'
+        )
+        if denied:
+            return denied
+
+        serializer = FavoriteItemsBulkAddRequestSerializer(data=request.data)
+        if not serializer.is_valid():
+            return self.return_validation_error(serializer.errors)
+
+        result = FavoriteBulkOperations(collection).add_products(serializer.validated_data['product_ids'])
+
+        return self.return_success_response(
+            {'success': True, 'affected': result.affected, 'skipped': result.skipped},
+            FavoriteItemsBulkResponseSerializer,
+            status.HTTP_200_OK
+        )
+
+
+class FavoriteItemsMoveAPIView(FavoriteCollectionPermissionMixin, BaseAPIView):
+
+    def post(self, request, collection_id: int):
+        collection = get_object_or_404(FavoriteCollection, id=collection_id)
+
+        denied = self.check_owner_permission(
+            request, collection,
+            message='You do not have permission to move items between these collections.'
+        )
+        if denied:
+            return denied
+
+        serializer = FavoriteItemsMoveRequestSerializer(data=request.data)
+        if not serializer.is_valid():
+            return self.return_validation_error(serializer.errors)
+
+        target = get_object_or_404(
+            FavoriteCollection,
+            id=serializer.validated_data['target_collection_id'],
+            user=request.user
+        )
+        if target.pk == collection.pk:
+            return self.return_validation_error({
+                'target_collection_id': ['Target collection must differ from the source collection']
+            })
+
+        try:
+            result = FavoriteBulkOperations(collection).move_items(target, serializer.validated_data['item_ids'])
+        except UnknownItemsError as exc:
+            return self.return_validation_error({'item_ids': [str(exc)]})
+
+        return self.return_success_response(
+            {'success': True, 'affected': result.affected, 'skipped': result.skipped},
+            FavoriteItemsBulkResponseSerializer,
+            status.HTTP_200_OK
+        )
+
+
+class FavoriteCollectionDuplicateAPIView(BaseAPIView):
+
+    def post(self, request, collection_id: int):
+        collection = get_object_or_404(FavoriteCollection, id=collection_id)
+
+        if not IsOwnerOrPublicReadOnly().has_object_permission(request, self, collection):
+            return self.return_message_error(
+                'You do not have permission to duplicate this collection.',
+                status.HTTP_403_FORBIDDEN
+            )
+
+        serializer = FavoriteCollectionDuplicateRequestSerializer(data=request.data)
+        if not serializer.is_valid():
+            return self.return_validation_error(serializer.errors)
+
+        try:
+            copy = FavoriteBulkOperations(collection).duplicate(request.user, **serializer.validated_data)
+        except DuplicateCollectionNameError:
+            return self.return_validation_error({
+                'name': ['A collection with this name already exists']
+            })
+
+        return self.return_success_response(
+            {'success': True, 'collection': get_collection_data(copy)},
+            FavoriteCollectionCreateResponseSerializer,
+            status.HTTP_201_CREATED
+        )
+
+
 class FavoriteCollectionItemsCountAPIView(FavoriteCollectionPermissionMixin, BaseAPIView):
     permission_classes = [AllowAny]
 
@@ -364,7 +429,7 @@ class FavoriteCollectionItemsCountAPIView(FavoriteCollectionPermissionMixin, Bas
         if not collection.is_public:
             self.check_owner_permission(request, collection)
 
-        count = FavoriteItem.objects.filter(collection=collection).count()
+        count = collection.items_count
 
         return self.return_success_response(
             data={'count': count},
@@ -382,24 +447,14 @@ class FavoriteCollectionTotalValueAPIView(FavoriteCollectionPermissionMixin, Bas
         if not collection.is_public:
             self.check_owner_permission(request, collection)
 
-        agg = (
-            FavoriteItem.objects
-            .filter(collection=collection)
-            .aggregate(total_value=Sum(Coalesce(
-                F('product__inventory__sale_price'),
-                F('product__inventory__base_price')
-            )))
-        )
-
-        total = agg['total_value'] or 0
-
-        currency_symbol = (FavoriteItem.objects
-                           .filter(collection=collection)
-                           .values_list('product__inventory__currency__symbol', flat=True)
-                           .first())
+        primary = collection.primary_total
 
         return self.return_success_response(
-            data={'total_value': total, 'currency_symbol': currency_symbol},
+            data={
+                'total_value': primary['amount'] if primary else 0,
+                'currency_symbol': primary['symbol'] if primary else None,
+                'totals': collection.total_values,
+            },
             serializer_class=FavoriteTotalValueResponseSerializer,
             status_code=status.HTTP_200_OK
         )
@@ -0,0 +1,134 @@
+import time
+from dataclasses import dataclass
+from typing import Iterator, Optional
+
+from django.db import OperationalError, connection, transaction
+from django.utils import timezone
+
+from .models import Cart, CartItem, CartToken
+
+
+@dataclass
+class CartsGCBatch:
+    tokens_deleted: int
+    carts_deleted: int
+    items_deleted: int
+    elapsed: float
+    skipped: bool = False
+
+
+class ExpiredCartsCollector:
+    """
+    Delete expired cart tokens together with their anonymous carts and items.
+
+    Work is done in keyset batches over `cart_carttoken.id`. Each batch is one
+    statement in its own short transaction; rows locked by in-flight requests
+    are skipped (SKIP LOCKED) and picked up by a later run, so the collector
+    never queues behind shoppers. A batch that still hits `lock_timeout` is
+    rolled back, reported as skipped and left to a later run.
+    """
+
+    def __init__(self, batch_size: int = 1000, lock_timeout_ms: int = 1000) -> None:
+        self.batch_size = batch_size
+        self.lock_timeout_ms = lock_timeout_ms
+
+    def count_expired(self, now=None) -> int:
+        now = now or timezone.now()
+        return CartToken.objects.filter(expires_at__lt=now).count()
+
+    def iter_batches(self, now=None, max_batches: Optional[int] = None) -> Iterator[CartsGCBatch]:
+        now = now or timezone.now()
+        after_id = 0
+        batches = 0
+
+        while max_batches is None or batches < max_batches:
+            start_time = time.perf_counter()
+            skipped = False
+            try:
+                last_id, tokens_deleted, carts_deleted, items_deleted = self._delete_batch(now, after_id)
+            except OperationalError:
+                # lock_timeout fired; the atomic block rolled the batch back.
+                last_id, tokens_deleted, carts_deleted, items_deleted = self._batch_last_id(now, after_id), 0, 0, 0
+                skipped = True
+            if last_id is None:
+                return
+
+            after_id = last_id
+            batches += 1
+            yield CartsGCBatch(
+                tokens_deleted=tokens_deleted,
+                carts_deleted=carts_deleted,
+                items_deleted=items_deleted,
+                elapsed=time.perf_counter() - start_time,
+                skipped=skipped,
+            )
+
+    def _batch_last_id(self, now, after_id: int) -> Optional[int]:
+        """Last token id of the keyset range a batch starting after `after_id` covers, read without locks."""
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                SELECT max(id)
+                FROM (
+                    SELECT id
+                    FROM {CartToken._meta.db_table}
+                    WHERE expires_at < %s AND id > %s
+                    ORDER BY id
+                    LIMIT %s
+                ) t
+                """,
+                [now, after_id, self.batch_size],
+            )
+            return cursor.fetchone()[0]
+
+    def _delete_batch(self, now, after_id: int):
+        tokens_table = CartToken._meta.db_table
+        carts_table = Cart._meta.db_table
+        items_table = CartItem._meta.db_table
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(f"SET LOCAL lock_timeout = {int(self.lock_timeout_ms)}")
+            cursor.execute(
+                f"""
+                WITH candidate_tokens AS (
+                    SELECT t.id
+                    FROM {tokens_table} t
+                    WHERE t.expires_at < %(now)s AND t.id > %(after_id)s
+                    ORDER BY t.id
+                    LIMIT %(limit)s
+                    FOR UPDATE SKIP LOCKED
+                ),
+                locked_carts AS (
+                    SELECT c.id
+                    FROM {carts_table} c
+                    WHERE c.token_id IN (SELECT id FROM candidate_tokens)
+                    FOR UPDATE SKIP LOCKED
+                ),
+                deleted_items AS (
+                    DELETE FROM {items_table}
+                    WHERE cart_id IN (SELECT id FROM locked_carts)
+                    RETURNING 1
+                ),
+                deleted_carts AS (
+                    DELETE FROM {carts_table}
+                    WHERE id IN (SELECT id FROM locked_carts)
+                    RETURNING token_id
+                ),
+                deleted_tokens AS (
+                    DELETE FROM {tokens_table} t
+                    WHERE t.id IN (SELECT id FROM candidate_tokens)
+                      AND (
+                          t.id IN (SELECT token_id FROM deleted_carts)
+                          OR NOT EXISTS (SELECT 1 FROM {carts_table} c WHERE c.token_id = t.id)
+                      )
+                    RETURNING 1
+                )
+                SELECT
+                    (SELECT max(id) FROM candidate_tokens),
+                    (SELECT count(*) FROM deleted_tokens),
+                    (SELECT count(*) FROM deleted_carts),
+                    (SELECT count(*) FROM deleted_items)
+                """,
+                {'now': now, 'after_id': after_id, 'limit': self.batch_size},
+            )
+            return cursor.fetchone()
@@ -1,18 +1,71 @@
+from dataclasses import dataclass
+from typing import Optional
+
 from django.conf import settings
+from django.core import signing
 from django.http import HttpRequest, HttpResponse
+from django.utils import timezone
+
+
+@dataclass(frozen=True)
+class CartCookiePayload:
+    cart_id: int
+    token_id: int
+    token: str
+    expires_at: int
+
+    @property
+    def is_expired(self) -> bool:
+        return timezone.now().timestamp() >= self.expires_at
 
 
 class CartCookieManager:
+    SALT = "apps.cart.cookie"
+
     @staticmethod
     def get_token(request: HttpRequest) -> str | None:
         return request.COOKIES.get(settings.CART_COOKIE_NAME)
 
-    @staticmethod
-    def set_token(response: HttpResponse, token: str) -> None:
+    @classmethod
+    def load_payload(cls, value: Optional[str]) -> Optional[CartCookiePayload]:
+        if not value:
+            return None
+
+        try:
+            data = signing.loads(value, salt=cls.SALT)
+        except signing.BadSignature:
+            return None
+
+        try:
+            return CartCookiePayload(
+                cart_id=int(data["c"]),
+                token_id=int(data["t"]),
+                token=str(data["k"]),
+                expires_at=int(data["e"]),
+            )
+        except (KeyError, TypeError, ValueError):
+            return None
+
+    @classmethod
+    def dump_payload(cls, cart, token) -> str:
+        return signing.dumps(
+            {
+                "c": cart.pk,
+                "t": token.pk,
+                "k": token.token,
+                "e": int(token.expires_at.timestamp()),
+            },
+            salt=cls.SALT,
+            compress=True,
+        )
+
+    @classmethod
+    def set_cart(cls, response: HttpResponse, cart, token) -> None:
+        max_age = int((token.expires_at - timezone.now()).total_seconds())
         response.set_cookie(
             key=settings.CART_COOKIE_NAME,
-            value=token,
-            max_age=settings.CART_COOKIE_AGE,
+            value=cls.dump_payload(cart, token),
+            max_age=max(0, min(max_age, settings.CART_COOKIE_AGE)),
             secure=settings.CART_COOKIE_SECURE,
             httponly=settings.CART_COOKIE_HTTPONLY,
             samesite=settings.CART_COOKIE_SAMESITE
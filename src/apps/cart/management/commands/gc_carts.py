@@ -0,0 +1,106 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.cart.cleanup import ExpiredCartsCollector
+
+
+class Command(BaseCommand):
+    help = "Delete expired cart tokens with their anonymous carts and items in small batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            dest="batch_size",
+            type=int,
+            default=1000,
+            help="Number of expired tokens handled per batch/transaction (default: 1000)",
+        )
+        parser.add_argument(
+            "--max-batches",
+            dest="max_batches",
+            type=int,
+            default=None,
+            help="Stop after this many batches (default: run until nothing is left)",
+        )
+        parser.add_argument(
+            "--sleep",
+            dest="sleep",
+            type=float,
+            default=0.0,
+            help="Seconds to pause between batches to leave room for live traffic (default: 0)",
+        )
+        parser.add_argument(
+            "--lock-timeout-ms",
+            dest="lock_timeout_ms",
+            type=int,
+            default=1000,
+            help="lock_timeout applied to each batch in milliseconds (default: 1000)",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            dest="dry_run",
+            default=False,
+            help="Only report how many expired tokens would be collected.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        max_batches = options["max_batches"]
+        sleep = options["sleep"]
+        lock_timeout_ms = options["lock_timeout_ms"]
+        dry_run = options["dry_run"]
+
+        if batch_size <= 0:
+            raise CommandError("batch-size must be positive")
+        if max_batches is not None and max_batches <= 0:
+            raise CommandError("max-batches must be positive")
+
+        collector = ExpiredCartsCollector(batch_size=batch_size, lock_timeout_ms=lock_timeout_ms)
+
+        if dry_run:
+            expired = collector.count_expired()
+            self.stdout.write(self.style.NOTICE(f"{expired:,} expired cart tokens would be collected."))
+            return
+
+        self.stdout.write(self.style.NOTICE(f"Collecting expired carts in batches of {batch_size}..."))
+
+        total_start = time.perf_counter()
+        batches = tokens = carts = items = skipped = 0
+        slowest_batch = 0.0
+
+        for batch in collector.iter_batches(max_batches=max_batches):
+            batches += 1
+            tokens += batch.tokens_deleted
+            carts += batch.carts_deleted
+            items += batch.items_deleted
+            slowest_batch = max(slowest_batch, batch.elapsed)
+
+            if batch.skipped:
+                skipped += 1
+                self.stdout.write(
+                    self.style.WARNING(f"- Batch {batches}: skipped, rows are locked (lock timeout); retry later")
+                )
+            else:
+                self.stdout.write(
+                    f"- Batch {batches}: {batch.tokens_deleted} tokens, {batch.carts_deleted} carts, "
+                    f"{batch.items_deleted} items in {batch.elapsed:.3f}s"
+                )
+
+            if sleep:
+                time.sleep(sleep)
+
+        total_time = time.perf_counter() - total_start
+        rows = tokens + carts + items
+        rate = rows / total_time if total_time > 0 else 0.0
+
+        if skipped:
+            self.stdout.write(self.style.WARNING(f"{skipped} batch(es) skipped because of lock timeouts."))
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Cart GC completed: {tokens:,} tokens, {carts:,} carts, {items:,} items deleted "
+                f"in {batches} batches, {total_time:.3f}s ({rate:,.0f} rows/s, slowest batch {slowest_batch:.3f}s)"
+            )
+        )
@@ -71,6 +71,13 @@ class Command(BaseCommand):
             default=False,
             help="Do not drop indexes or apply PostgreSQL optimizations.",
         )
+        parser.add_argument(
+            "--seed",
+            dest="seed",
+            type=int,
+            default=None,
+            help="Seed for the random generator, to reproduce a run (default: random)",
+        )
 
     def handle(self, *args, **options):
         percentage = options["percentage"]
@@ -120,6 +127,7 @@ class Command(BaseCommand):
                     quantity_range=(min_qty, max_qty),
                     exclude_username=exclude_username,
                     batch_size=batch_size,
+                    seed=options["seed"],
                 )
                 generator.generate()
         except DatabaseError as e:
@@ -1,6 +1,7 @@
 from django.http import HttpRequest, HttpResponse
 
 from .cookies import CartCookieManager
+from .models import Cart
 from .resolver import CartResolver
 
 
@@ -9,16 +10,25 @@ class CartMiddleware:
         self.get_response = get_response
 
     def __call__(self, request: HttpRequest) -> HttpResponse:
-        cart_token_value = CartCookieManager.get_token(request)
-        request.cart = CartResolver.resolve(request, cart_token_value)
+        cart_cookie_value = CartCookieManager.get_token(request)
+        request.cart = CartResolver.resolve(request, cart_cookie_value)
 
         response = self.get_response(request)
 
         if getattr(request, "_cart_token_to_delete", False):
             CartCookieManager.clear_token(response)
 
-        new_token = getattr(request, "_cart_token_to_set", None)
-        if new_token:
-            CartCookieManager.set_token(response, new_token)
+        cookie_to_set = getattr(request, "_cart_cookie_to_set", None)
+        if cookie_to_set:
+            cart, token = cookie_to_set
+            CartCookieManager.set_cart(response, cart, token)
 
         return response
+
+    def process_exception(self, request: HttpRequest, exception: Exception):
+        # Writes to a cookie cart that disappeared recover through the token
+        # lookup; anything else that hits the missing row drops the cookie so
+        # the next request gets a fresh cart.
+        if isinstance(exception, Cart.DoesNotExist) and getattr(request, "_cart_from_cookie", False):
+            setattr(request, "_cart_token_to_delete", True)
+        return None
@@ -1,7 +1,7 @@
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
-from django.db import models
+from django.db import DEFAULT_DB_ALIAS, connection, models
 from django.db.models import F, Sum
 from django.db.models.functions import Coalesce
 from django.utils import timezone
@@ -128,35 +128,91 @@ class Cart(models.Model):
         if quantity <= 0:
             raise ValidationError("Quantity must be positive.")
 
-        item, created = CartItem.objects.get_or_create(
+        return self._upsert_item(product, quantity, increment=True)
+
+    def set_item_quantity(self, product, quantity: int):
+        if quantity <= 0:
+            self._delete_item(product)
+            return None
+
+        return self._upsert_item(product, quantity, increment=False)
+
+    def _upsert_item(self, product, quantity: int, increment: bool):
+        items_table = CartItem._meta.db_table
+        carts_table = Cart._meta.db_table
+        quantity_sql = f"{items_table}.quantity + EXCLUDED.quantity" if increment else "EXCLUDED.quantity"
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                WITH touched AS (
+                    UPDATE {carts_table}
+                    SET updated_at = now()
+                    WHERE id = %s
+                    RETURNING id, updated_at
+                ),
+                upserted AS (
+                    INSERT INTO {items_table} (cart_id, product_id, quantity, created_at, updated_at)
+                    SELECT t.id, %s, %s, now(), now()
+                    FROM touched t
+                    ON CONFLICT (cart_id, product_id) DO UPDATE
+                    SET quantity = {quantity_sql},
+                        updated_at = EXCLUDED.updated_at
+                    RETURNING id, quantity, created_at, updated_at
+                )
+                SELECT u.id, u.quantity, u.created_at, u.updated_at, t.updated_at
+                FROM upserted u
+                CROSS JOIN touched t
+                """,
+                [self.pk, product.pk, quantity],
+            )
+            row = cursor.fetchone()
+
+        if row is None:
+            if self._recover():
+                return self._upsert_item(product, quantity, increment)
+            raise Cart.DoesNotExist(f"Cart {self.pk} no longer exists.")
+
+        item_id, item_quantity, created_at, updated_at, cart_updated_at = row
+        self.updated_at = cart_updated_at
+
+        return CartItem(
+            id=item_id,
             cart=self,
             product=product,
-            defaults={'quantity': quantity},
+            quantity=item_quantity,
+            created_at=created_at,
+            updated_at=updated_at,
         )
-        if not created:
-            CartItem.objects.filter(pk=item.pk).update(quantity=F('quantity') + quantity, updated_at=timezone.now())
-            item.refresh_from_db(fields=['quantity', 'updated_at'])
-        else:
-            item.save()
 
-        self.save(update_fields=['updated_at'])
-        return item
+    def _delete_item(self, product) -> int:
+        items_table = CartItem._meta.db_table
+        carts_table = Cart._meta.db_table
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                WITH deleted AS (
+                    DELETE FROM {items_table}
+                    WHERE cart_id = %s AND product_id = %s
+                    RETURNING id
+                ),
+                touched AS (
+                    UPDATE {carts_table}
+                    SET updated_at = now()
+                    WHERE id = %s AND EXISTS (SELECT 1 FROM deleted)
+                    RETURNING updated_at
+                )
+                SELECT (SELECT count(*) FROM deleted), (SELECT updated_at FROM touched)
+                """,
+                [self.pk, product.pk, self.pk],
+            )
+            deleted, cart_updated_at = cursor.fetchone()
 
-    def set_item_quantity(self, product, quantity: int):
-        try:
-            item = self.items.get(product=product)
-        except CartItem.DoesNotExist:
-            if quantity <= 0:
-                return None
-            return self.add_product(product, quantity=quantity)
+        if cart_updated_at is not None:
+            self.updated_at = cart_updated_at
 
-        if quantity <= 0:
-            item.delete()
-        else:
-            item.quantity = quantity
-            item.save(update_fields=['quantity', 'updated_at'])
-        self.save(update_fields=['updated_at'])
-        return item
+        return deleted
 
     def remove_product(self, product):
         deleted, _ = self.items.filter(product=product).delete()
@@ -166,7 +222,33 @@ class Cart(models.Model):
 
     def clear(self):
         self.items.all().delete()
-        self.save(update_fields=['updated_at'])
+        self.updated_at = timezone.now()
+        if not Cart.objects.filter(pk=self.pk).update(updated_at=self.updated_at) and self._recover():
+            self.clear()
+
+    @classmethod
+    def from_reference(cls, cart_id: int, token_id: int = None, user_id: int = None, on_missing=None) -> 'Cart':
+        """
+        Build a cart instance from known ids without querying; other fields load lazily.
+
+        The row is not checked. When a write finds it gone, `on_missing()` is
+        called once for a live cart and this instance is re-pointed at it.
+        """
+        cart = cls.from_db(DEFAULT_DB_ALIAS, ['id', 'user_id', 'token_id'], [cart_id, user_id, token_id])
+        cart._on_missing = on_missing
+        return cart
+
+    def _recover(self) -> bool:
+        on_missing = getattr(self, '_on_missing', None)
+        if on_missing is None:
+            return False
+
+        self._on_missing = None
+        replacement = on_missing()
+        self.pk, self.user_id, self.token_id = replacement.pk, replacement.user_id, replacement.token_id
+        self.created_at, self.updated_at = replacement.created_at, replacement.updated_at
+        self._state.fields_cache.clear()
+        return True
 
     @classmethod
     def get_or_create_for_user(cls, user: User):
@@ -182,12 +264,51 @@ class Cart(models.Model):
         if other.pk == self.pk:
             return self
 
-        for item in other.items.all():
-            self.add_product(
-                product=item.product,
-                quantity=item.quantity,
+        items_table = CartItem._meta.db_table
+        carts_table = Cart._meta.db_table
+        tokens_table = CartToken._meta.db_table
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                WITH moved AS (
+                    DELETE FROM {items_table}
+                    WHERE cart_id = %(source)s
+                    RETURNING product_id, quantity, created_at
+                ),
+                merged AS (
+                    INSERT INTO {items_table} (cart_id, product_id, quantity, created_at, updated_at)
+                    SELECT %(target)s, product_id, quantity, created_at, now()
+                    FROM moved
+                    ORDER BY product_id
+                    ON CONFLICT (cart_id, product_id) DO UPDATE
+                    SET quantity = {items_table}.quantity + EXCLUDED.quantity,
+                        updated_at = EXCLUDED.updated_at
+                    RETURNING 1
+                ),
+                dropped_cart AS (
+                    DELETE FROM {carts_table}
+                    WHERE id = %(source)s AND token_id IS NOT NULL
+                    RETURNING token_id
+                ),
+                dropped_token AS (
+                    DELETE FROM {tokens_table}
+                    WHERE id IN (SELECT token_id FROM dropped_cart)
+                ),
+                touched AS (
+                    UPDATE {carts_table}
+                    SET updated_at = now()
+                    WHERE id = %(target)s AND EXISTS (SELECT 1 FROM merged)
+                    RETURNING updated_at
+                )
+                SELECT (SELECT updated_at FROM touched)
+                """,
+                {'source': other.pk, 'target': self.pk},
             )
-        other.clear()
+            cart_updated_at = cursor.fetchone()[0]
+
+        if cart_updated_at is not None:
+            self.updated_at = cart_updated_at
         return self
 
     @staticmethod
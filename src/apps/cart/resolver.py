@@ -2,6 +2,7 @@ from typing import Optional
 from django.http import HttpRequest
 from django.utils.crypto import get_random_string
 
+from .cookies import CartCookieManager
 from .models import Cart, CartToken
 
 TOKEN_LENGTH = 32
@@ -10,37 +11,59 @@ TOKEN_LENGTH = 32
 class CartResolver:
 
     @staticmethod
-    def resolve(request: HttpRequest, cart_token_value: Optional[str]) -> Cart:
+    def resolve(request: HttpRequest, cart_cookie_value: Optional[str]) -> Cart:
         user = getattr(request, "user", None)
         if user and user.is_authenticated:
             return Cart.get_or_create_for_user(user)
 
-        if cart_token_value is not None:
-            token = CartToken.objects.filter(token=cart_token_value).first()
+        if cart_cookie_value is not None:
+            payload = CartCookieManager.load_payload(cart_cookie_value)
 
-            if token:
-                if token.is_expired:
-                    cart = Cart.objects.filter(token=token).first()
+            # A signed payload is trusted without a query. It can outlive its
+            # cart (revoked or garbage-collected token), so the first write that
+            # finds the cart gone falls back to the token lookup instead.
+            if payload and not payload.is_expired:
+                setattr(request, "_cart_from_cookie", True)
+                return Cart.from_reference(
+                    payload.cart_id,
+                    token_id=payload.token_id,
+                    on_missing=lambda: CartResolver.resolve_token(request, payload.token),
+                )
 
-                    new_value = get_random_string(TOKEN_LENGTH)
-                    new_token = CartToken.objects.create(token=new_value)
+            return CartResolver.resolve_token(request, payload.token if payload else cart_cookie_value)
 
-                    if cart:
-                        cart.token = new_token
-                        cart.save(update_fields=["token", "updated_at"])
-                    else:
-                        cart = Cart.get_or_create_for_token(new_token)
+        return CartResolver._create(request)
 
-                    setattr(request, "_cart_token_to_delete", True)
-                    setattr(request, "_cart_token_to_set", new_value)
+    @staticmethod
+    def resolve_token(request: HttpRequest, token_value: str) -> Cart:
+        token = CartToken.objects.filter(token=token_value).first()
+        if token is None:
+            return CartResolver._create(request)
+
+        if token.is_expired:
+            cart = Cart.objects.filter(token=token).first()
+
+            new_token = CartToken.objects.create(token=get_random_string(TOKEN_LENGTH))
+
+            if cart:
+                cart.token = new_token
+                cart.save(update_fields=["token", "updated_at"])
+            else:
+                cart = Cart.get_or_create_for_token(new_token)
 
-                    token.delete()
-                    return cart
+            setattr(request, "_cart_token_to_delete", True)
+            setattr(request, "_cart_cookie_to_set", (cart, new_token))
 
-                return Cart.get_or_create_for_token(token)
+            token.delete()
+            return cart
 
-        new_value = get_random_string(TOKEN_LENGTH)
-        new_token = CartToken.objects.create(token=new_value)
+        cart = Cart.get_or_create_for_token(token)
+        setattr(request, "_cart_cookie_to_set", (cart, token))
+        return cart
+
+    @staticmethod
+    def _create(request: HttpRequest) -> Cart:
+        new_token = CartToken.objects.create(token=get_random_string(TOKEN_LENGTH))
         cart = Cart.get_or_create_for_token(new_token)
-        setattr(request, "_cart_token_to_set", new_value)
+        setattr(request, "_cart_cookie_to_set", (cart, new_token))
         return cart
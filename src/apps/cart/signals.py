@@ -0,0 +1,30 @@
+from django.contrib.auth.signals import user_logged_in
+from django.dispatch import receiver
+
+from .cookies import CartCookieManager
+from .models import Cart
+
+
+@receiver(user_logged_in)
+def merge_anonymous_cart(sender, request, user, **kwargs):
+    if request is None:
+        return
+
+    anonymous_cart = getattr(request, "cart", None)
+    if anonymous_cart is None or not anonymous_cart.is_anonymous:
+        cookie_value = CartCookieManager.get_token(request)
+        if not cookie_value:
+            return
+        payload = CartCookieManager.load_payload(cookie_value)
+        token_value = payload.token if payload else cookie_value
+        anonymous_cart = Cart.objects.filter(token__token=token_value).only("id", "token_id").first()
+
+    if anonymous_cart is None:
+        return
+
+    user_cart = Cart.get_or_create_for_user(user)
+    user_cart.merge_from(anonymous_cart)
+
+    request.cart = user_cart
+    setattr(request, "_cart_token_to_delete", True)
+    setattr(request, "_cart_cookie_to_set", None)
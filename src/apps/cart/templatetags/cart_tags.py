@@ -1,6 +1,8 @@
 from django import template
 from django.urls import reverse
 
+from apps.catalog.engagement import UserEngagement
+
 register = template.Library()
 
 @register.inclusion_tag('components/cart_button.html', takes_context=True)
@@ -8,6 +10,8 @@ def cart_button(context, product, size='normal', show_count=True):
     request = context['request']
     cart = request.cart
 
+    UserEngagement.for_request(request).bind(product)
+
     in_cart = product.is_in_cart(cart)
     carts_users_count = product.get_in_carts_users_count()
 
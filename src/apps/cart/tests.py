@@ -1,3 +1,65 @@
-from django.test import TestCase
+from django.contrib.auth.models import AnonymousUser
+from django.test import RequestFactory, TestCase
 
-# Create your tests here.
+from fixtures.factories.catalog import ProductFactory
+
+from .cookies import CartCookieManager
+from .models import Cart, CartItem, CartToken
+from .resolver import CartResolver
+
+
+class CartResolverTests(TestCase):
+
+    def setUp(self):
+        self.token = CartToken.objects.create(token='a' * 32)
+        self.cart = Cart.get_or_create_for_token(self.token)
+        self.cookie = CartCookieManager.dump_payload(self.cart, self.token)
+        self.product = ProductFactory()
+
+    def make_request(self):
+        request = RequestFactory().get('/')
+        request.user = AnonymousUser()
+        return request
+
+    def test_signed_cookie_resolves_without_queries(self):
+        request = self.make_request()
+
+        with self.assertNumQueries(0):
+            cart = CartResolver.resolve(request, self.cookie)
+
+        self.assertEqual(cart.pk, self.cart.pk)
+        self.assertIsNone(getattr(request, '_cart_cookie_to_set', None))
+
+    def test_write_to_garbage_collected_cart_recovers_through_token(self):
+        request = self.make_request()
+        cart = CartResolver.resolve(request, self.cookie)
+        Cart.objects.filter(pk=self.cart.pk).delete()
+
+        cart.add_product(self.product, 2)
+
+        replacement = Cart.objects.get(token=self.token)
+        self.assertEqual(cart.pk, replacement.pk)
+        self.assertEqual(CartItem.objects.get(cart=replacement).quantity, 2)
+        self.assertEqual(request._cart_cookie_to_set, (cart, self.token))
+
+    def test_write_after_token_revocation_issues_a_new_cookie(self):
+        request = self.make_request()
+        cart = CartResolver.resolve(request, self.cookie)
+        self.token.delete()
+
+        cart.add_product(self.product)
+
+        new_cart, new_token = request._cart_cookie_to_set
+        self.assertEqual(cart.pk, new_cart.pk)
+        self.assertNotEqual(new_token.pk, self.token.pk)
+        self.assertEqual(Cart.objects.get(token=new_token).items.count(), 1)
+
+    def test_clear_on_missing_cart_does_not_fail(self):
+        request = self.make_request()
+        cart = CartResolver.resolve(request, self.cookie)
+        Cart.objects.filter(pk=self.cart.pk).delete()
+
+        cart.clear()
+
+        self.assertTrue(Cart.objects.filter(pk=cart.pk).exists())
+        self.assertFalse(CartItem.objects.filter(cart_id=cart.pk).exists())
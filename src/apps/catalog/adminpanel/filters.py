@@ -12,16 +12,23 @@ class StockStatusFilter(SimpleListFilter):
             ('in_stock', 'In Stock'),
             ('out_of_stock', 'Out of Stock'),
             ('low_stock', 'Low Stock (<10)'),
+            ('not_active', 'Not Active'),
             ('no_inventory', 'No Inventory'),
         )
 
     def queryset(self, request, queryset):
         if self.value() == 'in_stock':
-            return queryset.filter(inventory__stock_quantity__gt=0, inventory__is_active=True)
+            return queryset.filter(inventory__is_active=True, inventory__available_quantity__gt=0)
         elif self.value() == 'out_of_stock':
-            return queryset.filter(inventory__stock_quantity=0)
+            return queryset.filter(inventory__is_active=True, inventory__available_quantity__lte=0)
         elif self.value() == 'low_stock':
-            return queryset.filter(inventory__stock_quantity__gt=0, inventory__stock_quantity__lt=10)
+            return queryset.filter(
+                inventory__is_active=True,
+                inventory__available_quantity__gt=0,
+                inventory__available_quantity__lt=10
+            )
+        elif self.value() == 'not_active':
+            return queryset.filter(inventory__is_active=False)
         elif self.value() == 'no_inventory':
             return queryset.filter(inventory__isnull=True)
         return None
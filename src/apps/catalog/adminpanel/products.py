@@ -221,14 +221,14 @@ class ProductAdmin(admin.ModelAdmin):
             inv = obj.inventory
             if not inv.is_active:
                 return mark_safe('<span style="color: #757575;">Inactive</span>')
-            elif inv.stock_quantity == 0:
+            elif inv.available_quantity <= 0:
                 return mark_safe('<span style="color: #f44336; font-weight: bold;">Out of Stock</span>')
-            elif inv.stock_quantity < 10:
+            elif inv.available_quantity < 10:
                 return format_html('<span style="color: #ff9800; font-weight: bold;">Low ({} left)</span>',
-                                   inv.stock_quantity)
+                                   inv.available_quantity)
             else:
                 return format_html('<span style="color: #4caf50; font-weight: bold;">In Stock ({})</span>',
-                                   inv.stock_quantity)
+                                   inv.available_quantity)
         return mark_safe('<span style="color: #757575;">No Inventory</span>')
 
     @admin.display(description='Price')
@@ -0,0 +1,158 @@
+from typing import Dict, Iterable, Optional, Set
+
+from django.db import connection
+from django.http import HttpRequest
+
+from apps.cart.models import CartItem
+from apps.favorites.models import FavoriteCollection, FavoriteItem
+from apps.ratings.models import Rating, Like, Dislike
+
+REQUEST_ATTR = "_user_engagement"
+
+KIND_LIKE = 1
+KIND_DISLIKE = 2
+KIND_FAVORITE = 3
+KIND_CART = 4
+KIND_RATING = 5
+
+
+class UserEngagement:
+    """
+    Request-scoped snapshot of the current user's relation to a set of products.
+
+    Liked, disliked, favorited and in-cart product ids plus the user's rating
+    scores are loaded for all requested products with a single UNION ALL query,
+    so per-product membership checks become set lookups.
+    """
+
+    def __init__(self, user_id: Optional[int] = None, cart_id: Optional[int] = None) -> None:
+        self.user_id = user_id
+        self.cart_id = cart_id
+
+        self.liked: Set[int] = set()
+        self.disliked: Set[int] = set()
+        self.favorited: Set[int] = set()
+        self.in_cart: Set[int] = set()
+        self.ratings: Dict[int, int] = {}
+
+        self._loaded: Set[int] = set()
+
+    @classmethod
+    def for_request(cls, request: HttpRequest) -> "UserEngagement":
+        engagement = getattr(request, REQUEST_ATTR, None)
+        if engagement is None:
+            user = getattr(request, "user", None)
+            cart = getattr(request, "cart", None)
+            engagement = cls(
+                user_id=user.id if user and user.is_authenticated else None,
+                cart_id=cart.pk if cart else None,
+            )
+            setattr(request, REQUEST_ATTR, engagement)
+        return engagement
+
+    def is_for_user(self, user) -> bool:
+        return self.user_id is not None and user is not None and self.user_id == user.id
+
+    def is_for_cart(self, cart) -> bool:
+        return self.cart_id is not None and cart is not None and self.cart_id == cart.pk
+
+    def covers(self, product_id: int) -> bool:
+        return product_id in self._loaded
+
+    def attach(self, products: Iterable) -> None:
+        products = list(products)
+        self.load(product.pk for product in products)
+        for product in products:
+            product.engagement = self
+
+    def bind(self, product) -> None:
+        """
+        Point `product` at this snapshot without loading anything.
+
+        Views attach whole pages up front; a product they did not cover falls
+        back to the model's own lookups instead of one query per card.
+        """
+        product.engagement = self
+
+    def load(self, product_ids: Iterable[int]) -> None:
+        missing = sorted({pid for pid in product_ids if pid is not None} - self._loaded)
+        if not missing:
+            return
+
+        sql, params = self._build_query(missing)
+        if not sql:
+            self._loaded.update(missing)
+            return
+
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            rows = cursor.fetchall()
+
+        buckets = {
+            KIND_LIKE: self.liked,
+            KIND_DISLIKE: self.disliked,
+            KIND_FAVORITE: self.favorited,
+            KIND_CART: self.in_cart,
+        }
+        for kind, product_id, score in rows:
+            if kind == KIND_RATING:
+                self.ratings[product_id] = score
+            else:
+                buckets[kind].add(product_id)
+
+        # Only now, so a failed query does not leave the ids cached as "no engagement".
+        self._loaded.update(missing)
+
+    def _build_query(self, product_ids):
+        parts = []
+        params = []
+
+        if self.user_id is not None:
+            likes_table = Like._meta.db_table
+            dislikes_table = Dislike._meta.db_table
+            ratings_table = Rating._meta.db_table
+            items_table = FavoriteItem._meta.db_table
+            collections_table = FavoriteCollection._meta.db_table
+
+            parts.append(
+                f"SELECT {KIND_LIKE}, product_id, NULL::smallint FROM {likes_table} "
+                f"WHERE user_id = %s AND product_id = ANY(%s)"
+            )
+            parts.append(
+                f"SELECT {KIND_DISLIKE}, product_id, NULL::smallint FROM {dislikes_table} "
+                f"WHERE user_id = %s AND product_id = ANY(%s)"
+            )
+            parts.append(
+                f"SELECT DISTINCT {KIND_FAVORITE}, fi.product_id, NULL::smallint "
+                f"FROM {items_table} fi JOIN {collections_table} fc ON fc.id = fi.collection_id "
+                f"WHERE fc.user_id = %s AND fi.product_id = ANY(%s)"
+            )
+            parts.append(
+                f"SELECT {KIND_RATING}, product_id, score::smallint FROM {ratings_table} "
+                f"WHERE user_id = %s AND product_id = ANY(%s)"
+            )
+            params.extend([self.user_id, product_ids] * 4)
+
+        if self.cart_id is not None:
+            parts.append(
+                f"SELECT {KIND_CART}, product_id, NULL::smallint FROM {CartItem._meta.db_table} "
+                f"WHERE cart_id = %s AND product_id = ANY(%s)"
+            )
+            params.extend([self.cart_id, product_ids])
+
+        return "\nUNION ALL\n".join(parts), params
+
+    def is_liked(self, product_id: int) -> bool:
+        return product_id in self.liked
+
+    def is_disliked(self, product_id: int) -> bool:
+        return product_id in self.disliked
+
+    def is_favorited(self, product_id: int) -> bool:
+        return product_id in self.favorited
+
+    def is_in_cart(self, product_id: int) -> bool:
+        return product_id in self.in_cart
+
+    def get_rating(self, product_id: int) -> Optional[int]:
+        return self.ratings.get(product_id)
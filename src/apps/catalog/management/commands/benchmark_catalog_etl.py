@@ -0,0 +1,120 @@
+import time
+from pathlib import Path
+
+import pandas as pd
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from etl.extract_transform import CatalogCSVExtractTransformer
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the catalog ETL transform: per-row DTOs vs. the columnar path. "
+        "The source CSVs are read once and replicated in memory at each scale; nothing is written to the database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--products",
+            dest="products_csv",
+            type=str,
+            default=str(getattr(settings, "PRODUCTS_DATASET_CSV", "")),
+            help="Path to products CSV file (defaults to settings.PRODUCTS_DATASET_CSV)",
+        )
+        parser.add_argument(
+            "--images",
+            dest="images_csv",
+            type=str,
+            default=str(getattr(settings, "IMAGES_DATASET_CSV", "")),
+            help="Path to images CSV file (defaults to settings.IMAGES_DATASET_CSV)",
+        )
+        parser.add_argument(
+            "--scales",
+            dest="scales",
+            type=int,
+            nargs="+",
+            default=[1, 10, 100],
+            help="How many copies of the dataset to transform (default: 1 10 100)",
+        )
+        parser.add_argument(
+            "--skip-rows-path",
+            dest="skip_rows_scale",
+            type=int,
+            default=None,
+            help="Skip the per-row path from this scale upwards (it is slow on large inputs).",
+        )
+
+    def handle(self, *args, **options):
+        products_path = Path(options["products_csv"])
+        images_path = Path(options["images_csv"])
+        scales = options["scales"]
+        skip_rows_scale = options["skip_rows_scale"]
+
+        if not products_path.is_file():
+            raise CommandError(f"Products CSV not found: {products_path}")
+        if not images_path.is_file():
+            raise CommandError(f"Images CSV not found: {images_path}")
+        if any(scale <= 0 for scale in scales):
+            raise CommandError("scales must be positive")
+
+        etl = CatalogCSVExtractTransformer(styles_path=products_path, images_path=images_path)
+        styles_dataframe, images_dataframe = etl._extract()
+        self.stdout.write(
+            self.style.NOTICE(
+                f"Loaded {len(styles_dataframe):,} styles and {len(images_dataframe):,} images; "
+                f"benchmarking scales {', '.join(map(str, scales))}..."
+            )
+        )
+
+        for scale in scales:
+            styles, images = self._replicate(styles_dataframe, images_dataframe, scale)
+            rows = len(styles)
+
+            columnar_time = self._time(lambda: etl.transform_columnar(styles, images))
+            line = f"- x{scale}: {rows:,} rows | columnar {columnar_time:.3f}s ({rows / columnar_time:,.0f} rows/s)"
+
+            if skip_rows_scale is None or scale < skip_rows_scale:
+                rows_time = self._time(lambda: etl._transform(styles, images))
+                line += (
+                    f" | rows {rows_time:.3f}s ({rows / rows_time:,.0f} rows/s)"
+                    f" | speedup x{rows_time / columnar_time:.1f}"
+                )
+            else:
+                line += " | rows skipped"
+
+            self.stdout.write(line)
+
+        self.stdout.write(self.style.SUCCESS("Benchmark complete."))
+
+    @staticmethod
+    def _time(func) -> float:
+        start_time = time.perf_counter()
+        func()
+        return max(time.perf_counter() - start_time, 1e-9)
+
+    @staticmethod
+    def _replicate(styles_dataframe: pd.DataFrame, images_dataframe: pd.DataFrame, scale: int):
+        """Stack `scale` copies of the inputs, shifting product ids so every copy is a distinct product."""
+        if scale == 1:
+            return styles_dataframe, images_dataframe
+
+        offset = int(styles_dataframe["product_id"].max() or 0) + 1
+        image_ids = images_dataframe["filename"].str.split(".", n=1).str[0]
+        image_extensions = images_dataframe["filename"].str.partition(".")[2]
+
+        styles_copies, images_copies = [], []
+        for copy in range(scale):
+            styles = styles_dataframe.copy()
+            styles["product_id"] = styles["product_id"] + copy * offset
+            styles_copies.append(styles)
+
+            images = images_dataframe.copy()
+            shifted = (pd.to_numeric(image_ids, errors="coerce") + copy * offset).astype("Int64").astype("string")
+            images["filename"] = shifted + "." + image_extensions
+            images_copies.append(images)
+
+        return (
+            pd.concat(styles_copies, ignore_index=True),
+            pd.concat(images_copies, ignore_index=True),
+        )
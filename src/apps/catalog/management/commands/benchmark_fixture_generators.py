@@ -0,0 +1,130 @@
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from fixtures.generators.cart import CartsGenerator
+from fixtures.generators.favorites import FavoriteItemsGenerator
+from fixtures.generators.inventories import ProductInventoryGenerator
+from fixtures.generators.ratings import RatingsGenerator
+from fixtures.utils import iter_column_rows
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the fixture generators: build the rows each seed command would COPY for synthetic "
+        "user and product ids. Nothing is read from or written to the database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--products",
+            dest="products",
+            type=int,
+            default=40000,
+            help="Number of synthetic products (default: 40000)",
+        )
+        parser.add_argument(
+            "--users",
+            dest="users",
+            type=int,
+            default=100000,
+            help="Number of synthetic users (default: 100000)",
+        )
+        parser.add_argument(
+            "--seed",
+            dest="seed",
+            type=int,
+            default=0,
+            help="Seed for the random generator (default: 0)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            dest="batch_size",
+            type=int,
+            default=50000,
+            help="Rows expanded per chunk (default: 50000)",
+        )
+
+    def handle(self, *args, **options):
+        products = options["products"]
+        users = options["users"]
+        seed = options["seed"]
+        batch_size = options["batch_size"]
+
+        if products <= 0 or users <= 0 or batch_size <= 0:
+            raise CommandError("products, users and batch-size must be positive")
+
+        product_ids = np.arange(1, products + 1, dtype=np.int64)
+        user_ids = np.arange(1, users + 1, dtype=np.int64)
+        now = timezone.now()
+
+        self.stdout.write(
+            self.style.NOTICE(f"Benchmarking generators for {products:,} products and {users:,} users (seed {seed})...")
+        )
+
+        ratings = RatingsGenerator(batch_size=batch_size, seed=seed)
+        self._run("ratings", lambda: self._ratings_rows(ratings, product_ids, user_ids, now))
+
+        inventories = ProductInventoryGenerator(batch_size=batch_size, seed=seed)
+        self._run("inventories", lambda: self._inventory_rows(inventories, product_ids, now, batch_size))
+
+        carts = CartsGenerator(batch_size=batch_size, seed=seed)
+        carts_count = int(users * carts.user_fraction)
+        self._run("cart items", lambda: self._consume(iter_column_rows(self._item_columns(
+            carts.build_items(carts_count, products), "cart_index", product_ids, now,
+            ["quantity"],
+        ), batch_size)))
+
+        favorites = FavoriteItemsGenerator(seed=seed)
+        collections_count = int(users * 0.3)
+        self._run("favorite items", lambda: self._consume(iter_column_rows(self._item_columns(
+            favorites.build_items(collections_count, products, 10, 50), "collection_index", product_ids, now,
+            ["position", "note"],
+        ), batch_size)))
+
+        self.stdout.write(self.style.SUCCESS("Benchmark complete."))
+
+    def _run(self, name: str, build) -> None:
+        start_time = time.perf_counter()
+        rows = build()
+        elapsed = max(time.perf_counter() - start_time, 1e-9)
+        self.stdout.write(f"- {name}: {rows:,} rows in {elapsed:.3f}s ({rows / elapsed:,.0f} rows/s)")
+
+    @staticmethod
+    def _ratings_rows(generator: RatingsGenerator, product_ids: np.ndarray, user_ids: np.ndarray, now) -> int:
+        plan = generator.plan(len(product_ids), (50, 500), (20, 200), (5, 50))
+        shuffled_user_ids = generator.engine.rng.permutation(user_ids)
+        ratings_sum = np.zeros(len(product_ids), dtype=np.int64)
+
+        return (
+            Command._consume(generator.iter_rating_rows(plan, product_ids, shuffled_user_ids, now, ratings_sum))
+            + Command._consume(generator.iter_reaction_rows(plan, product_ids, shuffled_user_ids, now, dislikes=False))
+            + Command._consume(generator.iter_reaction_rows(plan, product_ids, shuffled_user_ids, now, dislikes=True))
+        )
+
+    @staticmethod
+    def _inventory_rows(generator: ProductInventoryGenerator, product_ids: np.ndarray, now, batch_size: int) -> int:
+        columns = generator.build_columns(len(product_ids))
+        return Command._consume(iter_column_rows([
+            product_ids,
+            generator._to_decimals(columns['base_price']),
+            generator._to_decimals(columns['sale_price']),
+            'USD',
+            columns['stock_quantity'],
+            columns['reserved_quantity'],
+            columns['is_active'],
+            now,
+            now,
+        ], batch_size))
+
+    @staticmethod
+    def _item_columns(items: dict, owner_key: str, product_ids: np.ndarray, now, extra: list) -> list:
+        """Columns shaped like the seed commands' COPY; owner indices stand in for the owner ids."""
+        return [items[owner_key], product_ids[items["product_index"]], *(items[key] for key in extra), now, now]
+
+    @staticmethod
+    def _consume(rows) -> int:
+        """Exhaust a row iterator the way COPY would, returning the number of rows."""
+        return sum(1 for _ in rows)
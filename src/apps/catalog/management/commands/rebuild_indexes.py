@@ -32,7 +32,7 @@ class Command(BaseCommand):
         total_model_indexes = 0
         failed_count = 0
 
-        with connection.cursor() as cursor:
+        with connection.schema_editor(atomic=False) as schema_editor, connection.cursor() as cursor:
             self.stdout.write("Checking current state of database indexes...")
             existing_indexes_before = self._get_existing_indexes(cursor)
 
@@ -40,20 +40,15 @@ class Command(BaseCommand):
                 if not getattr(model._meta, 'managed', False) or not getattr(model._meta, 'indexes', []):
                     continue
 
-                table_name = model._meta.db_table
                 total_model_indexes += len(model._meta.indexes)
 
                 for index in model._meta.indexes:
                     index_name = index.name
 
-                    columns_sql_parts = []
-                    for field_name, order in index.fields_orders:
-                        field = model._meta.get_field(field_name)
-                        db_column_name = field.column
-                        columns_sql_parts.append(f'"{db_column_name}" {order}')
-                    columns_sql = ', '.join(columns_sql_parts)
-
-                    sql = f'CREATE INDEX IF NOT EXISTS "{index_name}" ON "{table_name}" ({columns_sql});'
+                    # create_sql keeps partial-index conditions, opclasses and included columns.
+                    sql = str(index.create_sql(model, schema_editor)).replace(
+                        'CREATE INDEX', 'CREATE INDEX IF NOT EXISTS', 1
+                    )
 
                     try:
                         cursor.execute(sql)
@@ -4,8 +4,9 @@ from pathlib import Path
 from django.conf import settings
 from django.core.management.base import BaseCommand, CommandError
 
+from etl.cache import CatalogFramesCache, CatalogFramesCacheError
 from etl.extract_transform import CatalogCSVExtractTransformer
-from etl.load import DjangoCatalogSeeder
+from etl.load import CopyCatalogSeeder, DjangoCatalogSeeder
 from fixtures.db_tuning import (
     optimize_postgresql_for_bulk_operations,
     restore_postgresql_after_bulk_operations,
@@ -46,6 +47,63 @@ class Command(BaseCommand):
             default=5000,
             help="Bulk insert batch size for seeding (default: 5000)",
         )
+        parser.add_argument(
+            "--transform",
+            dest="transform",
+            choices=["columnar", "rows"],
+            default="columnar",
+            help="Transform path: vectorized DataFrames (columnar) or per-row DTOs (rows). Default: columnar",
+        )
+        parser.add_argument(
+            "--loader",
+            dest="loader",
+            choices=["copy", "orm"],
+            default="copy",
+            help="Load via binary COPY into staging tables (copy) or via bulk INSERTs (orm). Default: copy",
+        )
+        parser.add_argument(
+            "--stream",
+            action="store_true",
+            dest="stream",
+            default=False,
+            help="Read the products CSV in chunks and load each chunk while the next one is parsed (columnar only).",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            dest="chunk_size",
+            type=int,
+            default=50000,
+            help="Rows per products CSV chunk when streaming (default: 50000)",
+        )
+        parser.add_argument(
+            "--queue-size",
+            dest="queue_size",
+            type=int,
+            default=2,
+            help="Parsed chunks allowed to wait for the loader when streaming (default: 2)",
+        )
+        parser.add_argument(
+            "--cache-dir",
+            dest="cache_dir",
+            type=str,
+            default=str(getattr(settings, "CATALOG_FRAMES_CACHE_DIR", "")),
+            help="Where the transformed dataset is cached, keyed by the CSVs' checksum "
+                 "(defaults to settings.CATALOG_FRAMES_CACHE_DIR)",
+        )
+        parser.add_argument(
+            "--no-cache",
+            action="store_true",
+            dest="no_cache",
+            default=False,
+            help="Neither read nor write the transformed dataset cache.",
+        )
+        parser.add_argument(
+            "--rebuild-cache",
+            action="store_true",
+            dest="rebuild_cache",
+            default=False,
+            help="Re-run extract and transform even if a cache for these CSVs exists, then overwrite it.",
+        )
         parser.add_argument(
             "--skip-optimization",
             action="store_true",
@@ -59,6 +117,12 @@ class Command(BaseCommand):
         images_csv = options["images_csv"]
         batch_size = options["batch_size"]
         skip_optimization = options["skip_optimization"]
+        columnar = options["transform"] == "columnar"
+        stream = options["stream"]
+        use_copy = options["loader"] == "copy"
+        chunk_size = options["chunk_size"]
+        queue_size = options["queue_size"]
+        use_cache = columnar and not stream and not options["no_cache"] and bool(options["cache_dir"])
 
         if not products_csv:
             raise CommandError("Path to products CSV is not provided and settings.PRODUCTS_DATASET_CSV is empty.")
@@ -72,15 +136,29 @@ class Command(BaseCommand):
             raise CommandError(f"Products CSV not found: {products_path}")
         if not images_path.exists():
             raise CommandError(f"Images CSV not found: {images_path}")
+        if stream and not columnar:
+            raise CommandError("--stream requires --transform columnar")
+        if chunk_size <= 0 or queue_size <= 0:
+            raise CommandError("chunk-size and queue-size must be positive")
 
         total_start = time.perf_counter()
 
-        self.stdout.write(self.style.NOTICE("Extracting and transforming CSV datasets..."))
-        extract_start = time.perf_counter()
         etl = CatalogCSVExtractTransformer(styles_path=products_path, images_path=images_path)
-        dto = etl.execute()
-        extract_time = time.perf_counter() - extract_start
-        self.stdout.write(self.style.SUCCESS(f"Extract+Transform done in {extract_time:.3f}s"))
+        if not stream:
+            self.stdout.write(self.style.NOTICE("Extracting and transforming CSV datasets..."))
+            extract_start = time.perf_counter()
+            if use_cache:
+                try:
+                    cache = CatalogFramesCache(options["cache_dir"], products_path, images_path)
+                except CatalogFramesCacheError as exc:
+                    raise CommandError(f"{exc} (--no-cache)") from exc
+                dto, hit = cache.get_or_build(etl.execute_columnar, rebuild=options["rebuild_cache"])
+                source = f"loaded from cache {cache.path}" if hit else f"cached to {cache.path}"
+            else:
+                dto = etl.execute_columnar() if columnar else etl.execute()
+                source = "not cached"
+            extract_time = time.perf_counter() - extract_start
+            self.stdout.write(self.style.SUCCESS(f"Extract+Transform done in {extract_time:.3f}s ({source})"))
 
         stored_indexes = {}
         table_names = [
@@ -105,12 +183,19 @@ class Command(BaseCommand):
                 )
             )
 
-        self.stdout.write(self.style.NOTICE("Seeding database via Django ORM..."))
+        self.stdout.write(self.style.NOTICE(f"Seeding database via {'COPY' if use_copy else 'Django ORM'}..."))
         load_start = time.perf_counter()
 
         try:
-            seeder = DjangoCatalogSeeder(batch_size=batch_size)
-            seeder.seed(dto)
+            seeder_class = CopyCatalogSeeder if use_copy else DjangoCatalogSeeder
+            seeder = seeder_class(batch_size=batch_size)
+            if stream:
+                rows = seeder.seed_stream(etl.iter_columnar_chunks(chunk_size), queue_size=queue_size)
+                self.stdout.write(f"- Streamed {rows:,} product rows in chunks of {chunk_size:,}")
+            elif columnar:
+                seeder.seed_frames(dto)
+            else:
+                seeder.seed(dto)
         finally:
             if not skip_optimization and stored_indexes:
                 self.stdout.write(self.style.NOTICE("Restoring PostgreSQL after bulk insert..."))
@@ -125,6 +210,12 @@ class Command(BaseCommand):
                 )
 
         load_time = time.perf_counter() - load_start
+        if use_copy:
+            for stats in seeder.stats.values():
+                self.stdout.write(
+                    f"- {stats.table}: {stats.staged:,} staged, {stats.inserted:,} inserted "
+                    f"in {stats.elapsed:.3f}s ({stats.rows_per_second:,.0f} rows/s)"
+                )
         self.stdout.write(self.style.SUCCESS(f"Load (seeding) done in {load_time:.3f}s"))
 
         total_time = time.perf_counter() - total_start
@@ -0,0 +1,138 @@
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from etl.cache import CatalogFramesCache, CatalogFramesCacheError
+from etl.extract_transform import CatalogCSVExtractTransformer
+from etl.sync import CatalogSyncer
+
+
+class Command(BaseCommand):
+    help = (
+        "Incrementally sync the catalog with the CSV feed: insert new products, update changed ones "
+        "(by content hash) and optionally delete products missing from the feed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--products",
+            dest="products_csv",
+            type=str,
+            default=str(getattr(settings, "PRODUCTS_DATASET_CSV", "")),
+            help="Path to products CSV file (defaults to settings.PRODUCTS_DATASET_CSV)",
+        )
+        parser.add_argument(
+            "--images",
+            dest="images_csv",
+            type=str,
+            default=str(getattr(settings, "IMAGES_DATASET_CSV", "")),
+            help="Path to images CSV file (defaults to settings.IMAGES_DATASET_CSV)",
+        )
+        parser.add_argument(
+            "--delete-missing",
+            action="store_true",
+            dest="delete_missing",
+            default=False,
+            help="Delete products that are not in the feed (products referenced by orders or carts are kept).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            dest="batch_size",
+            type=int,
+            default=5000,
+            help="Products deleted per batch with --delete-missing (default: 5000)",
+        )
+        parser.add_argument(
+            "--cache-dir",
+            dest="cache_dir",
+            type=str,
+            default=str(getattr(settings, "CATALOG_FRAMES_CACHE_DIR", "")),
+            help="Where the transformed dataset is cached, keyed by the CSVs' checksum "
+                 "(defaults to settings.CATALOG_FRAMES_CACHE_DIR)",
+        )
+        parser.add_argument(
+            "--no-cache",
+            action="store_true",
+            dest="no_cache",
+            default=False,
+            help="Neither read nor write the transformed dataset cache.",
+        )
+        parser.add_argument(
+            "--rebuild-cache",
+            action="store_true",
+            dest="rebuild_cache",
+            default=False,
+            help="Re-run extract and transform even if a cache for these CSVs exists, then overwrite it.",
+        )
+        parser.add_argument(
+            "--stream",
+            action="store_true",
+            dest="stream",
+            default=False,
+            help="Read the products CSV in chunks and sync each chunk while the next one is parsed.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            dest="chunk_size",
+            type=int,
+            default=50000,
+            help="Rows per products CSV chunk when streaming (default: 50000)",
+        )
+        parser.add_argument(
+            "--queue-size",
+            dest="queue_size",
+            type=int,
+            default=2,
+            help="Parsed chunks allowed to wait for the loader when streaming (default: 2)",
+        )
+
+    def handle(self, *args, **options):
+        products_path = Path(options["products_csv"])
+        images_path = Path(options["images_csv"])
+        batch_size = options["batch_size"]
+        chunk_size = options["chunk_size"]
+        queue_size = options["queue_size"]
+
+        if not products_path.is_file():
+            raise CommandError(f"Products CSV not found: {products_path}")
+        if not images_path.is_file():
+            raise CommandError(f"Images CSV not found: {images_path}")
+        if batch_size <= 0 or chunk_size <= 0 or queue_size <= 0:
+            raise CommandError("batch-size, chunk-size and queue-size must be positive")
+
+        start_time = time.perf_counter()
+        etl = CatalogCSVExtractTransformer(styles_path=products_path, images_path=images_path)
+        syncer = CatalogSyncer(batch_size=batch_size, delete_missing=options["delete_missing"])
+
+        self.stdout.write(self.style.NOTICE(f"Syncing catalog from {products_path}..."))
+        if options["stream"]:
+            result = syncer.sync_stream(etl.iter_columnar_chunks(chunk_size), queue_size=queue_size)
+        elif options["no_cache"] or not options["cache_dir"]:
+            result = syncer.sync_frames(etl.execute_columnar())
+        else:
+            try:
+                cache = CatalogFramesCache(options["cache_dir"], products_path, images_path)
+            except CatalogFramesCacheError as exc:
+                raise CommandError(f"{exc} (--no-cache)") from exc
+            frames, hit = cache.get_or_build(etl.execute_columnar, rebuild=options["rebuild_cache"])
+            self.stdout.write(f"- Transformed dataset {'loaded from' if hit else 'cached to'} {cache.path}")
+            result = syncer.sync_frames(frames)
+
+        for stats in syncer.stats.values():
+            self.stdout.write(
+                f"- {stats.table}: {stats.staged:,} staged, {stats.inserted:,} written "
+                f"in {stats.elapsed:.3f}s ({stats.rows_per_second:,.0f} rows/s)"
+            )
+
+        self.stdout.write(
+            f"- Products: {result.inserted:,} inserted, {result.updated:,} updated, "
+            f"{result.unchanged:,} unchanged, {result.deleted:,} deleted"
+        )
+        if result.kept:
+            self.stdout.write(
+                self.style.WARNING(f"- {result.kept:,} missing products are still referenced and were kept")
+            )
+
+        self.stdout.write(self.style.SUCCESS(f"Catalog sync done in {time.perf_counter() - start_time:.3f}s"))
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.5 on 2026-10-19 10:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0017_genderfilteroptionsmv_pricerangesmv_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProductViewStats',
+            fields=[
+                ('product', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='view_stats', serialize=False, to='catalog.product')),
+                ('views_count', models.PositiveBigIntegerField(default=0)),
+                ('last_viewed_at', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Product view stats',
+                'verbose_name_plural': 'Product view stats',
+                'db_table': 'product_view_stats',
+                'indexes': [models.Index(fields=['-views_count'], name='idx_view_stats_count_desc')],
+            },
+        ),
+    ]
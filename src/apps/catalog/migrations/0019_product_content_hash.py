@@ -0,0 +1,33 @@
+# Generated by Django 5.2.5 on 2026-10-19 12:00
+
+from django.db import migrations, models
+
+# Must hash the same row shape as etl.load.PRODUCT_CONTENT_HASH_SQL.
+BACKFILL_CONTENT_HASH = """
+    UPDATE catalog_product p
+    SET content_hash = md5(ROW(
+        p.product_id, p.gender, p.year, p.product_display_name, p.image_url,
+        at.name, bc.name, se.name, ut.name
+    )::text)
+    FROM catalog_articletype at, catalog_basecolour bc, catalog_season se, catalog_usagetype ut
+    WHERE at.id = p.article_type_id
+      AND bc.id = p.base_colour_id
+      AND se.id = p.season_id
+      AND ut.id = p.usage_type_id
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0018_productviewstats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='content_hash',
+            field=models.CharField(blank=True, default='', editable=False, max_length=32),
+        ),
+        migrations.RunSQL(BACKFILL_CONTENT_HASH, reverse_sql=migrations.RunSQL.noop),
+    ]
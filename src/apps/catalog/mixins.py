@@ -10,10 +10,11 @@ from django.utils.http import urlencode
 from django.views import View
 
 from apps.cart.models import CartItem
+from apps.catalog.engagement import UserEngagement
 from apps.catalog.models import Season
 from apps.catalog.pgviews import PriceRangesMV, GenderFilterOptionsMV
 from apps.favorites.models import FavoriteItem
-from apps.ratings.models import Rating, Like, Dislike
+from apps.ratings.models import Like, Dislike
 
 
 class ProductAccessMixin(View):
@@ -35,8 +36,6 @@ class ProductQuerysetMixin:
     model: models.Model
 
     def get_base_queryset(self):
-        user = self.request.user
-
         prefetch_list = [
             Prefetch(
                 'likes',
@@ -64,15 +63,6 @@ class ProductQuerysetMixin:
             )
         ]
 
-        if user.is_authenticated:
-            prefetch_list.append(
-                Prefetch(
-                    'ratings',
-                    queryset=Rating.objects.filter(user=user),
-                    to_attr='ratings_list'
-                )
-            )
-
         queryset = (
             self.model.objects.only(
                 "id",
@@ -92,6 +82,7 @@ class ProductQuerysetMixin:
                 "inventory__is_active",
                 "inventory__stock_quantity",
                 "inventory__reserved_quantity",
+                "inventory__available_quantity",
                 "inventory__base_price",
                 "inventory__sale_price",
                 "inventory__currency__symbol",
@@ -110,6 +101,10 @@ class ProductQuerysetMixin:
 
         return queryset
 
+    def attach_user_engagement(self, products):
+        UserEngagement.for_request(self.request).attach(products)
+        return products
+
     def use_projection(self, only_fields=None):
         if not only_fields:
             meta = self.model._meta
@@ -211,13 +206,13 @@ class ProductFilterContextMixin:
 
         if queryset.filter(
                 inventory__is_active=True,
-                inventory__stock_quantity__gt=F('inventory__reserved_quantity')
+                inventory__available_quantity__gt=0
         ).exists():
             options.append(("available", "Available"))
 
         if queryset.filter(
                 inventory__is_active=True,
-                inventory__stock_quantity__lte=F('inventory__reserved_quantity')
+                inventory__available_quantity__lte=0
         ).exists():
             options.append(("out_of_stock", "Out of Stock"))
 
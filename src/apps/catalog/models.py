@@ -1,9 +1,10 @@
 from django.contrib.auth import get_user_model
-from django.db import models
+from django.db import models, transaction
 from django.urls import reverse
 from django_extensions.db.fields import AutoSlugField
 
 from apps.favorites.models import FavoriteItem, FavoriteCollection
+from apps.outbox.publisher import PRODUCT_CHANGED, publish
 from .choices import SeasonChoices, GenderChoices
 from ..cart.models import CartItem
 
@@ -102,6 +103,9 @@ class UsageType(models.Model):
 
 
 class Product(models.Model):
+    # Denormalized rating counters are announced by the ratings app itself.
+    RATING_FIELDS = frozenset({'ratings_sum', 'ratings_count'})
+
     product_id = models.IntegerField(unique=True)
     gender = models.CharField(max_length=10, choices=GenderChoices.choices)
     year = models.SmallIntegerField()
@@ -119,6 +123,9 @@ class Product(models.Model):
     ratings_sum = models.PositiveIntegerField(default=0)
     ratings_count = models.PositiveIntegerField(default=0, db_index=True)
 
+    # md5 of the feed row this product was last synced from (see etl.sync).
+    content_hash = models.CharField(max_length=32, blank=True, default='', editable=False)
+
     article_type = models.ForeignKey(
         'ArticleType',
         on_delete=models.RESTRICT,
@@ -184,6 +191,13 @@ class Product(models.Model):
             models.Index(fields=['-created_at', '-id'], name='idx_created_id_desc'),
         ]
 
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if update_fields is None or not set(update_fields) <= self.RATING_FIELDS:
+                publish(PRODUCT_CHANGED, [self.pk])
+
     def __str__(self):
         return self.product_display_name or f'Product {self.product_id}'
 
@@ -208,10 +222,26 @@ class Product(models.Model):
             return len(self.dislikes_list)
         return 0
 
+    def get_user_engagement(self, user):
+        engagement = getattr(self, 'engagement', None)
+        if engagement and engagement.is_for_user(user) and engagement.covers(self.pk):
+            return engagement
+        return None
+
+    def get_cart_engagement(self, cart):
+        engagement = getattr(self, 'engagement', None)
+        if engagement and engagement.is_for_cart(cart) and engagement.covers(self.pk):
+            return engagement
+        return None
+
     def is_liked_by(self, user):
         if not user or not user.is_authenticated:
             return False
 
+        engagement = self.get_user_engagement(user)
+        if engagement:
+            return engagement.is_liked(self.pk)
+
         if hasattr(self, 'likes_list'):
             return any(like.user_id == user.id for like in self.likes_list)
 
@@ -221,6 +251,10 @@ class Product(models.Model):
         if not user or not user.is_authenticated:
             return False
 
+        engagement = self.get_user_engagement(user)
+        if engagement:
+            return engagement.is_disliked(self.pk)
+
         if hasattr(self, 'dislikes_list'):
             return any(dislike.user_id == user.id for dislike in self.dislikes_list)
 
@@ -230,6 +264,10 @@ class Product(models.Model):
         if not user or not user.is_authenticated:
             return False
 
+        engagement = self.get_user_engagement(user)
+        if engagement:
+            return engagement.get_rating(self.pk) is not None
+
         if hasattr(self, 'ratings_list'):
             return any(r.user_id == user.id for r in self.ratings_list)
 
@@ -239,6 +277,10 @@ class Product(models.Model):
         if not user or not user.is_authenticated:
             return None
 
+        engagement = self.get_user_engagement(user)
+        if engagement:
+            return engagement.get_rating(self.pk)
+
         if hasattr(self, 'ratings_list'):
             for r in self.ratings_list:
                 if r.user_id == user.id:
@@ -284,6 +326,10 @@ class Product(models.Model):
         if not user or not user.is_authenticated:
             return False
 
+        engagement = self.get_user_engagement(user)
+        if engagement:
+            return engagement.is_favorited(self.pk)
+
         if hasattr(self, 'favorites_list'):
             return any(fav.collection.user_id == user.id for fav in self.favorites_list)
 
@@ -314,7 +360,35 @@ class Product(models.Model):
         if not cart:
             return False
 
+        engagement = self.get_cart_engagement(cart)
+        if engagement:
+            return engagement.is_in_cart(self.pk)
+
         if hasattr(self, 'cart_items_list'):
             return any(item.cart_id == cart.id for item in self.cart_items_list)
 
         return CartItem.objects.filter(product=self, cart=cart).exists()
+
+
+class ProductViewStats(models.Model):
+    product = models.OneToOneField(
+        'Product',
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='view_stats'
+    )
+    views_count = models.PositiveBigIntegerField(default=0)
+    last_viewed_at = models.DateTimeField(null=True, blank=True)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'product_view_stats'
+        verbose_name = 'Product view stats'
+        verbose_name_plural = 'Product view stats'
+        indexes = [
+            models.Index(fields=['-views_count'], name='idx_view_stats_count_desc'),
+        ]
+
+    def __str__(self):
+        return f'{self.product_id}: {self.views_count} views'
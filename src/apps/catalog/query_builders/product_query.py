@@ -1,7 +1,7 @@
 from decimal import Decimal
 
 from django.db.models import DecimalField, Case, When, FloatField, Value, Subquery, Avg, OuterRef, Q, F
-from django.db.models.functions import Cast
+from django.db.models.functions import Cast, Coalesce
 
 
 class ProductQuerysetBuilder:
@@ -82,12 +82,12 @@ class ProductQuerysetBuilder:
                         if option == "available":
                             availability_filter |= Q(
                                 inventory__is_active=True,
-                                inventory__stock_quantity__gt=F('inventory__reserved_quantity')
+                                inventory__available_quantity__gt=0
                             )
                         elif option == "out_of_stock":
                             availability_filter |= Q(
                                 inventory__is_active=True,
-                                inventory__stock_quantity__lte=F('inventory__reserved_quantity')
+                                inventory__available_quantity__lte=0
                             )
                         elif option == "not_active":
                             availability_filter |= Q(inventory__is_active=False)
@@ -150,6 +150,14 @@ class ProductQuerysetBuilder:
             self._ordering_annotations['effective_price'] = True
         return self
 
+    def add_views_annotation(self):
+        if 'views_count' not in self._ordering_annotations:
+            self.queryset = self.queryset.annotate(
+                views_count=Coalesce(F('view_stats__views_count'), Value(0))
+            )
+            self._ordering_annotations['views_count'] = True
+        return self
+
     def apply_ordering(self):
         ordering = self.request.GET.get("ordering")
         ordering_map = {
@@ -163,6 +171,7 @@ class ProductQuerysetBuilder:
             "rating_asc": ("avg_rating", "pk"),
             "price_desc": ("-effective_price", "-pk"),
             "price_asc": ("effective_price", "pk"),
+            "views_desc": ("-views_count", "-pk"),
         }
 
         if ordering in ["rating_desc", "rating_asc"]:
@@ -171,6 +180,9 @@ class ProductQuerysetBuilder:
         if ordering in ["price_desc", "price_asc"]:
             self.add_price_annotation()
 
+        if ordering == "views_desc":
+            self.add_views_annotation()
+
         if ordering in ordering_map:
             self.queryset = self.queryset.order_by(*ordering_map[ordering])
 
@@ -1,3 +1,124 @@
-from django.test import TestCase
+import importlib
 
-# Create your tests here.
+from django.db import connection
+from django.test import TransactionTestCase
+
+from apps.cart.models import Cart
+from apps.outbox.models import OutboxEvent
+from apps.outbox.publisher import PRODUCT_CHANGED
+from etl.dto import (
+    ArticleTypeDTO,
+    BaseColourDTO,
+    CatalogResultDTO,
+    ImageDTO,
+    MasterCategoryDTO,
+    ProductDTO,
+    SeasonDTO,
+    SubCategoryDTO,
+    UsageTypeDTO,
+)
+from etl.load import CopyCatalogSeeder
+from etl.sync import CatalogSyncer
+from fixtures.factories.users import UserFactory
+
+from .models import Product
+
+BACKFILL_CONTENT_HASH = importlib.import_module(
+    'apps.catalog.migrations.0019_product_content_hash'
+).BACKFILL_CONTENT_HASH
+
+
+def make_feed(*products):
+    return CopyCatalogSeeder.frames_from_result(CatalogResultDTO(
+        master_categories=[MasterCategoryDTO('Apparel')],
+        sub_categories=[SubCategoryDTO('Apparel', 'Topwear')],
+        article_types=[ArticleTypeDTO('Topwear', 'Tshirts')],
+        base_colours=[BaseColourDTO('Navy Blue'), BaseColourDTO('White')],
+        seasons=[SeasonDTO('Summer')],
+        usage_types=[UsageTypeDTO('Casual')],
+        products=list(products),
+        images=[
+            ImageDTO(product.product_id, f"https://example.com/images/{product.product_id}.jpg")
+            for product in products
+        ],
+    ))
+
+
+def make_product(product_id, name=None, base_colour='Navy Blue'):
+    return ProductDTO(
+        product_id=product_id,
+        gender='Men',
+        year=2012,
+        product_display_name=name or f"Tshirt {product_id}",
+        article_type='Tshirts',
+        base_colour=base_colour,
+        season='Summer',
+        usage='Casual',
+    )
+
+
+# Staging tables are dropped on commit, so every sync needs a real transaction.
+class CatalogSyncerTests(TransactionTestCase):
+
+    def setUp(self):
+        self.first = make_product(1001)
+        self.second = make_product(1002)
+        self.initial = CatalogSyncer().sync_frames(make_feed(self.first, self.second))
+
+    def counts(self, result):
+        return result.inserted, result.updated, result.unchanged, result.deleted, result.kept
+
+    def test_new_products_are_inserted(self):
+        self.assertEqual(self.counts(self.initial), (2, 0, 0, 0, 0))
+        self.assertEqual(
+            sorted(Product.objects.values_list('product_id', 'slug')),
+            [(1001, 'tshirt-1001-1001'), (1002, 'tshirt-1002-1002')],
+        )
+        self.assertFalse(Product.objects.filter(content_hash='').exists())
+
+    def test_identical_feed_writes_nothing(self):
+        before = dict(Product.objects.values_list('product_id', 'updated_at'))
+        events = OutboxEvent.objects.filter(topic=PRODUCT_CHANGED).count()
+
+        result = CatalogSyncer().sync_frames(make_feed(self.first, self.second))
+
+        self.assertEqual(self.counts(result), (0, 0, 2, 0, 0))
+        self.assertEqual(dict(Product.objects.values_list('product_id', 'updated_at')), before)
+        self.assertEqual(OutboxEvent.objects.filter(topic=PRODUCT_CHANGED).count(), events)
+
+    def test_changed_rows_are_updated_and_keep_their_slug(self):
+        renamed = make_product(1001, name='Renamed Tshirt', base_colour='White')
+
+        result = CatalogSyncer().sync_frames(make_feed(renamed, self.second, make_product(1003)))
+
+        self.assertEqual(self.counts(result), (1, 1, 1, 0, 0))
+        product = Product.objects.get(product_id=1001)
+        self.assertEqual(product.product_display_name, 'Renamed Tshirt')
+        self.assertEqual(product.base_colour.name, 'White')
+        self.assertEqual(product.slug, 'tshirt-1001-1001')
+        event = OutboxEvent.objects.filter(topic=PRODUCT_CHANGED).last()
+        self.assertEqual(
+            sorted(event.object_ids),
+            sorted(Product.objects.filter(product_id__in=[1001, 1003]).values_list('pk', flat=True)),
+        )
+
+    def test_missing_products_are_deleted_unless_protected(self):
+        third = make_product(1003)
+        CatalogSyncer().sync_frames(make_feed(self.first, self.second, third))
+        Cart.get_or_create_for_user(UserFactory()).add_product(Product.objects.get(product_id=1003), 1)
+
+        result = CatalogSyncer(delete_missing=True).sync_frames(make_feed(self.first))
+
+        self.assertEqual(self.counts(result), (0, 0, 1, 1, 1))
+        self.assertEqual(sorted(Product.objects.values_list('product_id', flat=True)), [1001, 1003])
+
+    def test_content_hash_matches_the_migration_backfill(self):
+        synced = dict(Product.objects.values_list('product_id', 'content_hash'))
+        Product.objects.update(content_hash='')
+
+        with connection.cursor() as cursor:
+            cursor.execute(BACKFILL_CONTENT_HASH)
+
+        self.assertEqual(dict(Product.objects.values_list('product_id', 'content_hash')), synced)
+        result = CatalogSyncer().sync_frames(make_feed(self.first, self.second))
+        self.assertEqual(self.counts(result), (0, 0, 2, 0, 0))
@@ -0,0 +1,162 @@
+import atexit
+import logging
+import threading
+import time
+from typing import Dict, List, Tuple
+
+from django.conf import settings
+from django.db import DatabaseError, close_old_connections, connection, transaction
+from django.utils import timezone
+
+from .models import Product, ProductViewStats
+
+logger = logging.getLogger(__name__)
+
+
+class ProductViewCounter:
+    """
+    Write-behind counter for product detail views.
+
+    Views are accumulated in an in-process buffer and merged into
+    `product_view_stats` by a background flusher with one set-based statement
+    per flush, so a detail page hit never touches the product row. At most one
+    flush interval of views is lost if the process dies.
+    """
+
+    def __init__(self, flush_interval: float = 30.0, max_buffer_size: int = 10000) -> None:
+        self.flush_interval = flush_interval
+        self.max_buffer_size = max_buffer_size
+
+        self._buffer: Dict[int, int] = {}
+        self._last_viewed: Dict[int, object] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._thread_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+
+        self.flush_count = 0
+        self.flush_errors = 0
+        self.last_flush_rows = 0
+        self.last_flush_seconds = 0.0
+
+    def increment(self, product_id: int, count: int = 1) -> None:
+        with self._lock:
+            self._buffer[product_id] = self._buffer.get(product_id, 0) + count
+            self._last_viewed[product_id] = timezone.now()
+            buffer_size = len(self._buffer)
+
+        self._ensure_flusher()
+        if buffer_size >= self.max_buffer_size:
+            self._wakeup.set()
+
+    def metrics(self) -> dict:
+        with self._lock:
+            buffer_size = len(self._buffer)
+            buffered_views = sum(self._buffer.values())
+
+        return {
+            'buffer_size': buffer_size,
+            'buffered_views': buffered_views,
+            'flush_count': self.flush_count,
+            'flush_errors': self.flush_errors,
+            'last_flush_rows': self.last_flush_rows,
+            'last_flush_seconds': self.last_flush_seconds,
+        }
+
+    def flush(self) -> int:
+        with self._flush_lock:
+            with self._lock:
+                deltas, last_viewed = self._buffer, self._last_viewed
+                self._buffer, self._last_viewed = {}, {}
+
+            if not deltas:
+                return 0
+
+            rows = [(pid, deltas[pid], last_viewed[pid]) for pid in sorted(deltas)]
+
+            start_time = time.perf_counter()
+            try:
+                self._write(rows)
+            except DatabaseError:
+                self.flush_errors += 1
+                self._restore(rows)
+                logger.exception("Failed to flush %d product view deltas; re-buffered", len(rows))
+                return 0
+            except Exception:
+                # Unexpected failures still must not drop the swapped-out deltas.
+                self.flush_errors += 1
+                self._restore(rows)
+                raise
+
+            self.flush_count += 1
+            self.last_flush_rows = len(rows)
+            self.last_flush_seconds = time.perf_counter() - start_time
+            logger.info(
+                "Flushed %d product view deltas in %.3fs",
+                self.last_flush_rows,
+                self.last_flush_seconds,
+            )
+            return len(rows)
+
+    def _restore(self, rows: List[Tuple[int, int, object]]) -> None:
+        with self._lock:
+            for product_id, views, viewed_at in rows:
+                self._buffer[product_id] = self._buffer.get(product_id, 0) + views
+                self._last_viewed.setdefault(product_id, viewed_at)
+
+    @staticmethod
+    def _write(rows: List[Tuple[int, int, object]]) -> None:
+        stats_table = ProductViewStats._meta.db_table
+        products_table = Product._meta.db_table
+
+        values_sql = ", ".join(["(%s, %s, %s)"] * len(rows))
+        params = [value for row in rows for value in row]
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                INSERT INTO {stats_table} (product_id, views_count, last_viewed_at, updated_at)
+                SELECT v.product_id::bigint, v.views::bigint, v.last_viewed_at::timestamptz, now()
+                FROM (VALUES {values_sql}) AS v(product_id, views, last_viewed_at)
+                JOIN {products_table} p ON p.id = v.product_id::bigint
+                ORDER BY 1
+                ON CONFLICT (product_id) DO UPDATE
+                SET views_count = {stats_table}.views_count + EXCLUDED.views_count,
+                    last_viewed_at = GREATEST({stats_table}.last_viewed_at, EXCLUDED.last_viewed_at),
+                    updated_at = EXCLUDED.updated_at
+                """,
+                params,
+            )
+
+    def _ensure_flusher(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        with self._thread_lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(
+                target=self._run,
+                name='product-view-counter-flusher',
+                daemon=True,
+            )
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            close_old_connections()
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Unexpected error in product views flusher")
+
+
+product_view_counter = ProductViewCounter(
+    flush_interval=getattr(settings, 'PRODUCT_VIEWS_FLUSH_INTERVAL', 30.0),
+    max_buffer_size=getattr(settings, 'PRODUCT_VIEWS_BUFFER_MAX_SIZE', 10000),
+)
+
+atexit.register(product_view_counter.flush)
@@ -30,6 +30,7 @@ from .models import (
 from apps.ratings.models import Rating, Like, Dislike
 from .paginator import AdaptiveKeysPaginator, QuerySetWithCount
 from .query_builders.product_query import ProductQuerysetBuilder
+from .view_counter import product_view_counter
 
 User = get_user_model()
 
@@ -106,6 +107,7 @@ class ProductListView(
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
+        self.attach_user_engagement(context["object_list"])
         context.update(self.get_filter_context_data(self.get_options_scope_queryset()))
         return context
 
@@ -252,6 +254,16 @@ class ProductDetailView(ProductQuerysetMixin, DetailView):
     def get_queryset(self):
         return self.get_base_queryset()
 
+    def get(self, request, *args, **kwargs):
+        response = super().get(request, *args, **kwargs)
+        product_view_counter.increment(self.object.pk)
+        return response
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        self.attach_user_engagement([self.object])
+        return context
+
 
 class ProductCreateView(ProductAccessMixin, LoginRequiredMixin, CreateView):
     model = Product
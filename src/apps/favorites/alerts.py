@@ -0,0 +1,196 @@
+import time
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Iterator, Optional
+
+from django.apps import apps
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import (
+    FavoriteAlertBatch,
+    FavoriteAlertRun,
+    FavoriteCollection,
+    FavoriteItem,
+    ProductAlertSnapshot,
+)
+
+PRICE_DROP = 'price_drop'
+BACK_IN_STOCK = 'back_in_stock'
+
+
+@dataclass
+class AlertsDetectionBatch:
+    products_scanned: int
+    products_changed: int
+    price_drops: int
+    back_in_stock: int
+    batches_created: int
+    alerts_created: int
+    elapsed: float
+
+
+class FavoriteAlertsDetector:
+    """
+    Detect price drops and restocks of favorited products, set-based.
+
+    A compact snapshot keeps each product's last effective price, currency and
+    availability. Every batch diffs a product id range of inventory against it
+    in one statement: changed rows are upserted into the snapshot, and only the
+    products that dropped in price or came back in stock are joined to
+    favorite items to insert one alert batch per user.
+
+    Runs are incremental: only inventory updated since the previous run started
+    (minus `overlap`, for transactions that committed late) is scanned. The
+    first run, or a full one, only seeds the snapshot for unseen products.
+    """
+
+    def __init__(self, batch_size: int = 10000, overlap: timedelta = timedelta(minutes=5)) -> None:
+        self.batch_size = batch_size
+        self.overlap = overlap
+
+    def start_run(self, full: bool = False) -> FavoriteAlertRun:
+        previous = FavoriteAlertRun.objects.filter(finished_at__isnull=False).first()
+        since = None
+        if previous is not None and not full:
+            since = previous.started_at - self.overlap
+
+        return FavoriteAlertRun.objects.create(started_at=timezone.now(), since=since)
+
+    def iter_batches(self, run: FavoriteAlertRun, max_batches: Optional[int] = None) -> Iterator[AlertsDetectionBatch]:
+        after_product_id = 0
+        batches = 0
+
+        while max_batches is None or batches < max_batches:
+            start_time = time.perf_counter()
+            with transaction.atomic():
+                last_product_id, counts = self._detect_batch(run, after_product_id)
+                if last_product_id is None:
+                    return
+                self._add_to_run(run, counts)
+
+            after_product_id = last_product_id
+            batches += 1
+            yield AlertsDetectionBatch(*counts, elapsed=time.perf_counter() - start_time)
+
+    def finish_run(self, run: FavoriteAlertRun) -> FavoriteAlertRun:
+        run.finished_at = timezone.now()
+        run.save(update_fields=['finished_at'])
+        run.refresh_from_db()
+        return run
+
+    def _detect_batch(self, run: FavoriteAlertRun, after_product_id: int):
+        inventory_table = apps.get_model('inventories', 'ProductInventory')._meta.db_table
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                WITH scanned AS (
+                    SELECT product_id,
+                           COALESCE(sale_price, base_price) AS price,
+                           currency_id AS currency_code,
+                           (is_active AND available_quantity > 0) AS in_stock
+                    FROM {inventory_table}
+                    WHERE product_id > %(after)s
+                      AND (%(since)s::timestamptz IS NULL OR updated_at >= %(since)s::timestamptz)
+                    ORDER BY product_id
+                    LIMIT %(limit)s
+                ),
+                changes AS (
+                    SELECT s.product_id, s.price, s.currency_code, s.in_stock,
+                           snap.price AS old_price,
+                           snap.product_id IS NOT NULL
+                               AND s.in_stock
+                               AND s.currency_code = snap.currency_code
+                               AND s.price < snap.price AS price_drop,
+                           snap.product_id IS NOT NULL
+                               AND s.in_stock
+                               AND NOT snap.in_stock AS back_in_stock
+                    FROM scanned s
+                    LEFT JOIN {ProductAlertSnapshot._meta.db_table} snap ON snap.product_id = s.product_id
+                    WHERE snap.product_id IS NULL
+                       OR snap.price <> s.price
+                       OR snap.currency_code <> s.currency_code
+                       OR snap.in_stock <> s.in_stock
+                ),
+                upserted AS (
+                    INSERT INTO {ProductAlertSnapshot._meta.db_table} (product_id, price, currency_code, in_stock, updated_at)
+                    SELECT product_id, price, currency_code, in_stock, now()
+                    FROM changes
+                    ON CONFLICT (product_id) DO UPDATE
+                    SET price = EXCLUDED.price,
+                        currency_code = EXCLUDED.currency_code,
+                        in_stock = EXCLUDED.in_stock,
+                        updated_at = EXCLUDED.updated_at
+                    RETURNING 1
+                ),
+                alerts AS (
+                    SELECT product_id, old_price, price, currency_code,
+                           CASE WHEN back_in_stock THEN %(back_in_stock)s ELSE %(price_drop)s END AS kind
+                    FROM changes
+                    WHERE price_drop OR back_in_stock
+                ),
+                recipients AS (
+                    SELECT DISTINCT c.user_id, i.product_id
+                    FROM alerts a
+                    JOIN {FavoriteItem._meta.db_table} i ON i.product_id = a.product_id
+                    JOIN {FavoriteCollection._meta.db_table} c ON c.id = i.collection_id
+                ),
+                created AS (
+                    INSERT INTO {FavoriteAlertBatch._meta.db_table} (user_id, run_id, items, items_count, created_at)
+                    SELECT r.user_id, %(run_id)s,
+                           jsonb_agg(
+                               jsonb_build_object(
+                                   'product_id', a.product_id,
+                                   'kind', a.kind,
+                                   'old_price', a.old_price::text,
+                                   'new_price', a.price::text,
+                                   'currency', a.currency_code
+                               )
+                               ORDER BY a.product_id
+                           ),
+                           count(*),
+                           now()
+                    FROM recipients r
+                    JOIN alerts a ON a.product_id = r.product_id
+                    GROUP BY r.user_id
+                    RETURNING items_count
+                )
+                SELECT (SELECT MAX(product_id) FROM scanned),
+                       (SELECT count(*) FROM scanned),
+                       (SELECT count(*) FROM upserted),
+                       (SELECT count(*) FROM alerts WHERE kind = %(price_drop)s),
+                       (SELECT count(*) FROM alerts WHERE kind = %(back_in_stock)s),
+                       (SELECT count(*) FROM created),
+                       (SELECT COALESCE(SUM(items_count), 0) FROM created)
+                """,
+                {
+                    'after': after_product_id,
+                    'since': run.since,
+                    'limit': self.batch_size,
+                    'run_id': run.pk,
+                    'price_drop': PRICE_DROP,
+                    'back_in_stock': BACK_IN_STOCK,
+                },
+            )
+            last_product_id, *counts = cursor.fetchone()
+
+        return last_product_id, counts
+
+    @staticmethod
+    def _add_to_run(run: FavoriteAlertRun, counts) -> None:
+        scanned, changed, price_drops, back_in_stock, batches, alerts = counts
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                UPDATE {FavoriteAlertRun._meta.db_table}
+                SET products_scanned = products_scanned + %s,
+                    products_changed = products_changed + %s,
+                    price_drops = price_drops + %s,
+                    back_in_stock = back_in_stock + %s,
+                    batches_created = batches_created + %s,
+                    alerts_created = alerts_created + %s
+                WHERE id = %s
+                """,
+                [scanned, changed, price_drops, back_in_stock, batches, alerts, run.pk],
+            )
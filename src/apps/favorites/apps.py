@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class FavoritesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.favorites'
+
+    def ready(self):
+        from . import signals
@@ -0,0 +1,207 @@
+from dataclasses import dataclass
+from typing import List, Sequence
+
+from django.apps import apps
+from django.db import IntegrityError, connection, transaction
+
+from apps.outbox.publisher import FAVORITE_CHANGED, publish
+
+from .models import POSITION_GAP, FavoriteCollection, FavoriteItem
+from .positions import UnknownItemsError
+
+
+class DuplicateCollectionNameError(ValueError):
+    pass
+
+
+@dataclass
+class BulkResult:
+    affected: int
+    skipped: int
+    product_ids: List[int]
+
+
+class FavoriteBulkOperations:
+    """
+    Set-based writes across favorite collections.
+
+    Every operation locks the collections it writes to (in id order, so two
+    operations never wait on each other crosswise), allocates positions in
+    SQL from the target's `next_position` counter, and refreshes the affected
+    summaries before committing.
+    """
+
+    def __init__(self, collection: FavoriteCollection) -> None:
+        self.collection = collection
+
+    def add_products(self, product_ids: Sequence[int]) -> BulkResult:
+        """Append `product_ids` in the given order, skipping unknown products and ones already present."""
+        requested = list(dict.fromkeys(product_ids))
+        product_table = apps.get_model('catalog', 'Product')._meta.db_table
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            self._lock_collections(cursor, [self.collection.pk])
+            cursor.execute(
+                f"""
+                WITH requested AS (
+                    SELECT r.product_id, r.ord
+                    FROM unnest(%(product_ids)s::bigint[]) WITH ORDINALITY AS r(product_id, ord)
+                    JOIN {product_table} p ON p.id = r.product_id
+                    WHERE NOT EXISTS (
+                        SELECT 1 FROM {FavoriteItem._meta.db_table} i
+                        WHERE i.collection_id = %(collection_id)s AND i.product_id = r.product_id
+                    )
+                ),
+                numbered AS (
+                    SELECT product_id, row_number() OVER (ORDER BY ord) AS rank
+                    FROM requested
+                ),
+                base AS (
+                    SELECT next_position FROM {FavoriteCollection._meta.db_table} WHERE id = %(collection_id)s
+                ),
+                inserted AS (
+                    INSERT INTO {FavoriteItem._meta.db_table} (collection_id, product_id, position, note, created_at)
+                    SELECT %(collection_id)s, n.product_id, b.next_position + (n.rank - 1) * %(gap)s, '', now()
+                    FROM numbered n CROSS JOIN base b
+                    ON CONFLICT (collection_id, product_id) DO NOTHING
+                    RETURNING product_id
+                ),
+                counter AS (
+                    UPDATE {FavoriteCollection._meta.db_table}
+                    SET next_position = next_position + (SELECT count(*) FROM numbered) * %(gap)s,
+                        updated_at = now()
+                    WHERE id = %(collection_id)s
+                    RETURNING 1
+                )
+                SELECT COALESCE(array_agg(product_id), '{{}}') FROM inserted
+                """,
+                {'product_ids': requested, 'collection_id': self.collection.pk, 'gap': POSITION_GAP},
+            )
+            added = cursor.fetchone()[0]
+
+            if added:
+                FavoriteCollection.refresh_summaries([self.collection.pk])
+                publish(FAVORITE_CHANGED, added, {'collection_id': self.collection.pk})
+
+        return BulkResult(affected=len(added), skipped=len(requested) - len(added), product_ids=added)
+
+    def move_items(self, target: FavoriteCollection, item_ids: Sequence[int]) -> BulkResult:
+        """
+        Move items to the end of `target`, keeping their relative order.
+
+        Items whose product is already in `target` stay where they are and
+        are reported as skipped.
+        """
+        item_ids = sorted(set(item_ids))
+        items_table = FavoriteItem._meta.db_table
+        collections_table = FavoriteCollection._meta.db_table
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            self._lock_collections(cursor, [self.collection.pk, target.pk])
+            self._check_items_exist(cursor, item_ids)
+
+            cursor.execute(
+                f"""
+                WITH picked AS (
+                    SELECT i.id,
+                           row_number() OVER (ORDER BY i.position, i.created_at DESC, i.id) AS rank
+                    FROM {items_table} i
+                    WHERE i.collection_id = %(source_id)s
+                      AND i.id = ANY(%(item_ids)s)
+                      AND NOT EXISTS (
+                          SELECT 1 FROM {items_table} t
+                          WHERE t.collection_id = %(target_id)s AND t.product_id = i.product_id
+                      )
+                ),
+                base AS (
+                    SELECT next_position FROM {collections_table} WHERE id = %(target_id)s
+                ),
+                moved AS (
+                    UPDATE {items_table} i
+                    SET collection_id = %(target_id)s,
+                        position = b.next_position + (p.rank - 1) * %(gap)s
+                    FROM picked p CROSS JOIN base b
+                    WHERE i.id = p.id
+                    RETURNING i.product_id
+                ),
+                counters AS (
+                    UPDATE {collections_table}
+                    SET next_position = CASE
+                            WHEN id = %(target_id)s THEN next_position + (SELECT count(*) FROM picked) * %(gap)s
+                            ELSE next_position
+                        END,
+                        updated_at = now()
+                    WHERE id IN (%(source_id)s, %(target_id)s)
+                    RETURNING 1
+                )
+                SELECT COALESCE(array_agg(product_id), '{{}}') FROM moved
+                """,
+                {
+                    'source_id': self.collection.pk,
+                    'target_id': target.pk,
+                    'item_ids': item_ids,
+                    'gap': POSITION_GAP,
+                },
+            )
+            moved = cursor.fetchone()[0]
+
+            if moved:
+                FavoriteCollection.refresh_summaries([self.collection.pk, target.pk])
+                publish(FAVORITE_CHANGED, moved, {'collection_ids': [self.collection.pk, target.pk]})
+
+        return BulkResult(affected=len(moved), skipped=len(item_ids) - len(moved), product_ids=moved)
+
+    def duplicate(self, user, name: str, description: str = '', is_public: bool = False) -> FavoriteCollection:
+        """Copy the collection, items and notes included, into a new collection owned by `user`."""
+        items_table = FavoriteItem._meta.db_table
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            try:
+                with transaction.atomic():
+                    copy = FavoriteCollection.objects.create(
+                        user=user,
+                        name=name,
+                        description=description,
+                        is_public=is_public,
+                    )
+            except IntegrityError:
+                raise DuplicateCollectionNameError(f"A collection named '{name}' already exists")
+
+            cursor.execute(
+                f"""
+                WITH copied AS (
+                    INSERT INTO {items_table} (collection_id, product_id, position, note, created_at)
+                    SELECT %(copy_id)s, product_id,
+                           row_number() OVER (ORDER BY position, created_at DESC, id) * %(gap)s,
+                           note, now()
+                    FROM {items_table}
+                    WHERE collection_id = %(source_id)s
+                    RETURNING position
+                )
+                UPDATE {FavoriteCollection._meta.db_table}
+                SET next_position = COALESCE((SELECT MAX(position) FROM copied), 0) + %(gap)s
+                WHERE id = %(copy_id)s
+                """,
+                {'copy_id': copy.pk, 'source_id': self.collection.pk, 'gap': POSITION_GAP},
+            )
+            FavoriteCollection.refresh_summaries([copy.pk])
+            publish(FAVORITE_CHANGED, payload={'collection_id': copy.pk, 'copied_from': self.collection.pk})
+
+        copy.refresh_from_db()
+        return copy
+
+    def _check_items_exist(self, cursor, item_ids: List[int]) -> None:
+        cursor.execute(
+            f"SELECT id FROM {FavoriteItem._meta.db_table} WHERE collection_id = %s AND id = ANY(%s)",
+            [self.collection.pk, item_ids],
+        )
+        missing = set(item_ids) - {row[0] for row in cursor.fetchall()}
+        if missing:
+            raise UnknownItemsError(missing)
+
+    @staticmethod
+    def _lock_collections(cursor, collection_ids: List[int]) -> None:
+        cursor.execute(
+            f"SELECT id FROM {FavoriteCollection._meta.db_table} WHERE id = ANY(%s) ORDER BY id FOR UPDATE",
+            [sorted(set(collection_ids))],
+        )
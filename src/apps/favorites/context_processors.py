@@ -1,13 +1,16 @@
-from .models import FavoriteItem
+from django.db.models import Sum
+from django.db.models.functions import Coalesce
+
+from .models import FavoriteCollection
 
 
 def favorites_context(request):
     if not request.user.is_authenticated:
         return {'favorites_total_count': 0}
 
-    favorites_total_count = FavoriteItem.objects.filter(
-        collection__user=request.user
-    ).count()
+    favorites_total_count = FavoriteCollection.objects.filter(
+        user=request.user
+    ).aggregate(count=Coalesce(Sum('items_count'), 0))['count']
 
     return {
         'favorites_total_count': favorites_total_count,
@@ -0,0 +1,92 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.favorites.alerts import FavoriteAlertsDetector
+
+
+class Command(BaseCommand):
+    help = (
+        "Detect price drops and restocks of favorited products since the previous run "
+        "and create per-user alert batches."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            dest="batch_size",
+            type=int,
+            default=10000,
+            help="Number of inventory rows diffed per batch/transaction (default: 10000)",
+        )
+        parser.add_argument(
+            "--overlap-minutes",
+            dest="overlap_minutes",
+            type=float,
+            default=5.0,
+            help="Re-scan this many minutes before the previous run started, for late commits (default: 5)",
+        )
+        parser.add_argument(
+            "--full",
+            action="store_true",
+            dest="full",
+            default=False,
+            help="Diff the whole inventory instead of rows updated since the previous run.",
+        )
+        parser.add_argument(
+            "--max-batches",
+            dest="max_batches",
+            type=int,
+            default=None,
+            help="Stop after this many batches; the run is then left unfinished (default: no limit)",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        max_batches = options["max_batches"]
+
+        if batch_size <= 0:
+            raise CommandError("batch-size must be positive")
+        if options["overlap_minutes"] < 0:
+            raise CommandError("overlap-minutes must not be negative")
+        if max_batches is not None and max_batches <= 0:
+            raise CommandError("max-batches must be positive")
+
+        detector = FavoriteAlertsDetector(
+            batch_size=batch_size,
+            overlap=timedelta(minutes=options["overlap_minutes"]),
+        )
+        run = detector.start_run(full=options["full"])
+
+        scope = f"inventory updated since {run.since:%Y-%m-%d %H:%M:%S}" if run.since else "the whole inventory"
+        self.stdout.write(self.style.NOTICE(f"Diffing {scope} in batches of {batch_size}..."))
+
+        total_start = time.perf_counter()
+        batches = 0
+
+        for batch in detector.iter_batches(run, max_batches=max_batches):
+            batches += 1
+            rate = batch.products_scanned / batch.elapsed if batch.elapsed else 0
+            self.stdout.write(
+                f"- Batch {batches}: {batch.products_scanned} scanned, {batch.products_changed} changed, "
+                f"{batch.price_drops} price drops, {batch.back_in_stock} restocks -> "
+                f"{batch.alerts_created} alerts for {batch.batches_created} users "
+                f"in {batch.elapsed:.3f}s ({rate:,.0f} rows/s)"
+            )
+
+        total_time = time.perf_counter() - total_start
+        if max_batches is not None and batches == max_batches:
+            self.stdout.write(self.style.WARNING("Stopped at --max-batches; the next run will rescan this range."))
+        else:
+            run = detector.finish_run(run)
+        run.refresh_from_db()
+
+        rate = run.products_scanned / total_time if total_time else 0
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Scanned {run.products_scanned:,} products ({rate:,.0f} rows/s), {run.products_changed:,} changed: "
+                f"{run.price_drops:,} price drops, {run.back_in_stock:,} restocks, "
+                f"{run.alerts_created:,} alerts in {run.batches_created:,} user batches, {total_time:.3f}s"
+            )
+        )
@@ -0,0 +1,88 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.favorites.positions import FavoritePositionsRebalancer
+
+
+class Command(BaseCommand):
+    help = "Renumber favorite collections whose item position gaps ran out, in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            dest="batch_size",
+            type=int,
+            default=500,
+            help="Number of collections checked per batch/transaction (default: 500)",
+        )
+        parser.add_argument(
+            "--min-gap",
+            dest="min_gap",
+            type=int,
+            default=2,
+            help="Rebalance collections with neighbouring items closer than this (default: 2)",
+        )
+        parser.add_argument(
+            "--max-batches",
+            dest="max_batches",
+            type=int,
+            default=None,
+            help="Stop after this many batches (default: run until every collection was checked)",
+        )
+        parser.add_argument(
+            "--sleep",
+            dest="sleep",
+            type=float,
+            default=0.0,
+            help="Seconds to pause between batches to leave room for live traffic (default: 0)",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            dest="dry_run",
+            default=False,
+            help="Only report which collections would be rebalanced.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        min_gap = options["min_gap"]
+        max_batches = options["max_batches"]
+        dry_run = options["dry_run"]
+
+        if batch_size <= 0:
+            raise CommandError("batch-size must be positive")
+        if min_gap <= 1:
+            raise CommandError("min-gap must be greater than 1")
+        if max_batches is not None and max_batches <= 0:
+            raise CommandError("max-batches must be positive")
+
+        rebalancer = FavoritePositionsRebalancer(batch_size=batch_size, min_gap=min_gap)
+        self.stdout.write(self.style.NOTICE(f"Checking favorite collections in batches of {batch_size}..."))
+
+        total_start = time.perf_counter()
+        checked = rebalanced = renumbered = 0
+
+        for batch in rebalancer.iter_batches(dry_run=dry_run, max_batches=max_batches):
+            checked += batch.collections_checked
+            rebalanced += batch.collections_rebalanced
+            renumbered += batch.items_renumbered
+
+            if batch.collections_rebalanced:
+                self.stdout.write(
+                    f"- {batch.collections_rebalanced} of {batch.collections_checked} collections need room, "
+                    f"{batch.items_renumbered} items renumbered in {batch.elapsed:.3f}s"
+                )
+
+            if options["sleep"]:
+                time.sleep(options["sleep"])
+
+        total_time = time.perf_counter() - total_start
+        verb = "would be rebalanced" if dry_run else "rebalanced"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{rebalanced:,} of {checked:,} collections {verb} "
+                f"({renumbered:,} items renumbered) in {total_time:.3f}s"
+            )
+        )
@@ -43,6 +43,13 @@ class Command(BaseCommand):
             default=False,
             help="Do not drop indexes or apply PostgreSQL optimizations.",
         )
+        parser.add_argument(
+            "--seed",
+            dest="seed",
+            type=int,
+            default=None,
+            help="Seed for the random generator, to reproduce a run (default: random)",
+        )
 
     def handle(self, *args, **options):
         percentage = options["percentage"]
@@ -77,7 +84,7 @@ class Command(BaseCommand):
                 self.stdout.write(
                     self.style.NOTICE(f"Creating favorite collections for {percentage}% of users...")
                 )
-                collections_generator = FavoriteCollectionsGenerator()
+                collections_generator = FavoriteCollectionsGenerator(seed=options["seed"])
                 user_ids = collections_generator.select_users_and_create_collections(percentage)
 
                 if not user_ids:
@@ -89,7 +96,7 @@ class Command(BaseCommand):
                     self.stdout.write(
                         self.style.NOTICE(f"Generating {min_items}-{max_items} favorite items per collection...")
                     )
-                    items_generator = FavoriteItemsGenerator()
+                    items_generator = FavoriteItemsGenerator(seed=options["seed"])
                     items_generator.generate_for_users(user_ids, min_items, max_items)
 
         except DatabaseError as e:
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.5 on 2026-10-19 12:00
+
+from django.db import migrations, models
+
+
+BACKFILL_NEXT_POSITION_SQL = """
+UPDATE favorites_favoritecollection c
+SET next_position = m.max_position + 1
+FROM (
+    SELECT collection_id, MAX(position) AS max_position
+    FROM favorites_favoriteitem
+    GROUP BY collection_id
+) m
+WHERE m.collection_id = c.id
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('favorites', '0003_remove_favoriteitem_idx_fi_prod_pos_cr'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='favoritecollection',
+            name='next_position',
+            field=models.PositiveIntegerField(default=1, help_text='Position the next appended item receives'),
+        ),
+        migrations.RunSQL(BACKFILL_NEXT_POSITION_SQL, reverse_sql=migrations.RunSQL.noop),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.5 on 2026-10-19 12:00
+
+from django.db import migrations, models
+
+
+SPREAD_POSITIONS_SQL = """
+WITH ranked AS (
+    SELECT id, collection_id,
+           row_number() OVER (PARTITION BY collection_id ORDER BY position, created_at DESC, id) * 1024 AS position
+    FROM favorites_favoriteitem
+),
+renumbered AS (
+    UPDATE favorites_favoriteitem i
+    SET position = r.position
+    FROM ranked r
+    WHERE i.id = r.id
+)
+UPDATE favorites_favoritecollection c
+SET next_position = COALESCE(m.max_position, 0) + 1024
+FROM favorites_favoritecollection c2
+LEFT JOIN (
+    SELECT collection_id, MAX(position) AS max_position
+    FROM ranked
+    GROUP BY collection_id
+) m ON m.collection_id = c2.id
+WHERE c2.id = c.id
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('favorites', '0004_favoritecollection_next_position'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='favoritecollection',
+            name='next_position',
+            field=models.PositiveIntegerField(default=1024, help_text='Position the next appended item receives'),
+        ),
+        migrations.RunSQL(SPREAD_POSITIONS_SQL, reverse_sql=migrations.RunSQL.noop),
+    ]
@@ -0,0 +1,91 @@
+# Generated by Django 5.2.5 on 2026-10-19 12:00
+
+from django.db import migrations, models
+
+
+BACKFILL_SUMMARIES_SQL = """
+WITH counts AS (
+    SELECT collection_id, count(*) AS items_count
+    FROM favorites_favoriteitem
+    GROUP BY collection_id
+),
+per_currency AS (
+    SELECT i.collection_id, cur.code, cur.symbol,
+           SUM(COALESCE(inv.sale_price, inv.base_price)) AS amount,
+           count(*) AS items
+    FROM favorites_favoriteitem i
+    JOIN inventories_productinventory inv ON inv.product_id = i.product_id
+    JOIN inventories_currency cur ON cur.code = inv.currency_id
+    GROUP BY i.collection_id, cur.code, cur.symbol
+),
+totals AS (
+    SELECT collection_id,
+           jsonb_agg(
+               jsonb_build_object('currency', code, 'symbol', symbol, 'amount', amount::text)
+               ORDER BY items DESC, code
+           ) AS total_values
+    FROM per_currency
+    GROUP BY collection_id
+),
+ranked AS (
+    SELECT i.collection_id, p.image_url, p.product_display_name,
+           CASE
+               WHEN inv.product_id IS NULL THEN NULL
+               WHEN cur.symbol <> '' THEN cur.symbol || round(COALESCE(inv.sale_price, inv.base_price), cur.decimals)::text
+               ELSE round(COALESCE(inv.sale_price, inv.base_price), cur.decimals)::text || ' ' || cur.code
+           END AS price,
+           row_number() OVER (PARTITION BY i.collection_id ORDER BY i.position, i.created_at DESC, i.id) AS rank
+    FROM favorites_favoriteitem i
+    JOIN catalog_product p ON p.id = i.product_id
+    LEFT JOIN inventories_productinventory inv ON inv.product_id = i.product_id
+    LEFT JOIN inventories_currency cur ON cur.code = inv.currency_id
+    WHERE p.image_url IS NOT NULL
+),
+covers AS (
+    SELECT collection_id,
+           jsonb_agg(
+               jsonb_build_object('image_url', image_url, 'name', product_display_name, 'price', price)
+               ORDER BY rank
+           ) AS cover_items
+    FROM ranked
+    WHERE rank <= 10
+    GROUP BY collection_id
+)
+UPDATE favorites_favoritecollection c
+SET items_count = COALESCE(counts.items_count, 0),
+    total_values = COALESCE(totals.total_values, '[]'::jsonb),
+    cover_items = COALESCE(covers.cover_items, '[]'::jsonb)
+FROM favorites_favoritecollection c2
+LEFT JOIN counts ON counts.collection_id = c2.id
+LEFT JOIN totals ON totals.collection_id = c2.id
+LEFT JOIN covers ON covers.collection_id = c2.id
+WHERE c.id = c2.id
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0018_productviewstats'),
+        ('favorites', '0005_gap_based_positions'),
+        ('inventories', '0004_productinventory_available_quantity_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='favoritecollection',
+            name='items_count',
+            field=models.PositiveIntegerField(default=0, help_text='Number of items in the collection'),
+        ),
+        migrations.AddField(
+            model_name='favoritecollection',
+            name='total_values',
+            field=models.JSONField(blank=True, default=list, help_text='Current value of the items per currency: [{currency, symbol, amount}], largest share first'),
+        ),
+        migrations.AddField(
+            model_name='favoritecollection',
+            name='cover_items',
+            field=models.JSONField(blank=True, default=list, help_text='First items with an image, in collection order: [{image_url, name, price}]'),
+        ),
+        migrations.RunSQL(BACKFILL_SUMMARIES_SQL, reverse_sql=migrations.RunSQL.noop),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 5.2.5 on 2026-10-19 12:00
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0018_productviewstats'),
+        ('favorites', '0006_favoritecollection_summaries'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProductAlertSnapshot',
+            fields=[
+                ('product', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='alert_snapshot', serialize=False, to='catalog.product')),
+                ('price', models.DecimalField(decimal_places=2, help_text='Effective price (sale price if set, otherwise base price)', max_digits=10)),
+                ('currency_code', models.CharField(max_length=3)),
+                ('in_stock', models.BooleanField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='FavoriteAlertRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('started_at', models.DateTimeField()),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('since', models.DateTimeField(blank=True, help_text='Inventory changed at or after this moment was scanned; null for a full scan', null=True)),
+                ('products_scanned', models.PositiveIntegerField(default=0)),
+                ('products_changed', models.PositiveIntegerField(default=0)),
+                ('price_drops', models.PositiveIntegerField(default=0)),
+                ('back_in_stock', models.PositiveIntegerField(default=0)),
+                ('batches_created', models.PositiveIntegerField(default=0)),
+                ('alerts_created', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'ordering': ['-started_at'],
+                'indexes': [models.Index(fields=['-started_at'], name='idx_fav_alert_run_started')],
+            },
+        ),
+        migrations.CreateModel(
+            name='FavoriteAlertBatch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('items', models.JSONField(default=list, help_text='[{product_id, kind, old_price, new_price, currency}]')),
+                ('items_count', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('sent_at', models.DateTimeField(blank=True, null=True)),
+                ('run', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='batches', to='favorites.favoritealertrun')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='favorite_alert_batches', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'indexes': [
+                    models.Index(fields=['user', '-created_at'], name='idx_fav_alert_batch_user'),
+                    models.Index(condition=models.Q(('sent_at__isnull', True)), fields=['created_at'], name='idx_fav_alert_batch_unsent'),
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.5 on 2026-10-19 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('favorites', '0007_favorite_alerts'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='favoritecollection',
+            name='total_values',
+            field=models.JSONField(blank=True, default=list, help_text='Current value of the items per currency: [{currency, symbol, amount, items}], largest share first'),
+        ),
+        migrations.AlterField(
+            model_name='favoritecollection',
+            name='cover_items',
+            field=models.JSONField(blank=True, default=list, help_text='First items with an image, in collection order: [{product_id, image_url, name, price}]'),
+        ),
+    ]
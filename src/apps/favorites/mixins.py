@@ -24,6 +24,7 @@ class FavoriteItemsQuerysetMixin:
                 'product__inventory__is_active',
                 'product__inventory__stock_quantity',
                 'product__inventory__reserved_quantity',
+                'product__inventory__available_quantity',
                 'product__inventory__base_price',
                 'product__inventory__sale_price',
                 'product__inventory__currency__symbol',
@@ -1,10 +1,31 @@
+import json
+from decimal import Decimal
+
+from django.apps import apps
 from django.contrib.auth import get_user_model
-from django.db import models
+from django.db import connection, models, transaction
 from django.urls import reverse
 from django_extensions.db.fields import AutoSlugField
 
+from apps.outbox.publisher import FAVORITE_CHANGED, publish
+
 User = get_user_model()
 
+# Items are spaced POSITION_GAP apart so a move only rewrites the moved item.
+POSITION_GAP = 1024
+
+# Number of items kept in a collection's cover (the list page slider).
+COVER_ITEMS_LIMIT = 10
+
+# Display price of an item, as stored in cover_items (`inv` and `cur` are joined by the caller).
+PRICE_LABEL_SQL = """
+    CASE
+        WHEN inv.product_id IS NULL THEN NULL
+        WHEN cur.symbol <> '' THEN cur.symbol || round(COALESCE(inv.sale_price, inv.base_price), cur.decimals)::text
+        ELSE round(COALESCE(inv.sale_price, inv.base_price), cur.decimals)::text || ' ' || cur.code
+    END
+"""
+
 
 class FavoriteCollection(models.Model):
     user = models.ForeignKey(
@@ -34,6 +55,26 @@ class FavoriteCollection(models.Model):
         default=False,
         help_text="Whether this collection is visible to other users"
     )
+    next_position = models.PositiveIntegerField(
+        default=POSITION_GAP,
+        help_text="Position the next appended item receives"
+    )
+
+    # Summary columns, kept by apply_item_change() for single items and refresh_summaries() otherwise.
+    items_count = models.PositiveIntegerField(
+        default=0,
+        help_text="Number of items in the collection"
+    )
+    total_values = models.JSONField(
+        default=list,
+        blank=True,
+        help_text="Current value of the items per currency: [{currency, symbol, amount, items}], largest share first"
+    )
+    cover_items = models.JSONField(
+        default=list,
+        blank=True,
+        help_text="First items with an image, in collection order: [{product_id, image_url, name, price}]"
+    )
 
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -84,26 +125,348 @@ class FavoriteCollection(models.Model):
             ).exclude(pk=self.pk).update(is_default=False)
 
     @property
-    def items_count(self):
-        return self.favorite_items.count()
+    def primary_total(self):
+        return self.total_values[0] if self.total_values else None
+
+    @classmethod
+    def refresh_summaries(cls, collection_ids) -> int:
+        """
+        Recompute items_count, total_values and cover_items of `collection_ids`.
+
+        One statement aggregates the items of all given collections, so call it
+        inside the transaction that changed them (or with the ids affected by a
+        price change) rather than per item.
+        """
+        collection_ids = sorted(set(collection_ids))
+        if not collection_ids:
+            return 0
+
+        inventory_model = apps.get_model('inventories', 'ProductInventory')
+        currency_model = apps.get_model('inventories', 'Currency')
+
+        collections_table = cls._meta.db_table
+        items_table = FavoriteItem._meta.db_table
+        inventory_table = inventory_model._meta.db_table
+        currency_table = currency_model._meta.db_table
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                WITH target AS (
+                    SELECT unnest(%(ids)s::bigint[]) AS id
+                ),
+                counts AS (
+                    SELECT collection_id, count(*) AS items_count
+                    FROM {items_table}
+                    WHERE collection_id = ANY(%(ids)s)
+                    GROUP BY collection_id
+                ),
+                per_currency AS (
+                    SELECT i.collection_id, cur.code, cur.symbol,
+                           SUM(COALESCE(inv.sale_price, inv.base_price)) AS amount,
+                           count(*) AS items
+                    FROM {items_table} i
+                    JOIN {inventory_table} inv ON inv.product_id = i.product_id
+                    JOIN {currency_table} cur ON cur.code = inv.currency_id
+                    WHERE i.collection_id = ANY(%(ids)s)
+                    GROUP BY i.collection_id, cur.code, cur.symbol
+                ),
+                totals AS (
+                    SELECT collection_id,
+                           jsonb_agg(
+                               jsonb_build_object(
+                                   'currency', code, 'symbol', symbol, 'amount', amount::text, 'items', items
+                               )
+                               ORDER BY items DESC, code
+                           ) AS total_values
+                    FROM per_currency
+                    GROUP BY collection_id
+                ),
+                {cls._covers_ctes_sql()}
+                UPDATE {collections_table} c
+                SET items_count = COALESCE(counts.items_count, 0),
+                    total_values = COALESCE(totals.total_values, '[]'::jsonb),
+                    cover_items = COALESCE(covers.cover_items, '[]'::jsonb)
+                FROM target
+                LEFT JOIN counts ON counts.collection_id = target.id
+                LEFT JOIN totals ON totals.collection_id = target.id
+                LEFT JOIN covers ON covers.collection_id = target.id
+                WHERE c.id = target.id
+                """,
+                {'ids': collection_ids, 'cover_limit': COVER_ITEMS_LIMIT},
+            )
+            return cursor.rowcount
+
+    @classmethod
+    def refresh_covers(cls, collection_ids) -> int:
+        """Recompute only cover_items of `collection_ids`, for changes that keep counts and totals (reorders)."""
+        collection_ids = sorted(set(collection_ids))
+        if not collection_ids:
+            return 0
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                WITH target AS (
+                    SELECT unnest(%(ids)s::bigint[]) AS id
+                ),
+                {cls._covers_ctes_sql()}
+                UPDATE {cls._meta.db_table} c
+                SET cover_items = COALESCE(covers.cover_items, '[]'::jsonb)
+                FROM target
+                LEFT JOIN covers ON covers.collection_id = target.id
+                WHERE c.id = target.id
+                """,
+                {'ids': collection_ids, 'cover_limit': COVER_ITEMS_LIMIT},
+            )
+            return cursor.rowcount
+
+    @staticmethod
+    def _covers_ctes_sql() -> str:
+        """`ranked` and `covers` CTEs building cover_items for the collections in %(ids)s."""
+        items_table = FavoriteItem._meta.db_table
+        product_table = apps.get_model('catalog', 'Product')._meta.db_table
+        inventory_table = apps.get_model('inventories', 'ProductInventory')._meta.db_table
+        currency_table = apps.get_model('inventories', 'Currency')._meta.db_table
+
+        return f"""
+                ranked AS (
+                    SELECT i.collection_id, i.position, i.created_at, i.id, i.product_id,
+                           p.image_url, p.product_display_name,
+                           {PRICE_LABEL_SQL} AS price,
+                           row_number() OVER (
+                               PARTITION BY i.collection_id
+                               ORDER BY i.position, i.created_at DESC, i.id
+                           ) AS rank
+                    FROM {items_table} i
+                    JOIN {product_table} p ON p.id = i.product_id
+                    LEFT JOIN {inventory_table} inv ON inv.product_id = i.product_id
+                    LEFT JOIN {currency_table} cur ON cur.code = inv.currency_id
+                    WHERE i.collection_id = ANY(%(ids)s) AND p.image_url IS NOT NULL
+                ),
+                covers AS (
+                    SELECT collection_id,
+                           jsonb_agg(
+                               jsonb_build_object(
+                                   'product_id', product_id, 'image_url', image_url,
+                                   'name', product_display_name, 'price', price
+                               )
+                               ORDER BY rank
+                           ) AS cover_items
+                    FROM ranked
+                    WHERE rank <= %(cover_limit)s
+                    GROUP BY collection_id
+                )
+        """
+
+    @classmethod
+    def apply_item_change(cls, collection_id, product_id, added: bool, appended: bool = True) -> None:
+        """
+        Update one collection's summary for a single added or removed item.
+
+        The count and the item's currency total are adjusted by its own price
+        instead of re-aggregating the collection. cover_items only changes when
+        an appended item fits a short cover; an item placed mid-collection, a
+        removed cover item, or a summary written before totals carried item
+        counts falls back to refresh_summaries. Call it inside the transaction
+        that changed the item, after the change.
+        """
+        inventory_model = apps.get_model('inventories', 'ProductInventory')
+        currency_model = apps.get_model('inventories', 'Currency')
+        product_model = apps.get_model('catalog', 'Product')
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                SELECT c.total_values, c.cover_items, p.id, p.image_url, p.product_display_name,
+                       cur.code, cur.symbol, COALESCE(inv.sale_price, inv.base_price),
+                       {PRICE_LABEL_SQL}
+                FROM {cls._meta.db_table} c
+                LEFT JOIN {product_model._meta.db_table} p ON p.id = %(product_id)s
+                LEFT JOIN {inventory_model._meta.db_table} inv ON inv.product_id = p.id
+                LEFT JOIN {currency_model._meta.db_table} cur ON cur.code = inv.currency_id
+                WHERE c.id = %(collection_id)s
+                FOR UPDATE OF c
+                """,
+                {'collection_id': collection_id, 'product_id': product_id},
+            )
+            row = cursor.fetchone()
+            if row is None:
+                return
+
+            total_values, cover_items, found, image_url, name, currency, symbol, amount, price = row
+            total_values = json.loads(total_values) if isinstance(total_values, str) else total_values
+            cover_items = json.loads(cover_items) if isinstance(cover_items, str) else cover_items
+
+            needs_refresh = (
+                found is None
+                or any('items' not in entry for entry in total_values)
+                or any('product_id' not in entry for entry in cover_items)
+            )
+            if added and image_url is not None:
+                if not appended:
+                    needs_refresh = True
+                elif len(cover_items) < COVER_ITEMS_LIMIT:
+                    cover_items.append({'product_id': product_id, 'image_url': image_url, 'name': name, 'price': price})
+            if not added and any(entry['product_id'] == product_id for entry in cover_items if 'product_id' in entry):
+                needs_refresh = True
+
+            if needs_refresh:
+                cls.refresh_summaries([collection_id])
+                return
+
+            sign = 1 if added else -1
+            if currency is not None:
+                entry = next((entry for entry in total_values if entry['currency'] == currency), None)
+                if entry is None:
+                    entry = {'currency': currency, 'symbol': symbol, 'amount': '0', 'items': 0}
+                    total_values.append(entry)
+                entry['amount'] = str(Decimal(entry['amount']) + sign * amount)
+                entry['items'] += sign
+                total_values = sorted(
+                    (entry for entry in total_values if entry['items'] > 0),
+                    key=lambda entry: (-entry['items'], entry['currency']),
+                )
+
+            cursor.execute(
+                f"""
+                UPDATE {cls._meta.db_table}
+                SET items_count = GREATEST(items_count + %s, 0),
+                    total_values = %s::jsonb,
+                    cover_items = %s::jsonb
+                WHERE id = %s
+                """,
+                [sign, json.dumps(total_values), json.dumps(cover_items), collection_id],
+            )
+
+    @classmethod
+    def allocate_positions(cls, collection_id, count: int = 1) -> int:
+        """
+        Reserve `count` positions, POSITION_GAP apart, at the end of a collection.
+
+        The counter is bumped with a single UPDATE ... RETURNING, so the
+        collection row lock serializes concurrent appends. Returns the first
+        reserved position.
+        """
+        step = count * POSITION_GAP
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                UPDATE {cls._meta.db_table}
+                SET next_position = next_position + %s
+                WHERE id = %s
+                RETURNING next_position - %s
+                """,
+                [step, collection_id, step],
+            )
+            row = cursor.fetchone()
+
+        if row is None:
+            raise cls.DoesNotExist(f"FavoriteCollection {collection_id} does not exist")
+        return row[0]
+
+    @classmethod
+    def sync_next_positions(cls, collection_ids=None) -> int:
+        """Move counters past the highest stored position (after raw or bulk inserts)."""
+        items_table = FavoriteItem._meta.db_table
+        conditions = ["m.collection_id = c.id", "c.next_position <= m.max_position"]
+        params = [POSITION_GAP]
+        if collection_ids is not None:
+            conditions.append("c.id = ANY(%s)")
+            params.append(list(collection_ids))
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                UPDATE {cls._meta.db_table} c
+                SET next_position = m.max_position + %s
+                FROM (
+                    SELECT collection_id, MAX(position) AS max_position
+                    FROM {items_table}
+                    GROUP BY collection_id
+                ) m
+                WHERE {' AND '.join(conditions)}
+                """,
+                params,
+            )
+            return cursor.rowcount
 
     def add_product(self, product, position=None):
-        if position is None:
-            last_item = self.favorite_items.order_by('-position').first()
-            position = (last_item.position + 1) if last_item else 1
+        """
+        Append `product` (or place it at `position`) unless it is already in the collection.
+
+        Allocating the position and inserting the item is one statement; only
+        an already-favorited product costs a second query to load its row.
+        """
+        items_table = FavoriteItem._meta.db_table
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                WITH allocated AS (
+                    UPDATE {self._meta.db_table}
+                    SET next_position = CASE
+                        WHEN %(position)s::integer IS NULL THEN next_position + %(gap)s
+                        ELSE GREATEST(next_position, %(position)s::integer + %(gap)s)
+                    END
+                    WHERE id = %(collection_id)s
+                      AND NOT EXISTS (
+                          SELECT 1 FROM {items_table}
+                          WHERE collection_id = %(collection_id)s AND product_id = %(product_id)s
+                      )
+                    RETURNING COALESCE(%(position)s::integer, next_position - %(gap)s) AS position
+                )
+                INSERT INTO {items_table} (collection_id, product_id, position, note, created_at)
+                SELECT %(collection_id)s, %(product_id)s, position, '', now()
+                FROM allocated
+                ON CONFLICT (collection_id, product_id) DO NOTHING
+                RETURNING id, position, created_at
+                """,
+                {'collection_id': self.pk, 'product_id': product.pk, 'position': position, 'gap': POSITION_GAP},
+            )
+            row = cursor.fetchone()
+
+            if row is None:
+                return FavoriteItem.objects.get(collection=self, product=product), False
 
-        favorite_item, created = FavoriteItem.objects.get_or_create(
+            FavoriteCollection.apply_item_change(self.pk, product.pk, added=True, appended=position is None)
+            publish(FAVORITE_CHANGED, [product.pk], {'collection_id': self.pk})
+
+        item_id, item_position, created_at = row
+        favorite_item = FavoriteItem(
+            id=item_id,
             collection=self,
             product=product,
-            defaults={'position': position}
+            position=item_position,
+            note='',
+            created_at=created_at,
         )
-        return favorite_item, created
+        favorite_item._state.adding = False
+        return favorite_item, True
 
     def remove_product(self, product):
-        return FavoriteItem.objects.filter(
-            collection=self,
-            product=product
-        ).delete()
+        with transaction.atomic():
+            result = FavoriteItem.objects.filter(
+                collection=self,
+                product=product
+            ).delete()
+            if result[0]:
+                FavoriteCollection.apply_item_change(self.pk, product.pk, added=False)
+                publish(FAVORITE_CHANGED, [product.pk], {'collection_id': self.pk})
+        return result
+
+    def remove_items(self, item_ids=None) -> int:
+        """Delete the given items (all items when `item_ids` is None) and refresh the summary."""
+        items = FavoriteItem.objects.filter(collection=self)
+        if item_ids is not None:
+            items = items.filter(id__in=item_ids)
+
+        with transaction.atomic():
+            deleted, _ = items.delete()
+            if deleted:
+                FavoriteCollection.refresh_summaries([self.pk])
+                publish(FAVORITE_CHANGED, payload={'collection_id': self.pk, 'removed': deleted})
+        return deleted
 
     def has_product(self, product):
         return self.favorite_items.filter(product=product).exists()
@@ -155,10 +518,108 @@ class FavoriteItem(models.Model):
         return f"{self.collection.name} - {self.product.product_display_name}"
 
     def save(self, *args, **kwargs):
-        if not self.position:
-            last_item = FavoriteItem.objects.filter(
-                collection=self.collection
-            ).order_by('-position').first()
-            self.position = (last_item.position + 1) if last_item else 1
+        """Save and keep the collection summaries in step (see FavoriteCollection.apply_item_change)."""
+        with transaction.atomic():
+            adding = self._state.adding
+            appended = not self.position
+            if appended:
+                self.position = FavoriteCollection.allocate_positions(self.collection_id)
 
-        super().save(*args, **kwargs)
+            previous_collection_id = None
+            if not adding:
+                previous_collection_id = (
+                    FavoriteItem.objects.filter(pk=self.pk).values_list('collection_id', flat=True).first()
+                )
+
+            super().save(*args, **kwargs)
+
+            if adding:
+                FavoriteCollection.apply_item_change(self.collection_id, self.product_id, added=True, appended=appended)
+            elif self._summary_fields_changed(kwargs.get('update_fields')):
+                FavoriteCollection.refresh_summaries(
+                    {self.collection_id, previous_collection_id or self.collection_id}
+                )
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            result = super().delete(*args, **kwargs)
+            FavoriteCollection.apply_item_change(self.collection_id, self.product_id, added=False)
+        return result
+
+    @staticmethod
+    def _summary_fields_changed(update_fields) -> bool:
+        if update_fields is None:
+            return True
+        return bool(set(update_fields) & {'collection', 'collection_id', 'product', 'product_id', 'position'})
+
+
+class ProductAlertSnapshot(models.Model):
+    """Last effective price and availability seen by the favorite alerts detector."""
+    product = models.OneToOneField(
+        'catalog.Product',
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='alert_snapshot'
+    )
+    price = models.DecimalField(
+        max_digits=10,
+        decimal_places=2,
+        help_text="Effective price (sale price if set, otherwise base price)"
+    )
+    currency_code = models.CharField(max_length=3)
+    in_stock = models.BooleanField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+
+class FavoriteAlertRun(models.Model):
+    started_at = models.DateTimeField()
+    finished_at = models.DateTimeField(null=True, blank=True)
+    since = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="Inventory changed at or after this moment was scanned; null for a full scan"
+    )
+    products_scanned = models.PositiveIntegerField(default=0)
+    products_changed = models.PositiveIntegerField(default=0)
+    price_drops = models.PositiveIntegerField(default=0)
+    back_in_stock = models.PositiveIntegerField(default=0)
+    batches_created = models.PositiveIntegerField(default=0)
+    alerts_created = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ['-started_at']
+        indexes = [
+            models.Index(fields=['-started_at'], name='idx_fav_alert_run_started'),
+        ]
+
+
+class FavoriteAlertBatch(models.Model):
+    """Price-drop and back-in-stock alerts for one user, produced by one detector batch."""
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='favorite_alert_batches'
+    )
+    run = models.ForeignKey(
+        FavoriteAlertRun,
+        on_delete=models.CASCADE,
+        related_name='batches'
+    )
+    items = models.JSONField(
+        default=list,
+        help_text="[{product_id, kind, old_price, new_price, currency}]"
+    )
+    items_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', '-created_at'], name='idx_fav_alert_batch_user'),
+            models.Index(
+                fields=['created_at'],
+                condition=models.Q(sent_at__isnull=True),
+                name='idx_fav_alert_batch_unsent'
+            ),
+        ]
@@ -0,0 +1,282 @@
+import time
+from dataclasses import dataclass
+from typing import Iterator, List, Optional, Sequence
+
+from django.db import connection, transaction
+
+from apps.catalog.models import Product
+from apps.outbox.publisher import FAVORITE_CHANGED, publish
+
+from .models import COVER_ITEMS_LIMIT, POSITION_GAP, FavoriteCollection, FavoriteItem
+
+# Rebalance before positions approach the PositiveIntegerField limit.
+POSITION_LIMIT = 2_000_000_000
+
+
+class UnknownItemsError(ValueError):
+    def __init__(self, item_ids):
+        self.item_ids = sorted(item_ids)
+        super().__init__(f"Items with IDs {self.item_ids} do not exist in this collection")
+
+
+@dataclass(frozen=True)
+class ItemMove:
+    """Move `item_id` in front of `before_id`, or right behind `after_id`; with neither, to the end."""
+    item_id: int
+    before_id: Optional[int] = None
+    after_id: Optional[int] = None
+
+
+@dataclass
+class PositionsRebalanceBatch:
+    collections_checked: int
+    collections_rebalanced: int
+    items_renumbered: int
+    elapsed: float
+
+
+class FavoritePositionsService:
+    """
+    Reorder a collection with "move X before Y" / "move X after Y" operations.
+
+    Items are spaced POSITION_GAP apart, so a move gives the item the midpoint
+    between its new neighbours and only that row is written. When two
+    neighbours run out of room the whole collection is renumbered in the same
+    write; the background rebalancer keeps that path rare.
+    """
+
+    def __init__(self, collection: FavoriteCollection) -> None:
+        self.collection = collection
+
+    def apply_moves(self, moves: Sequence[ItemMove]) -> int:
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT id FROM {FavoriteCollection._meta.db_table} WHERE id = %s FOR UPDATE",
+                [self.collection.pk],
+            )
+            cursor.execute(
+                f"""
+                SELECT i.id, i.position, p.image_url IS NOT NULL
+                FROM {FavoriteItem._meta.db_table} i
+                JOIN {Product._meta.db_table} p ON p.id = i.product_id
+                WHERE i.collection_id = %s
+                ORDER BY i.position, i.created_at DESC, i.id
+                """,
+                [self.collection.pk],
+            )
+            rows = cursor.fetchall()
+
+            order = [row[0] for row in rows]
+            positions = {item_id: position for item_id, position, _ in rows}
+            with_image = {item_id for item_id, _, has_image in rows if has_image}
+            cover_before = self._cover(order, with_image)
+
+            referenced = {
+                item_id
+                for move in moves
+                for item_id in (move.item_id, move.before_id, move.after_id)
+                if item_id is not None
+            }
+            missing = referenced - positions.keys()
+            if missing:
+                raise UnknownItemsError(missing)
+
+            changed = self._simulate(order, positions, moves)
+            if not changed:
+                return 0
+
+            self._write_positions(cursor, {item_id: positions[item_id] for item_id in changed})
+            cursor.execute(
+                f"""
+                UPDATE {FavoriteCollection._meta.db_table}
+                SET next_position = GREATEST(next_position, %s), updated_at = now()
+                WHERE id = %s
+                """,
+                [max(positions.values()) + POSITION_GAP, self.collection.pk],
+            )
+            # A reorder keeps the count and totals; only the cover can change.
+            if self._cover(order, with_image) != cover_before:
+                FavoriteCollection.refresh_covers([self.collection.pk])
+            publish(FAVORITE_CHANGED, payload={'collection_id': self.collection.pk, 'reordered': len(changed)})
+
+        return len(changed)
+
+    @staticmethod
+    def _cover(order: List[int], with_image: set) -> List[int]:
+        """Ids of the items cover_items shows, in order."""
+        return [item_id for item_id in order if item_id in with_image][:COVER_ITEMS_LIMIT]
+
+    @staticmethod
+    def _simulate(order: List[int], positions: dict, moves: Sequence[ItemMove]) -> set:
+        changed = set()
+
+        for move in moves:
+            if move.item_id in (move.before_id, move.after_id):
+                continue
+
+            order.remove(move.item_id)
+            if move.after_id is not None:
+                index = order.index(move.after_id) + 1
+            elif move.before_id is not None:
+                index = order.index(move.before_id)
+            else:
+                index = len(order)
+            lower = positions[order[index - 1]] if index > 0 else 0
+
+            if index == len(order):
+                new_position = lower + POSITION_GAP
+            elif positions[order[index]] - lower >= 2:
+                new_position = (lower + positions[order[index]]) // 2
+            else:
+                new_position = None
+
+            order.insert(index, move.item_id)
+
+            if new_position is None:
+                for rank, item_id in enumerate(order, start=1):
+                    if positions[item_id] != rank * POSITION_GAP:
+                        positions[item_id] = rank * POSITION_GAP
+                        changed.add(item_id)
+            elif positions[move.item_id] != new_position:
+                positions[move.item_id] = new_position
+                changed.add(move.item_id)
+
+        return changed
+
+    @staticmethod
+    def _write_positions(cursor, new_positions: dict) -> None:
+        values_sql = ", ".join(["(%s, %s)"] * len(new_positions))
+        params = [value for pair in new_positions.items() for value in pair]
+
+        cursor.execute(
+            f"""
+            UPDATE {FavoriteItem._meta.db_table} i
+            SET position = v.position
+            FROM (VALUES {values_sql}) AS v(id, position)
+            WHERE i.id = v.id
+            """,
+            params,
+        )
+
+
+class FavoritePositionsRebalancer:
+    """
+    Renumber collections whose position gaps ran out, in the background.
+
+    Collections are walked in id batches; a collection qualifies when two
+    neighbours are closer than `min_gap` or its counter nears POSITION_LIMIT.
+    Each batch renumbers its qualifying collections with one statement.
+    """
+
+    def __init__(self, batch_size: int = 500, min_gap: int = 2) -> None:
+        self.batch_size = batch_size
+        self.min_gap = min_gap
+
+    def iter_batches(self, dry_run: bool = False, max_batches: Optional[int] = None) -> Iterator[PositionsRebalanceBatch]:
+        after_id = 0
+        batches = 0
+
+        while max_batches is None or batches < max_batches:
+            start_time = time.perf_counter()
+            with transaction.atomic(), connection.cursor() as cursor:
+                collection_ids = self._next_collection_ids(cursor, after_id)
+                if not collection_ids:
+                    return
+
+                tight_ids = self._tight_collection_ids(cursor, collection_ids)
+                renumbered = 0
+                if tight_ids and not dry_run:
+                    renumbered = self.rebalance(cursor, tight_ids)
+                    FavoriteCollection.refresh_summaries(tight_ids)
+
+            after_id = collection_ids[-1]
+            batches += 1
+            yield PositionsRebalanceBatch(
+                collections_checked=len(collection_ids),
+                collections_rebalanced=len(tight_ids),
+                items_renumbered=renumbered,
+                elapsed=time.perf_counter() - start_time,
+            )
+
+    def _next_collection_ids(self, cursor, after_id: int) -> List[int]:
+        cursor.execute(
+            f"""
+            SELECT id FROM {FavoriteCollection._meta.db_table}
+            WHERE id > %s
+            ORDER BY id
+            LIMIT %s
+            """,
+            [after_id, self.batch_size],
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+    def _tight_collection_ids(self, cursor, collection_ids: List[int]) -> List[int]:
+        cursor.execute(
+            f"""
+            SELECT c.id
+            FROM {FavoriteCollection._meta.db_table} c
+            WHERE c.id = ANY(%s)
+              AND (
+                  c.next_position > %s
+                  OR EXISTS (
+                      SELECT 1
+                      FROM (
+                          SELECT position - lag(position) OVER (ORDER BY position) AS gap
+                          FROM {FavoriteItem._meta.db_table}
+                          WHERE collection_id = c.id
+                      ) g
+                      WHERE g.gap < %s
+                  )
+              )
+            ORDER BY c.id
+            """,
+            [collection_ids, POSITION_LIMIT, self.min_gap],
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+    @staticmethod
+    def rebalance(cursor, collection_ids: List[int]) -> int:
+        """Renumber `collection_ids` to POSITION_GAP spacing, keeping their current order."""
+        items_table = FavoriteItem._meta.db_table
+        collections_table = FavoriteCollection._meta.db_table
+
+        cursor.execute(
+            f"SELECT id FROM {collections_table} WHERE id = ANY(%s) ORDER BY id FOR UPDATE",
+            [collection_ids],
+        )
+        cursor.execute(
+            f"""
+            WITH ranked AS (
+                SELECT id, collection_id,
+                       row_number() OVER (
+                           PARTITION BY collection_id
+                           ORDER BY position, created_at DESC, id
+                       ) * %s AS position
+                FROM {items_table}
+                WHERE collection_id = ANY(%s)
+            ),
+            renumbered AS (
+                UPDATE {items_table} i
+                SET position = r.position
+                FROM ranked r
+                WHERE i.id = r.id AND i.position <> r.position
+                RETURNING 1
+            ),
+            counters AS (
+                UPDATE {collections_table} c
+                SET next_position = COALESCE(m.max_position, 0) + %s
+                FROM unnest(%s::bigint[]) AS t(id)
+                LEFT JOIN (
+                    SELECT collection_id, MAX(position) AS max_position
+                    FROM ranked
+                    GROUP BY collection_id
+                ) m ON m.collection_id = t.id
+                WHERE c.id = t.id
+                RETURNING 1
+            )
+            SELECT (SELECT count(*) FROM renumbered), (SELECT count(*) FROM counters)
+            """,
+            [POSITION_GAP, collection_ids, POSITION_GAP, collection_ids],
+        )
+        renumbered, _ = cursor.fetchone()
+        return renumbered
@@ -0,0 +1,26 @@
+from django.db.models.signals import post_delete, pre_delete
+from django.dispatch import receiver
+
+from apps.catalog.models import Product
+from apps.outbox.publisher import FAVORITE_CHANGED, publish
+
+from .models import FavoriteCollection, FavoriteItem
+
+
+@receiver(pre_delete, sender=Product)
+def collect_favorite_collections(sender, instance, **kwargs):
+    # The cascade deletes the product's items without FavoriteItem.delete(),
+    # so remember the collections holding it before the rows are gone.
+    instance._favorite_collection_ids = list(
+        FavoriteItem.objects.filter(product=instance).values_list('collection_id', flat=True)
+    )
+
+
+@receiver(post_delete, sender=Product)
+def refresh_favorite_collections(sender, instance, **kwargs):
+    collection_ids = getattr(instance, '_favorite_collection_ids', None)
+    if not collection_ids:
+        return
+
+    FavoriteCollection.refresh_summaries(collection_ids)
+    publish(FAVORITE_CHANGED, [instance.pk], {'collection_ids': sorted(collection_ids)})
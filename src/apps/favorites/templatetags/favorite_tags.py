@@ -1,6 +1,8 @@
 from django import template
 from django.urls import reverse
 
+from apps.catalog.engagement import UserEngagement
+
 register = template.Library()
 
 
@@ -9,6 +11,8 @@ def favorite_button(context, product, size='normal', show_count=True):
     request = context['request']
     user = request.user
 
+    UserEngagement.for_request(request).bind(product)
+
     in_favorites = product.is_in_favorites(user) if user.is_authenticated else False
 
     favorites_count = product.get_favorites_count()
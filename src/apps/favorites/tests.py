@@ -1,3 +1,263 @@
+from datetime import timedelta
+from decimal import Decimal
+from unittest import mock
+
 from django.test import TestCase
+from django.utils import timezone
+
+from apps.inventories.models import ProductInventory
+from fixtures.factories.catalog import ProductFactory, ProductInventoryFactory
+from fixtures.factories.users import UserFactory
+
+from .alerts import BACK_IN_STOCK, PRICE_DROP, FavoriteAlertsDetector
+from .models import POSITION_GAP, FavoriteAlertBatch, FavoriteCollection, FavoriteItem, ProductAlertSnapshot
+from .positions import FavoritePositionsRebalancer, FavoritePositionsService, ItemMove, UnknownItemsError
+
+
+def make_collection(items=0, user=None, name='Wishlist'):
+    collection = FavoriteCollection.objects.create(user=user or UserFactory(), name=name)
+    item_ids = [collection.add_product(ProductFactory())[0].pk for _ in range(items)]
+    return collection, item_ids
+
+
+def set_positions(positions):
+    for item_id, position in positions.items():
+        FavoriteItem.objects.filter(pk=item_id).update(position=position)
+
+
+class FavoritePositionsServiceTests(TestCase):
+
+    def setUp(self):
+        self.collection, (self.a, self.b, self.c, self.d) = make_collection(items=4)
+        self.service = FavoritePositionsService(self.collection)
+
+    def order(self):
+        return list(
+            FavoriteItem.objects.filter(collection=self.collection)
+            .order_by('position', '-created_at', 'id')
+            .values_list('id', flat=True)
+        )
+
+    def position(self, item_id):
+        return FavoriteItem.objects.get(pk=item_id).position
+
+    def test_appended_items_are_spaced_by_the_gap(self):
+        self.assertEqual(
+            [self.position(item_id) for item_id in self.order()],
+            [POSITION_GAP, 2 * POSITION_GAP, 3 * POSITION_GAP, 4 * POSITION_GAP],
+        )
+
+    def test_move_before_takes_the_midpoint(self):
+        changed = self.service.apply_moves([ItemMove(self.d, before_id=self.b)])
+
+        self.assertEqual(changed, 1)
+        self.assertEqual(self.order(), [self.a, self.d, self.b, self.c])
+        self.assertEqual(self.position(self.d), (POSITION_GAP + 2 * POSITION_GAP) // 2)
+
+    def test_move_after_takes_the_midpoint(self):
+        changed = self.service.apply_moves([ItemMove(self.a, after_id=self.c)])
+
+        self.assertEqual(changed, 1)
+        self.assertEqual(self.order(), [self.b, self.c, self.a, self.d])
+        self.assertEqual(self.position(self.a), (3 * POSITION_GAP + 4 * POSITION_GAP) // 2)
+
+    def test_move_to_front_and_to_end(self):
+        self.service.apply_moves([ItemMove(self.c, before_id=self.a), ItemMove(self.b)])
+
+        self.assertEqual(self.order(), [self.c, self.a, self.d, self.b])
+        self.assertEqual(self.position(self.c), POSITION_GAP // 2)
+        self.assertEqual(self.position(self.b), 5 * POSITION_GAP)
+        self.collection.refresh_from_db()
+        self.assertGreaterEqual(self.collection.next_position, 6 * POSITION_GAP)
+
+    def test_moves_in_place_write_nothing(self):
+        moves = [ItemMove(self.a, before_id=self.a), ItemMove(self.b, after_id=self.a), ItemMove(self.d)]
+
+        self.assertEqual(self.service.apply_moves(moves), 0)
+        self.assertEqual(self.order(), [self.a, self.b, self.c, self.d])
+
+    def test_exhausted_gap_renumbers_the_collection(self):
+        set_positions({self.a: 1, self.b: 2, self.c: 3, self.d: 4})
+
+        changed = self.service.apply_moves([ItemMove(self.d, before_id=self.b)])
+
+        self.assertEqual(changed, 4)
+        self.assertEqual(self.order(), [self.a, self.d, self.b, self.c])
+        self.assertEqual(
+            [self.position(item_id) for item_id in self.order()],
+            [POSITION_GAP, 2 * POSITION_GAP, 3 * POSITION_GAP, 4 * POSITION_GAP],
+        )
+
+    def test_move_updates_the_cover_order(self):
+        self.service.apply_moves([ItemMove(self.d, before_id=self.a)])
+
+        self.collection.refresh_from_db()
+        product_ids = dict(FavoriteItem.objects.values_list('id', 'product_id'))
+        self.assertEqual(
+            [item['product_id'] for item in self.collection.cover_items],
+            [product_ids[item_id] for item_id in [self.d, self.a, self.b, self.c]],
+        )
+        self.assertEqual(self.collection.items_count, 4)
+
+    def test_move_outside_the_cover_skips_the_refresh(self):
+        with mock.patch.object(FavoriteCollection, 'refresh_covers') as refresh_covers:
+            with mock.patch('apps.favorites.positions.COVER_ITEMS_LIMIT', 2):
+                self.service.apply_moves([ItemMove(self.d, before_id=self.c)])
+
+        refresh_covers.assert_not_called()
+        self.assertEqual(self.order(), [self.a, self.b, self.d, self.c])
+
+    def test_unknown_items_are_rejected(self):
+        _, (foreign_id,) = make_collection(items=1)
+
+        with self.assertRaises(UnknownItemsError) as raised:
+            self.service.apply_moves([ItemMove(self.a, before_id=foreign_id)])
+
+        self.assertEqual(raised.exception.item_ids, [foreign_id])
+        self.assertEqual(self.order(), [self.a, self.b, self.c, self.d])
+
+
+class FavoritePositionsRebalancerTests(TestCase):
+
+    def setUp(self):
+        self.tight, self.tight_items = make_collection(items=3)
+        self.spaced, self.spaced_items = make_collection(items=2)
+        set_positions(dict(zip(self.tight_items, [1, 2, 3])))
+
+    def positions(self, item_ids):
+        return [FavoriteItem.objects.get(pk=item_id).position for item_id in item_ids]
+
+    def test_dry_run_reports_without_writing(self):
+        batches = list(FavoritePositionsRebalancer().iter_batches(dry_run=True))
+
+        self.assertEqual(sum(batch.collections_checked for batch in batches), 2)
+        self.assertEqual(sum(batch.collections_rebalanced for batch in batches), 1)
+        self.assertEqual(sum(batch.items_renumbered for batch in batches), 0)
+        self.assertEqual(self.positions(self.tight_items), [1, 2, 3])
+
+    def test_tight_collections_are_renumbered_in_order(self):
+        batches = list(FavoritePositionsRebalancer(batch_size=1).iter_batches())
+
+        self.assertEqual([batch.collections_checked for batch in batches], [1, 1])
+        self.assertEqual(sum(batch.collections_rebalanced for batch in batches), 1)
+        self.assertEqual(sum(batch.items_renumbered for batch in batches), 3)
+        self.assertEqual(self.positions(self.tight_items), [POSITION_GAP, 2 * POSITION_GAP, 3 * POSITION_GAP])
+        self.assertEqual(self.positions(self.spaced_items), [POSITION_GAP, 2 * POSITION_GAP])
+        self.tight.refresh_from_db()
+        self.assertEqual(self.tight.next_position, 4 * POSITION_GAP)
+
+    def test_max_batches_stops_early(self):
+        batches = list(FavoritePositionsRebalancer(batch_size=1).iter_batches(max_batches=1))
+
+        self.assertEqual(len(batches), 1)
+
+
+class FavoriteSummariesOnProductDeleteTests(TestCase):
+
+    def test_deleting_a_product_refreshes_its_collections(self):
+        collection, _ = make_collection()
+        kept, deleted = ProductFactory(), ProductFactory()
+        collection.add_product(kept)
+        collection.add_product(deleted)
+
+        deleted.delete()
+
+        collection.refresh_from_db()
+        self.assertEqual(collection.items_count, 1)
+        self.assertEqual([item['product_id'] for item in collection.cover_items], [kept.pk])
+
+
+class FavoriteAlertsDetectorTests(TestCase):
+
+    def setUp(self):
+        self.dropping = ProductInventoryFactory(base_price=Decimal('20.00'))
+        self.restocked = ProductInventoryFactory(stock_quantity=0)
+        self.steady = ProductInventoryFactory()
+        self.alice, self.bob = UserFactory(), UserFactory()
+
+        wishlist, _ = make_collection(user=self.alice)
+        gifts, _ = make_collection(user=self.alice, name='Gifts')
+        for inventory in (self.dropping, self.restocked, self.steady):
+            wishlist.add_product(inventory.product)
+        gifts.add_product(self.dropping.product)
+        make_collection(user=self.bob)[0].add_product(self.dropping.product)
+
+        self.detector = FavoriteAlertsDetector(overlap=timedelta(0))
+
+    def run_detector(self, full=False):
+        run = self.detector.start_run(full=full)
+        list(self.detector.iter_batches(run))
+        return self.detector.finish_run(run)
+
+    def change(self, inventory, **fields):
+        ProductInventory.objects.filter(pk=inventory.pk).update(updated_at=timezone.now(), **fields)
+
+    def alerts_by_user(self, run):
+        return {
+            batch.user_id: [(item['product_id'], item['kind']) for item in batch.items]
+            for batch in FavoriteAlertBatch.objects.filter(run=run)
+        }
+
+    def test_first_run_only_seeds_snapshots(self):
+        run = self.run_detector()
+
+        self.assertIsNone(run.since)
+        self.assertEqual((run.products_scanned, run.products_changed), (3, 3))
+        self.assertEqual((run.price_drops, run.back_in_stock, run.batches_created), (0, 0, 0))
+        self.assertEqual(ProductAlertSnapshot.objects.count(), 3)
+        self.assertFalse(FavoriteAlertBatch.objects.exists())
+
+    def test_price_drop_and_restock_give_one_batch_per_user(self):
+        self.run_detector()
+        self.change(self.dropping, sale_price=Decimal('15.00'))
+        self.change(self.restocked, stock_quantity=5)
+
+        run = self.run_detector()
+
+        self.assertEqual(self.alerts_by_user(run), {
+            self.alice.pk: [
+                (self.dropping.product_id, PRICE_DROP),
+                (self.restocked.product_id, BACK_IN_STOCK),
+            ],
+            self.bob.pk: [(self.dropping.product_id, PRICE_DROP)],
+        })
+        drop = FavoriteAlertBatch.objects.get(run=run, user=self.bob).items[0]
+        self.assertEqual((drop['old_price'], drop['new_price']), ('20.00', '15.00'))
+        self.assertEqual((run.price_drops, run.back_in_stock), (1, 1))
+        self.assertEqual((run.batches_created, run.alerts_created), (2, 3))
+
+    def test_unchanged_or_pricier_products_raise_no_alert(self):
+        self.run_detector()
+        self.change(self.steady, base_price=Decimal('25.00'))
+
+        run = self.run_detector()
+
+        self.assertEqual(run.products_changed, 1)
+        self.assertEqual((run.price_drops, run.back_in_stock, run.batches_created), (0, 0, 0))
+        self.assertFalse(FavoriteAlertBatch.objects.exists())
+        self.assertEqual(ProductAlertSnapshot.objects.get(product_id=self.steady.product_id).price, Decimal('25.00'))
+
+    def test_incremental_run_scans_only_changes_since_the_last_run(self):
+        first = self.run_detector()
+        ProductInventory.objects.update(updated_at=timezone.now() - timedelta(hours=1))
+        self.change(self.dropping, sale_price=Decimal('18.00'))
+
+        run = self.run_detector()
+
+        self.assertEqual(run.since, first.started_at)
+        self.assertEqual((run.products_scanned, run.products_changed, run.price_drops), (1, 1, 1))
+
+        full = self.run_detector(full=True)
+        self.assertIsNone(full.since)
+        self.assertEqual((full.products_scanned, full.products_changed), (3, 0))
+
+    def test_counters_add_up_across_batches(self):
+        self.detector.batch_size = 1
+        self.run_detector()
+        self.change(self.dropping, sale_price=Decimal('15.00'))
+        self.change(self.restocked, stock_quantity=5)
+
+        run = self.run_detector(full=True)
 
-# Create your tests here.
+        self.assertEqual((run.products_scanned, run.products_changed), (3, 2))
+        self.assertEqual((run.batches_created, run.alerts_created), (3, 3))
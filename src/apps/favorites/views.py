@@ -1,16 +1,19 @@
 from decimal import Decimal
+from urllib.parse import parse_qs, urlparse
 
 from django.contrib import messages
 from django.contrib.auth import get_user_model
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.core.paginator import Paginator, PageNotAnInteger, EmptyPage
-from django.db.models import Prefetch, Count, Sum, F
-from django.db.models.functions import Coalesce
+from django.http import Http404
 from django.shortcuts import get_object_or_404, redirect
 from django.views.generic import ListView, DetailView
+from rest_framework.exceptions import NotFound
+from rest_framework.request import Request
+
+from apps.api.rest.paginators import FavoriteItemsCursorPagination
 
 from .mixins import FavoriteItemsQuerysetMixin
-from .models import FavoriteCollection, FavoriteItem
+from .models import FavoriteCollection
 
 User = get_user_model()
 
@@ -20,34 +23,8 @@ class FavoriteCollectionListView(LoginRequiredMixin, ListView):
     template_name = 'pages/favorites/collection/list.html'
     context_object_name = 'collections'
     paginate_by = 12
-    favorite_items_per_card_limit = 10
 
     def get_queryset(self):
-        slider_items_qs = (
-            FavoriteItem.objects
-            .filter(product__image_url__isnull=False)
-            .select_related(
-                'product',
-                'product__inventory__currency'
-            )
-            .only(
-                'id',
-                'collection_id',
-                'position',
-
-                'product__image_url',
-                'product__product_display_name',
-
-                'product__inventory__base_price',
-                'product__inventory__sale_price',
-
-                'product__inventory__currency__symbol',
-                'product__inventory__currency__code',
-                'product__inventory__currency__decimals',
-            )
-            .order_by('position')
-        )[:self.favorite_items_per_card_limit]
-
         return (
             FavoriteCollection.objects
             .filter(user=self.request.user)
@@ -58,17 +35,11 @@ class FavoriteCollectionListView(LoginRequiredMixin, ListView):
                 'slug',
                 'is_default',
                 'updated_at',
+                'items_count',
+                'cover_items',
 
                 'user__username'
             )
-            .annotate(total_items_count=Count('favorite_items'))
-            .prefetch_related(
-                Prefetch(
-                    'favorite_items',
-                    queryset=slider_items_qs,
-                    to_attr='slider_items'
-                )
-            )
             .order_by('-is_default', '-updated_at')
         )
 
@@ -109,7 +80,7 @@ class FavoriteCollectionDetailView(FavoriteItemsQuerysetMixin, DetailView):
 
     def get_object(self, queryset=None):
         queryset = FavoriteCollection.objects.select_related('user').only(
-            'id', 'name', 'description', 'is_public', 'slug', 'user__username'
+            'id', 'name', 'description', 'is_public', 'slug', 'items_count', 'total_values', 'user__username'
         )
 
         return get_object_or_404(
@@ -122,44 +93,36 @@ class FavoriteCollectionDetailView(FavoriteItemsQuerysetMixin, DetailView):
         context = super().get_context_data(**kwargs)
         collection = self.object
 
-        favorite_items_qs = self.get_items_queryset(collection)
+        favorite_items, next_cursor = self.get_cursor_page(self.get_items_queryset(collection))
 
-        page_obj = self.get_paginated_items(favorite_items_qs)
+        context['favorite_items'] = favorite_items
+        context['next_cursor'] = next_cursor
+        context['items_count'] = collection.items_count
 
-        context['favorite_items'] = page_obj
-        context['items_count'] = page_obj.paginator.count
-
-        context['favorites_total_value'] = self.get_favorites_total_value(favorite_items_qs)
-        context['favorites_currency_symbol'] = self.get_favorites_currency_symbol(favorite_items_qs)
+        primary_total = collection.primary_total
+        context['favorites_total_value'] = Decimal(primary_total['amount']) if primary_total else Decimal('0')
+        context['favorites_currency_symbol'] = primary_total['symbol'] if primary_total else ''
 
         return context
 
-    def get_paginated_items(self, queryset):
-        paginator = Paginator(queryset, self.paginate_by)
-        page_number = self.request.GET.get('page')
+    def get_cursor_page(self, queryset):
+        """
+        Render one keyset page with the API's cursor pagination.
+
+        The returned cursor is accepted as-is by the items API, so "load more"
+        continues exactly where the page stopped, at constant cost per page.
+        """
+        paginator = FavoriteItemsCursorPagination()
+        paginator.page_size = self.paginate_by
 
         try:
-            page_obj = paginator.page(page_number)
-        except PageNotAnInteger:
-            page_obj = paginator.page(1)
-        except EmptyPage:
-            page_obj = paginator.page(paginator.num_pages)
-
-        return page_obj
-
-    def get_favorites_total_value(self, queryset):
-        agg = queryset.aggregate(
-            total_value=Sum(
-                Coalesce(
-                    F('product__inventory__sale_price'),
-                    F('product__inventory__base_price')
-                )
-            )
-        )
-        return agg['total_value'] or Decimal('0')
+            page = paginator.paginate_queryset(queryset, Request(self.request))
+        except NotFound:
+            raise Http404("Invalid cursor")
+
+        next_link = paginator.get_next_link()
+        if not next_link:
+            return page, None
 
-    def get_favorites_currency_symbol(self, queryset):
-        symbol = queryset.values_list(
-            'product__inventory__currency__symbol', flat=True
-        ).first()
-        return symbol or ''
+        next_cursor = parse_qs(urlparse(next_link).query).get(paginator.cursor_query_param, [None])[0]
+        return page, next_cursor
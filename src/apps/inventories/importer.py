@@ -0,0 +1,311 @@
+import csv
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable, Iterator, List, Tuple
+
+from django.db import connection, transaction
+
+from apps.catalog.models import Product
+from apps.outbox.publisher import INVENTORY_CHANGED, publish
+
+from .models import ProductInventory
+
+FEED_COLUMNS = ('product_id', 'base_price', 'sale_price', 'stock_quantity', 'is_active')
+COLUMN_ALIASES = {'stock': 'stock_quantity'}
+FEED_TEMP_TABLE = 'tmp_inventory_feed'
+FEED_DIFF_TEMP_TABLE = 'tmp_inventory_feed_diff'
+
+
+class InventoryFeedError(Exception):
+    pass
+
+
+@dataclass
+class InventoryFeedResult:
+    feed_rows: int = 0
+    distinct_products: int = 0
+    updated: int = 0
+    inserted: int = 0
+    unchanged: int = 0
+    price_changed: int = 0
+    stock_changed: int = 0
+    status_changed: int = 0
+    invalid: int = 0
+    below_reserved: int = 0
+    unknown_products: int = 0
+    samples: List[tuple] = field(default_factory=list)
+
+    @property
+    def prices_touched(self) -> bool:
+        return bool(self.price_changed or self.inserted)
+
+
+def iter_feed_rows(path: Path, batch_size: int = 50000) -> Iterator[Tuple]:
+    """Yield feed rows in FEED_COLUMNS order from a CSV or Parquet file without loading it whole."""
+    suffix = path.suffix.lower()
+    if suffix == '.csv':
+        return _iter_csv_rows(path)
+    if suffix in ('.parquet', '.pq'):
+        return _iter_parquet_rows(path, batch_size)
+    raise InventoryFeedError(f"Unsupported feed format '{suffix}', expected .csv or .parquet")
+
+
+def _normalize_header(columns: Iterable[str]) -> List[str]:
+    normalized = [COLUMN_ALIASES.get(c.strip().lower(), c.strip().lower()) for c in columns]
+    missing = [c for c in FEED_COLUMNS if c not in normalized and c != 'is_active']
+    if missing:
+        raise InventoryFeedError(f"Feed is missing required columns: {', '.join(missing)}")
+    return normalized
+
+
+def _iter_csv_rows(path: Path) -> Iterator[Tuple]:
+    with path.open(newline='', encoding='utf-8') as handle:
+        reader = csv.reader(handle)
+        try:
+            header = _normalize_header(next(reader))
+        except StopIteration:
+            return
+
+        positions = [header.index(c) if c in header else None for c in FEED_COLUMNS]
+        for row in reader:
+            if not row:
+                continue
+            yield tuple(
+                (row[pos].strip() or None) if pos is not None and pos < len(row) else None
+                for pos in positions
+            )
+
+
+def _iter_parquet_rows(path: Path, batch_size: int) -> Iterator[Tuple]:
+    try:
+        import pyarrow.parquet as pq
+    except ImportError as exc:
+        raise InventoryFeedError("Reading Parquet feeds requires pyarrow; install the project dependencies") from exc
+
+    parquet_file = pq.ParquetFile(path)
+    header = _normalize_header(parquet_file.schema_arrow.names)
+    source_columns = {name: original for name, original in zip(header, parquet_file.schema_arrow.names)}
+    columns = [source_columns[c] for c in FEED_COLUMNS if c in source_columns]
+
+    for batch in parquet_file.iter_batches(batch_size=batch_size, columns=columns):
+        data = batch.to_pydict()
+        values = [data[source_columns[c]] if c in source_columns else None for c in FEED_COLUMNS]
+        for i in range(batch.num_rows):
+            yield tuple(column[i] if column is not None else None for column in values)
+
+
+class InventoryFeedImporter:
+    """
+    Apply a price/stock feed to `ProductInventory` in a handful of statements.
+
+    Feed rows are streamed with COPY into a temporary table, de-duplicated
+    (last row per product wins) and applied with one UPDATE ... FROM that only
+    touches rows whose values differ, plus one INSERT for products that have no
+    inventory yet. Rows whose stock would drop below the reserved quantity, or
+    whose prices are invalid, are skipped and counted.
+    """
+
+    def __init__(self, currency: str = 'USD', insert_missing: bool = True, sample_size: int = 0) -> None:
+        self.currency = currency
+        self.insert_missing = insert_missing
+        self.sample_size = sample_size
+
+    def apply(self, rows: Iterable[Tuple], dry_run: bool = False) -> InventoryFeedResult:
+        with transaction.atomic(), connection.cursor() as cursor:
+            feed_rows = self._copy_feed(cursor, rows)
+            result = self._apply_feed(cursor)
+            result.feed_rows = feed_rows
+
+            if self.sample_size:
+                result.samples = self._fetch_samples(cursor)
+
+            if dry_run:
+                transaction.set_rollback(True)
+
+        return result
+
+    @staticmethod
+    def _copy_feed(cursor, rows: Iterable[Tuple]) -> int:
+        cursor.execute(
+            f"""
+            CREATE TEMP TABLE {FEED_TEMP_TABLE} (
+                seq bigserial,
+                product_id bigint,
+                base_price numeric(10, 2),
+                sale_price numeric(10, 2),
+                stock_quantity integer,
+                is_active boolean
+            ) ON COMMIT DROP
+            """
+        )
+
+        count = 0
+        columns = ", ".join(FEED_COLUMNS)
+        with cursor.copy(f"COPY {FEED_TEMP_TABLE} ({columns}) FROM STDIN") as copy:
+            for row in rows:
+                copy.write_row(row)
+                count += 1
+
+        cursor.execute(f"ANALYZE {FEED_TEMP_TABLE}")
+        cursor.execute(
+            f"""
+            CREATE TEMP TABLE {FEED_DIFF_TEMP_TABLE} (
+                product_id bigint,
+                old_base_price numeric(10, 2),
+                new_base_price numeric(10, 2),
+                old_sale_price numeric(10, 2),
+                new_sale_price numeric(10, 2),
+                old_stock_quantity integer,
+                new_stock_quantity integer,
+                old_is_active boolean,
+                new_is_active boolean
+            ) ON COMMIT DROP
+            """
+        )
+        return count
+
+    def _apply_feed(self, cursor) -> InventoryFeedResult:
+        inventory_table = ProductInventory._meta.db_table
+        products_table = Product._meta.db_table
+
+        insert_sql = f"""
+                inserted AS (
+                    INSERT INTO {inventory_table}
+                        (product_id, base_price, sale_price, currency_id, stock_quantity,
+                         reserved_quantity, is_active, created_at, updated_at)
+                    SELECT f.product_id, f.base_price, f.sale_price, %(currency)s, f.stock_quantity,
+                           0, COALESCE(f.is_active, TRUE), now(), now()
+                    FROM valid f
+                    JOIN {products_table} p ON p.id = f.product_id
+                    WHERE NOT EXISTS (SELECT 1 FROM current c WHERE c.product_id = f.product_id)
+                    ORDER BY f.product_id
+                    ON CONFLICT (product_id) DO NOTHING
+                    RETURNING product_id
+                ),""" if self.insert_missing else """
+                inserted AS (
+                    SELECT NULL::bigint AS product_id WHERE FALSE
+                ),"""
+
+        cursor.execute(
+            f"""
+            WITH feed AS (
+                SELECT DISTINCT ON (product_id) *
+                FROM {FEED_TEMP_TABLE}
+                WHERE product_id IS NOT NULL
+                ORDER BY product_id, seq DESC
+            ),
+            valid AS (
+                SELECT *
+                FROM feed
+                WHERE base_price >= 0
+                  AND stock_quantity >= 0
+                  AND (sale_price IS NULL OR (sale_price >= 0 AND sale_price <= base_price))
+            ),
+            current AS (
+                SELECT inv.product_id, inv.base_price, inv.sale_price, inv.stock_quantity,
+                       inv.reserved_quantity, inv.is_active
+                FROM {inventory_table} inv
+                JOIN feed f ON f.product_id = inv.product_id
+            ),
+            changed AS (
+                SELECT f.product_id, f.base_price, f.sale_price, f.stock_quantity,
+                       COALESCE(f.is_active, c.is_active) AS is_active
+                FROM valid f
+                JOIN current c ON c.product_id = f.product_id
+                WHERE f.stock_quantity >= c.reserved_quantity
+                  AND (c.base_price, c.sale_price, c.stock_quantity, c.is_active)
+                      IS DISTINCT FROM
+                      (f.base_price, f.sale_price, f.stock_quantity, COALESCE(f.is_active, c.is_active))
+            ),
+            locked AS (
+                SELECT inv.id
+                FROM {inventory_table} inv
+                JOIN changed ch ON ch.product_id = inv.product_id
+                ORDER BY inv.product_id
+                FOR UPDATE OF inv
+            ),
+            updated AS (
+                UPDATE {inventory_table} inv
+                SET base_price = ch.base_price,
+                    sale_price = ch.sale_price,
+                    stock_quantity = ch.stock_quantity,
+                    is_active = ch.is_active,
+                    updated_at = now()
+                FROM changed ch, locked l
+                WHERE l.id = inv.id
+                  AND inv.product_id = ch.product_id
+                  AND ch.stock_quantity >= inv.reserved_quantity
+                RETURNING inv.product_id
+            ),
+            {insert_sql}
+            sampled AS (
+                INSERT INTO {FEED_DIFF_TEMP_TABLE}
+                SELECT c.product_id,
+                       c.base_price, ch.base_price,
+                       c.sale_price, ch.sale_price,
+                       c.stock_quantity, ch.stock_quantity,
+                       c.is_active, ch.is_active
+                FROM updated u
+                JOIN changed ch ON ch.product_id = u.product_id
+                JOIN current c ON c.product_id = u.product_id
+                ORDER BY u.product_id
+                LIMIT %(sample_size)s
+                RETURNING 1
+            ),
+            diff AS (
+                SELECT
+                    count(*) FILTER (
+                        WHERE (c.base_price, c.sale_price) IS DISTINCT FROM (ch.base_price, ch.sale_price)
+                    ) AS price_changed,
+                    count(*) FILTER (WHERE c.stock_quantity <> ch.stock_quantity) AS stock_changed,
+                    count(*) FILTER (WHERE c.is_active <> ch.is_active) AS status_changed
+                FROM updated u
+                JOIN changed ch ON ch.product_id = u.product_id
+                JOIN current c ON c.product_id = u.product_id
+            )
+            SELECT
+                (SELECT count(*) FROM feed),
+                (SELECT count(*) FROM updated),
+                (SELECT count(*) FROM inserted),
+                (SELECT count(*) FROM valid v JOIN current c ON c.product_id = v.product_id
+                 WHERE v.stock_quantity >= c.reserved_quantity) - (SELECT count(*) FROM changed),
+                d.price_changed,
+                d.stock_changed,
+                d.status_changed,
+                (SELECT count(*) FROM feed) - (SELECT count(*) FROM valid),
+                (SELECT count(*) FROM valid v JOIN current c ON c.product_id = v.product_id
+                 WHERE v.stock_quantity < c.reserved_quantity),
+                (SELECT count(*) FROM feed f
+                 WHERE NOT EXISTS (SELECT 1 FROM {products_table} p WHERE p.id = f.product_id)),
+                ARRAY(SELECT product_id FROM updated UNION ALL SELECT product_id FROM inserted)
+            FROM diff d
+            """,
+            {'currency': self.currency, 'sample_size': self.sample_size},
+        )
+        row = cursor.fetchone()
+
+        changed_ids = row[10]
+        if changed_ids:
+            publish(INVENTORY_CHANGED, changed_ids, {
+                'prices': bool(row[2] or row[4]),
+                'stock': bool(row[2] or row[5] or row[6]),
+                'source': 'import_inventory',
+            })
+
+        return InventoryFeedResult(
+            distinct_products=row[0],
+            updated=row[1],
+            inserted=row[2],
+            unchanged=row[3],
+            price_changed=row[4],
+            stock_changed=row[5],
+            status_changed=row[6],
+            invalid=row[7],
+            below_reserved=row[8],
+            unknown_products=row[9],
+        )
+
+    @staticmethod
+    def _fetch_samples(cursor) -> List[tuple]:
+        cursor.execute(f"SELECT * FROM {FEED_DIFF_TEMP_TABLE} ORDER BY product_id")
+        return cursor.fetchall()
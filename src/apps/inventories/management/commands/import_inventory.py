@@ -0,0 +1,142 @@
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError, OperationalError
+
+from apps.catalog.pgviews import PriceRangesMV
+from apps.inventories.importer import InventoryFeedError, InventoryFeedImporter, iter_feed_rows
+from apps.inventories.models import Currency
+
+
+class Command(BaseCommand):
+    help = (
+        "Apply a price/stock feed (CSV or Parquet with product_id, base_price, sale_price, "
+        "stock, is_active) to product inventory using COPY and set-based updates."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "path",
+            type=str,
+            help="Path to the .csv or .parquet feed",
+        )
+        parser.add_argument(
+            "--currency",
+            dest="currency",
+            type=str,
+            default="USD",
+            help="Currency for inventory rows created from the feed (default: USD)",
+        )
+        parser.add_argument(
+            "--no-insert",
+            action="store_true",
+            dest="no_insert",
+            default=False,
+            help="Only update existing inventory; ignore products without an inventory row.",
+        )
+        parser.add_argument(
+            "--show-diff",
+            dest="show_diff",
+            type=int,
+            default=10,
+            help="Number of changed rows to print with old and new values (default: 10)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            dest="batch_size",
+            type=int,
+            default=50000,
+            help="Parquet record batch size while streaming (default: 50000)",
+        )
+        parser.add_argument(
+            "--skip-refresh",
+            action="store_true",
+            dest="skip_refresh",
+            default=False,
+            help="Do not refresh the price ranges materialized view afterwards.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            dest="dry_run",
+            default=False,
+            help="Compute and report the diff, then roll everything back.",
+        )
+
+    def handle(self, *args, **options):
+        path = Path(options["path"])
+        currency = options["currency"]
+        show_diff = options["show_diff"]
+        dry_run = options["dry_run"]
+
+        if not path.is_file():
+            raise CommandError(f"Feed file not found: {path}")
+        if show_diff < 0:
+            raise CommandError("show-diff must not be negative")
+        if not options["no_insert"] and not Currency.objects.filter(code=currency).exists():
+            raise CommandError(f"Currency {currency} not found. Please run: python manage.py seed_currencies")
+
+        importer = InventoryFeedImporter(
+            currency=currency,
+            insert_missing=not options["no_insert"],
+            sample_size=show_diff,
+        )
+
+        self.stdout.write(self.style.NOTICE(f"Applying inventory feed {path}{' (dry run)' if dry_run else ''}..."))
+
+        start_time = time.perf_counter()
+        try:
+            result = importer.apply(iter_feed_rows(path, batch_size=options["batch_size"]), dry_run=dry_run)
+        except InventoryFeedError as e:
+            raise CommandError(str(e))
+        except DatabaseError as e:
+            raise CommandError(f"Failed to apply inventory feed: {e}")
+        apply_time = time.perf_counter() - start_time
+
+        rate = result.feed_rows / apply_time if apply_time > 0 else 0.0
+        self.stdout.write(
+            f"- Feed: {result.feed_rows:,} rows, {result.distinct_products:,} distinct products "
+            f"({rate:,.0f} rows/s)"
+        )
+        self.stdout.write(
+            f"- Applied: {result.updated:,} updated, {result.inserted:,} inserted, {result.unchanged:,} unchanged"
+        )
+        self.stdout.write(
+            f"- Changes: {result.price_changed:,} price, {result.stock_changed:,} stock, "
+            f"{result.status_changed:,} active flag"
+        )
+
+        skipped = result.invalid + result.below_reserved + result.unknown_products
+        if skipped:
+            self.stdout.write(
+                self.style.WARNING(
+                    f"- Skipped: {result.invalid:,} invalid rows, {result.below_reserved:,} below reserved stock, "
+                    f"{result.unknown_products:,} unknown products"
+                )
+            )
+
+        for product_id, old_base, new_base, old_sale, new_sale, old_stock, new_stock, old_active, new_active in result.samples:
+            self.stdout.write(
+                f"  * {product_id}: base {old_base} -> {new_base}, sale {old_sale} -> {new_sale}, "
+                f"stock {old_stock} -> {new_stock}, active {old_active} -> {new_active}"
+            )
+
+        if not dry_run and result.prices_touched and not options["skip_refresh"]:
+            self._refresh_price_ranges()
+
+        total_time = time.perf_counter() - start_time
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Inventory feed {'checked' if dry_run else 'applied'} in {total_time:.3f}s"
+            )
+        )
+
+    def _refresh_price_ranges(self):
+        view_name = PriceRangesMV._meta.db_table
+        self.stdout.write(f"- Refreshing {view_name}...", ending="")
+        try:
+            PriceRangesMV.refresh(concurrently=True)
+            self.stdout.write(self.style.SUCCESS(" Done."))
+        except (OperationalError, DatabaseError) as e:
+            self.stderr.write(self.style.ERROR(f"\nFailed to refresh {view_name}: {e}"))
@@ -0,0 +1,129 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.inventories.reservations import ExpiredReservationsSweeper
+
+
+class Command(BaseCommand):
+    help = "Release expired stock reservations in batches and reconcile reserved quantities."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            dest="batch_size",
+            type=int,
+            default=1000,
+            help="Number of reservations (or inventory rows when reconciling) per batch/transaction (default: 1000)",
+        )
+        parser.add_argument(
+            "--max-batches",
+            dest="max_batches",
+            type=int,
+            default=None,
+            help="Stop after this many batches (default: run until nothing is left)",
+        )
+        parser.add_argument(
+            "--sleep",
+            dest="sleep",
+            type=float,
+            default=0.0,
+            help="Seconds to pause between batches to leave room for live traffic (default: 0)",
+        )
+        parser.add_argument(
+            "--lock-timeout-ms",
+            dest="lock_timeout_ms",
+            type=int,
+            default=1000,
+            help="lock_timeout applied to each batch in milliseconds (default: 1000)",
+        )
+        parser.add_argument(
+            "--reconcile",
+            action="store_true",
+            dest="reconcile",
+            default=False,
+            help="After sweeping, reset reserved_quantity to the sum of live reservations where they drifted.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            dest="dry_run",
+            default=False,
+            help="Only report how many reservations have expired.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        max_batches = options["max_batches"]
+        sleep = options["sleep"]
+        dry_run = options["dry_run"]
+
+        if batch_size <= 0:
+            raise CommandError("batch-size must be positive")
+        if max_batches is not None and max_batches <= 0:
+            raise CommandError("max-batches must be positive")
+
+        sweeper = ExpiredReservationsSweeper(batch_size=batch_size, lock_timeout_ms=options["lock_timeout_ms"])
+
+        if dry_run:
+            expired = sweeper.count_expired()
+            self.stdout.write(self.style.NOTICE(f"{expired:,} expired reservations would be released."))
+            return
+
+        self.stdout.write(self.style.NOTICE(f"Releasing expired reservations in batches of {batch_size}..."))
+
+        total_start = time.perf_counter()
+        batches = reservations = units = 0
+
+        for batch in sweeper.iter_batches(max_batches=max_batches):
+            batches += 1
+            reservations += batch.reservations_released
+            units += batch.units_released
+
+            self.stdout.write(
+                f"- Batch {batches}: {batch.reservations_released} reservations, {batch.units_released} units "
+                f"over {batch.products_updated} products in {batch.elapsed:.3f}s"
+            )
+
+            if sleep:
+                time.sleep(sleep)
+
+        total_time = time.perf_counter() - total_start
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Released {reservations:,} expired reservations ({units:,} units) "
+                f"in {batches} batches, {total_time:.3f}s"
+            )
+        )
+
+        if options["reconcile"]:
+            self._reconcile(sweeper, max_batches, sleep)
+
+    def _reconcile(self, sweeper, max_batches, sleep):
+        self.stdout.write(self.style.NOTICE("Reconciling reserved quantities with reservation rows..."))
+
+        total_start = time.perf_counter()
+        checked = fixed = drift = 0
+
+        for batch in sweeper.iter_reconcile_batches(max_batches=max_batches):
+            checked += batch.products_checked
+            fixed += batch.products_fixed
+            drift += batch.drift_units
+
+            if batch.products_fixed:
+                self.stdout.write(
+                    f"- Fixed {batch.products_fixed} of {batch.products_checked} products "
+                    f"({batch.drift_units} units of drift) in {batch.elapsed:.3f}s"
+                )
+
+            if sleep:
+                time.sleep(sleep)
+
+        total_time = time.perf_counter() - total_start
+        style = self.style.WARNING if fixed else self.style.SUCCESS
+        self.stdout.write(
+            style(
+                f"Reconcile completed: {checked:,} products checked, {fixed:,} fixed "
+                f"({drift:,} units of drift) in {total_time:.3f}s"
+            )
+        )
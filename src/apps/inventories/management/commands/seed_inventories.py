@@ -28,6 +28,13 @@ class Command(BaseCommand):
             action='store_true',
             help='Use transaction per batch (default: single transaction)',
         )
+        parser.add_argument(
+            '--seed',
+            dest='seed',
+            type=int,
+            default=None,
+            help='Seed for the random generator, to reproduce a run (default: random)',
+        )
 
     def handle(self, *args, **options):
         batch_size = options['batch_size']
@@ -78,6 +85,7 @@ class Command(BaseCommand):
         generator = ProductInventoryGenerator(
             batch_size=batch_size,
             use_transaction_per_batch=use_transaction_per_batch,
+            seed=options['seed'],
         )
 
         try:
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.5 on 2026-10-19 12:00
+
+import django.core.validators
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+BACKFILL_RESERVATIONS_SQL = """
+INSERT INTO inventories_stockreservation (product_id, quantity, order_id, cart_id, expires_at, created_at)
+SELECT product_id, reserved_quantity, NULL, NULL, NULL, now()
+FROM inventories_productinventory
+WHERE reserved_quantity > 0
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cart', '0002_cart_products'),
+        ('catalog', '0018_productviewstats'),
+        ('inventories', '0002_productinventory_idx_inventory_availability_and_more'),
+        ('orders', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StockReservation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('quantity', models.PositiveIntegerField(help_text='Units held by this reservation', validators=[django.core.validators.MinValueValidator(1)])),
+                ('expires_at', models.DateTimeField(blank=True, help_text='When the hold lapses; null holds until released explicitly', null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('cart', models.ForeignKey(blank=True, db_constraint=False, help_text='Cart holding the stock, if any. Not constrained so cart cleanup never blocks on it.', null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='stock_reservations', to='cart.cart')),
+                ('order', models.ForeignKey(blank=True, help_text='Order holding the stock, if any', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='stock_reservations', to='orders.order')),
+                ('product', models.ForeignKey(help_text='Reserved product', on_delete=django.db.models.deletion.CASCADE, related_name='stock_reservations', to='catalog.product')),
+            ],
+            options={
+                'verbose_name': 'Stock Reservation',
+                'verbose_name_plural': 'Stock Reservations',
+                'ordering': ['expires_at'],
+                'indexes': [models.Index(condition=models.Q(('expires_at__isnull', False)), fields=['expires_at', 'id'], name='idx_reservation_expires'), models.Index(fields=['product', 'expires_at'], name='idx_reservation_product_exp')],
+                'constraints': [models.CheckConstraint(condition=models.Q(('quantity__gt', 0)), name='reservation_quantity_positive')],
+            },
+        ),
+        migrations.RunSQL(BACKFILL_RESERVATIONS_SQL, reverse_sql=migrations.RunSQL.noop),
+    ]
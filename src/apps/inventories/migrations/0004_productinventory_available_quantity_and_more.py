@@ -0,0 +1,40 @@
+# Generated by Django 5.2.5 on 2026-10-19 14:00
+
+import django.db.models.expressions
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0018_productviewstats'),
+        ('inventories', '0003_stockreservation'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='productinventory',
+            name='idx_inventory_availability',
+        ),
+        migrations.AddField(
+            model_name='productinventory',
+            name='available_quantity',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.expressions.CombinedExpression(models.F('stock_quantity'), '-', models.F('reserved_quantity')), help_text='Stored stock - reserved, so availability filters can use partial indexes', output_field=models.IntegerField()),
+        ),
+        migrations.AddIndex(
+            model_name='productinventory',
+            index=models.Index(condition=models.Q(('available_quantity__gt', 0), ('is_active', True)), fields=['product'], name='idx_inventory_in_stock'),
+        ),
+        migrations.AddIndex(
+            model_name='productinventory',
+            index=models.Index(condition=models.Q(('available_quantity__lte', 0), ('is_active', True)), fields=['product'], name='idx_inventory_out_of_stock'),
+        ),
+        migrations.AddIndex(
+            model_name='productinventory',
+            index=models.Index(condition=models.Q(('is_active', False)), fields=['product'], name='idx_inventory_inactive'),
+        ),
+        migrations.AddIndex(
+            model_name='productinventory',
+            index=models.Index(condition=models.Q(('sale_price__isnull', False), ('sale_price__lt', models.F('base_price'))), fields=['product'], name='idx_inventory_on_sale'),
+        ),
+    ]
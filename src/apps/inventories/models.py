@@ -1,8 +1,20 @@
 from decimal import Decimal
 
-from django.db import models
+from django.conf import settings
+from django.db import connection, models, transaction
 from django.core.validators import MinValueValidator
 from django.core.exceptions import ValidationError
+from django.utils import timezone
+
+from apps.outbox.publisher import INVENTORY_CHANGED, publish
+
+
+class InsufficientStockError(ValueError):
+    """Raised when a bulk stock operation cannot be applied to every product"""
+
+    def __init__(self, product_ids):
+        self.product_ids = list(product_ids)
+        super().__init__(f"Not enough stock for products: {self.product_ids}")
 
 
 class Currency(models.Model):
@@ -99,6 +111,12 @@ class ProductInventory(models.Model):
         default=0,
         help_text="Reserved/allocated quantity"
     )
+    available_quantity = models.GeneratedField(
+        expression=models.F('stock_quantity') - models.F('reserved_quantity'),
+        output_field=models.IntegerField(),
+        db_persist=True,
+        help_text="Stored stock - reserved, so availability filters can use partial indexes"
+    )
 
     is_active = models.BooleanField(
         default=True,
@@ -117,8 +135,24 @@ class ProductInventory(models.Model):
             models.Index(fields=['stock_quantity'], name='idx_inventory_stock'),
             models.Index(fields=['-updated_at'], name='idx_inventory_updated'),
             models.Index(
-                fields=['is_active', 'stock_quantity', 'reserved_quantity'],
-                name='idx_inventory_availability'
+                fields=['product'],
+                name='idx_inventory_in_stock',
+                condition=models.Q(is_active=True, available_quantity__gt=0)
+            ),
+            models.Index(
+                fields=['product'],
+                name='idx_inventory_out_of_stock',
+                condition=models.Q(is_active=True, available_quantity__lte=0)
+            ),
+            models.Index(
+                fields=['product'],
+                name='idx_inventory_inactive',
+                condition=models.Q(is_active=False)
+            ),
+            models.Index(
+                fields=['product'],
+                name='idx_inventory_on_sale',
+                condition=models.Q(sale_price__isnull=False, sale_price__lt=models.F('base_price'))
             ),
             models.Index(
                 fields=['sale_price'],
@@ -151,11 +185,6 @@ class ProductInventory(models.Model):
     def __str__(self):
         return f"Inventory for {self.product.product_display_name}"
 
-    @property
-    def available_quantity(self):
-        """Calculate available quantity (stock - reserved)"""
-        return self.stock_quantity - self.reserved_quantity
-
     @property
     def is_in_stock(self):
         """Check if product is in stock"""
@@ -192,46 +221,362 @@ class ProductInventory(models.Model):
         """Format current effective price with currency"""
         return self.currency.format_amount(self.current_price)
 
-    def reserve_stock(self, quantity):
-        """Reserve stock quantity"""
-        if quantity <= 0:
-            raise ValueError("Quantity must be positive")
-
-        if self.reserved_quantity + quantity > self.stock_quantity:
-            raise ValueError("Not enough stock to reserve")
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        changed = set(update_fields) if update_fields is not None else None
 
-        self.reserved_quantity += quantity
-        self.save(update_fields=['reserved_quantity', 'updated_at'])
-
-    def release_stock(self, quantity):
-        """Release reserved stock"""
-        if quantity <= 0:
-            raise ValueError("Quantity must be positive")
-
-        if quantity > self.reserved_quantity:
-            raise ValueError("Cannot release more than reserved")
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            publish(INVENTORY_CHANGED, [self.product_id], {
+                'prices': changed is None or bool(changed & {'base_price', 'sale_price', 'currency', 'is_active'}),
+                'stock': changed is None or bool(changed & {'stock_quantity', 'reserved_quantity', 'is_active'}),
+            })
 
-        self.reserved_quantity -= quantity
-        self.save(update_fields=['reserved_quantity', 'updated_at'])
+    def reserve_stock(self, quantity, expires_at=None, order=None, cart=None):
+        """Reserve stock quantity, recorded as a StockReservation row (see reserve_many)"""
+        try:
+            ProductInventory.reserve_many(
+                {self.product_id: quantity},
+                expires_at=expires_at,
+                order=order,
+                cart=cart,
+            )
+        except InsufficientStockError:
+            raise ValueError("Not enough stock to reserve") from None
+
+        self.refresh_from_db(fields=['stock_quantity', 'reserved_quantity', 'available_quantity', 'updated_at'])
+
+    def release_stock(self, quantity, order=None, cart=None):
+        """Release stock reserved by `order`, `cart` or neither, soonest-expiring first"""
+        try:
+            ProductInventory.release_many({self.product_id: quantity}, order=order, cart=cart)
+        except InsufficientStockError:
+            raise ValueError("Cannot release more than reserved") from None
+
+        self.refresh_from_db(fields=['stock_quantity', 'reserved_quantity', 'available_quantity', 'updated_at'])
 
     def add_stock(self, quantity):
         """Add stock quantity"""
         if quantity <= 0:
             raise ValueError("Quantity must be positive")
 
-        self.stock_quantity += quantity
-        self.save(update_fields=['stock_quantity', 'updated_at'])
+        self._conditional_update(
+            "stock_quantity = stock_quantity + %(quantity)s",
+            "TRUE",
+            quantity,
+        )
 
     def remove_stock(self, quantity):
         """Remove stock quantity"""
         if quantity <= 0:
             raise ValueError("Quantity must be positive")
 
-        if quantity > self.available_quantity:
+        updated = self._conditional_update(
+            "stock_quantity = stock_quantity - %(quantity)s",
+            "stock_quantity - reserved_quantity >= %(quantity)s",
+            quantity,
+        )
+        if not updated:
             raise ValueError("Not enough available stock")
 
-        self.stock_quantity -= quantity
-        self.save(update_fields=['stock_quantity', 'updated_at'])
+    def _conditional_update(self, set_sql, condition_sql, quantity):
+        """
+        Apply `set_sql` in a single UPDATE guarded by `condition_sql` and refresh
+        the stock counters from RETURNING. Returns False when the guard failed.
+        """
+        table_name = ProductInventory._meta.db_table
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                UPDATE {table_name}
+                SET {set_sql}, updated_at = now()
+                WHERE product_id = %(product_id)s AND {condition_sql}
+                RETURNING stock_quantity, reserved_quantity, available_quantity, updated_at
+                """,
+                {'product_id': self.product_id, 'quantity': quantity},
+            )
+            row = cursor.fetchone()
+
+            if row is not None:
+                publish(INVENTORY_CHANGED, [self.product_id], {'prices': False, 'stock': True})
+
+        if row is None:
+            return False
+
+        self.stock_quantity, self.reserved_quantity, self.available_quantity, self.updated_at = row
+        return True
+
+    @classmethod
+    def reserve_many(cls, quantities, allow_partial=False, expires_at=None, order=None, cart=None):
+        """
+        Reserve stock for many products in one statement.
+
+        `quantities` maps product id to quantity. Rows are locked in product id
+        order so concurrent callers cannot deadlock. Every successful line is
+        recorded as a StockReservation expiring at `expires_at` (default: now +
+        STOCK_RESERVATION_TTL) so `reserved_quantity` stays the sum of live
+        reservations. Holds taken for an `order` never expire by default: they
+        last until the order is paid or cancelled. Unless `allow_partial` is set, nothing is reserved when
+        any product is short and InsufficientStockError lists the short ids.
+        """
+        requested = cls._normalize_quantities(quantities)
+        if not requested:
+            return []
+
+        if expires_at is None and order is None:
+            expires_at = timezone.now() + settings.STOCK_RESERVATION_TTL
+
+        table_name = cls._meta.db_table
+        reservations_table = StockReservation._meta.db_table
+        values_sql, params = cls._values_sql(requested)
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                WITH req(product_id, quantity) AS (
+                    VALUES {values_sql}
+                ),
+                locked AS (
+                    SELECT inv.id
+                    FROM {table_name} inv
+                    JOIN req ON req.product_id = inv.product_id
+                    ORDER BY inv.product_id
+                    FOR UPDATE OF inv
+                ),
+                updated AS (
+                    UPDATE {table_name} inv
+                    SET reserved_quantity = inv.reserved_quantity + req.quantity,
+                        updated_at = now()
+                    FROM req, locked
+                    WHERE locked.id = inv.id
+                      AND req.product_id = inv.product_id
+                      AND inv.stock_quantity - inv.reserved_quantity >= req.quantity
+                    RETURNING inv.product_id
+                ),
+                recorded AS (
+                    INSERT INTO {reservations_table}
+                        (product_id, quantity, order_id, cart_id, expires_at, created_at)
+                    SELECT req.product_id, req.quantity, %s, %s, %s, now()
+                    FROM req
+                    JOIN updated ON updated.product_id = req.product_id
+                    RETURNING 1
+                )
+                SELECT req.product_id
+                FROM req
+                WHERE req.product_id NOT IN (SELECT product_id FROM updated)
+                ORDER BY req.product_id
+                """,
+                params + [getattr(order, 'pk', order), getattr(cart, 'pk', cart), expires_at],
+            )
+            failed = [row[0] for row in cursor.fetchall()]
+
+            if failed and not allow_partial:
+                raise InsufficientStockError(failed)
+
+            cls._publish_stock_change(requested, failed)
+
+        return failed
+
+    @classmethod
+    def release_many(cls, quantities, allow_partial=False, order=None, cart=None):
+        """
+        Release reserved stock for many products (see reserve_many).
+
+        Only reservations owned by `order` and `cart` are consumed (with
+        neither, only unowned ones), so one owner can never release another
+        owner's hold. They are consumed soonest-expiring first: fully used rows
+        are deleted, the last one is shrunk, and the counters are decremented
+        by the same amounts in one statement. A product whose reservations do
+        not cover the requested quantity is left untouched.
+        """
+        requested = cls._normalize_quantities(quantities)
+        if not requested:
+            return []
+
+        table_name = cls._meta.db_table
+        reservations_table = StockReservation._meta.db_table
+        values_sql, params = cls._values_sql(requested)
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            cls._lock_inventory_rows(cursor, [product_id for product_id, _ in requested])
+            cursor.execute(
+                f"""
+                WITH req(product_id, quantity) AS (
+                    VALUES {values_sql}
+                ),
+                ranked AS (
+                    SELECT r.id,
+                           r.product_id,
+                           r.quantity,
+                           req.quantity AS requested,
+                           SUM(r.quantity) OVER (
+                               PARTITION BY r.product_id
+                               ORDER BY r.expires_at NULLS LAST, r.id
+                           ) - r.quantity AS consumed_before,
+                           SUM(r.quantity) OVER (PARTITION BY r.product_id) AS held
+                    FROM {reservations_table} r
+                    JOIN req ON req.product_id = r.product_id
+                    JOIN {table_name} inv
+                      ON inv.product_id = r.product_id
+                     AND inv.reserved_quantity >= req.quantity
+                    WHERE r.order_id IS NOT DISTINCT FROM %s
+                      AND r.cart_id IS NOT DISTINCT FROM %s
+                ),
+                consumed AS (
+                    SELECT id, product_id, quantity,
+                           LEAST(quantity, requested - consumed_before) AS taken
+                    FROM ranked
+                    WHERE held >= requested AND consumed_before < requested
+                ),
+                deleted AS (
+                    DELETE FROM {reservations_table} r
+                    USING consumed c
+                    WHERE r.id = c.id AND c.taken = c.quantity
+                    RETURNING 1
+                ),
+                shrunk AS (
+                    UPDATE {reservations_table} r
+                    SET quantity = r.quantity - c.taken
+                    FROM consumed c
+                    WHERE r.id = c.id AND c.taken < c.quantity
+                    RETURNING 1
+                ),
+                per_product AS (
+                    SELECT product_id, SUM(taken) AS quantity
+                    FROM consumed
+                    GROUP BY product_id
+                ),
+                updated AS (
+                    UPDATE {table_name} inv
+                    SET reserved_quantity = inv.reserved_quantity - p.quantity,
+                        updated_at = now()
+                    FROM per_product p
+                    WHERE inv.product_id = p.product_id
+                    RETURNING inv.product_id
+                )
+                SELECT req.product_id
+                FROM req
+                WHERE req.product_id NOT IN (SELECT product_id FROM updated)
+                ORDER BY req.product_id
+                """,
+                params + [getattr(order, 'pk', order), getattr(cart, 'pk', cart)],
+            )
+            failed = [row[0] for row in cursor.fetchall()]
+
+            if failed and not allow_partial:
+                raise InsufficientStockError(failed)
+
+            cls._publish_stock_change(requested, failed)
+
+        return failed
+
+    @classmethod
+    def release_reservations(cls, order=None, cart=None, sold=False):
+        """
+        Release every reservation owned by `order` or `cart` in one statement.
+
+        The rows are deleted and `reserved_quantity` is decremented by their
+        sums. With `sold`, the units left the warehouse: `stock_quantity` is
+        decremented too, so the available quantity does not change. Returns
+        the number of units released.
+        """
+        if order is None and cart is None:
+            raise ValueError("An order or a cart is required")
+
+        table_name = cls._meta.db_table
+        reservations_table = StockReservation._meta.db_table
+        owner_sql = "order_id IS NOT DISTINCT FROM %s AND cart_id IS NOT DISTINCT FROM %s"
+        owner_params = [getattr(order, 'pk', order), getattr(cart, 'pk', cart)]
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT DISTINCT product_id FROM {reservations_table} WHERE {owner_sql}",
+                owner_params,
+            )
+            product_ids = [row[0] for row in cursor.fetchall()]
+            if not product_ids:
+                return 0
+
+            cls._lock_inventory_rows(cursor, product_ids)
+            cursor.execute(
+                f"""
+                WITH released AS (
+                    DELETE FROM {reservations_table}
+                    WHERE {owner_sql}
+                    RETURNING product_id, quantity
+                ),
+                per_product AS (
+                    SELECT product_id, SUM(quantity) AS quantity
+                    FROM released
+                    GROUP BY product_id
+                ),
+                updated AS (
+                    UPDATE {table_name} inv
+                    SET reserved_quantity = GREATEST(inv.reserved_quantity - p.quantity, 0),
+                        stock_quantity = CASE
+                            WHEN %s THEN GREATEST(inv.stock_quantity - p.quantity, 0)
+                            ELSE inv.stock_quantity
+                        END,
+                        updated_at = now()
+                    FROM per_product p
+                    WHERE inv.product_id = p.product_id
+                    RETURNING inv.product_id
+                )
+                SELECT (SELECT COALESCE(SUM(quantity), 0) FROM released),
+                       (SELECT COALESCE(array_agg(product_id), '{{}}') FROM updated)
+                """,
+                owner_params + [sold],
+            )
+            units, updated_ids = cursor.fetchone()
+
+            if updated_ids:
+                publish(INVENTORY_CHANGED, sorted(updated_ids), {'prices': False, 'stock': True})
+
+        return units
+
+    @staticmethod
+    def _publish_stock_change(requested, failed):
+        failed = set(failed)
+        changed_ids = [product_id for product_id, _ in requested if product_id not in failed]
+        if changed_ids:
+            publish(INVENTORY_CHANGED, changed_ids, {'prices': False, 'stock': True})
+
+    @classmethod
+    def _lock_inventory_rows(cls, cursor, product_ids):
+        """
+        Lock inventory rows in product id order in their own statement, so the
+        next statement's snapshot sees reservations committed by earlier holders.
+        """
+        cursor.execute(
+            f"""
+            SELECT product_id
+            FROM {cls._meta.db_table}
+            WHERE product_id = ANY(%s)
+            ORDER BY product_id
+            FOR UPDATE
+            """,
+            [sorted(product_ids)],
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+    @staticmethod
+    def _values_sql(requested):
+        values_sql = ", ".join(["(%s::bigint, %s::integer)"] * len(requested))
+        params = [value for item in requested for value in item]
+        return values_sql, params
+
+    @staticmethod
+    def _normalize_quantities(quantities):
+        items = quantities.items() if isinstance(quantities, dict) else quantities
+
+        merged = {}
+        for product_id, quantity in items:
+            if quantity <= 0:
+                raise ValueError("Quantity must be positive")
+            merged[product_id] = merged.get(product_id, 0) + quantity
+
+        return sorted(merged.items())
 
     def clean(self):
         """Model validation"""
@@ -245,3 +590,73 @@ class ProductInventory(models.Model):
             raise ValidationError({
                 'sale_price': 'Sale price cannot be higher than base price'
             })
+
+
+class StockReservation(models.Model):
+    """
+    A hold on stock for one product. `ProductInventory.reserved_quantity` is
+    kept equal to the sum of these rows; expired holds are released by the
+    `release_expired_reservations` command. Holds of an order are never swept,
+    they are released when the order is paid or cancelled.
+    """
+    product = models.ForeignKey(
+        'catalog.Product',
+        on_delete=models.CASCADE,
+        related_name='stock_reservations',
+        help_text="Reserved product"
+    )
+    quantity = models.PositiveIntegerField(
+        validators=[MinValueValidator(1)],
+        help_text="Units held by this reservation"
+    )
+    order = models.ForeignKey(
+        'orders.Order',
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='stock_reservations',
+        help_text="Order holding the stock, if any"
+    )
+    cart = models.ForeignKey(
+        'cart.Cart',
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        null=True,
+        blank=True,
+        related_name='stock_reservations',
+        help_text="Cart holding the stock, if any. Not constrained so cart cleanup never blocks on it."
+    )
+    expires_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="When the hold lapses; null holds until released explicitly"
+    )
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Stock Reservation"
+        verbose_name_plural = "Stock Reservations"
+        ordering = ['expires_at']
+        indexes = [
+            models.Index(
+                fields=['expires_at', 'id'],
+                name='idx_reservation_expires',
+                condition=models.Q(expires_at__isnull=False)
+            ),
+            models.Index(fields=['product', 'expires_at'], name='idx_reservation_product_exp'),
+        ]
+        constraints = [
+            models.CheckConstraint(
+                check=models.Q(quantity__gt=0),
+                name='reservation_quantity_positive'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.product_id} x {self.quantity} until {self.expires_at}"
+
+    @property
+    def is_expired(self):
+        """Check if the hold has lapsed"""
+        return self.expires_at is not None and timezone.now() >= self.expires_at
@@ -0,0 +1,200 @@
+import time
+from dataclasses import dataclass
+from typing import Iterator, Optional
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from apps.outbox.publisher import INVENTORY_CHANGED, publish
+
+from .models import ProductInventory, StockReservation
+
+
+@dataclass
+class ReservationsSweepBatch:
+    reservations_released: int
+    units_released: int
+    products_updated: int
+    elapsed: float
+
+
+@dataclass
+class ReservationsReconcileBatch:
+    products_checked: int
+    products_fixed: int
+    drift_units: int
+    elapsed: float
+
+
+class ExpiredReservationsSweeper:
+    """
+    Release expired stock reservations and keep `reserved_quantity` honest.
+
+    Reservations bound to an order are never swept, even with an expiry: a
+    pending order holds its stock until it is paid or cancelled.
+
+    Sweeping walks expired reservations in keyset batches over their id. Each
+    batch runs in its own short transaction: the affected inventory rows are
+    locked in product id order (the same order reserve/release use), then one
+    statement deletes the expired rows and decrements the counters by the
+    released sums.
+
+    Reconciling walks inventory in product id batches and resets any counter
+    that drifted from the sum of its reservation rows.
+    """
+
+    def __init__(self, batch_size: int = 1000, lock_timeout_ms: int = 1000) -> None:
+        self.batch_size = batch_size
+        self.lock_timeout_ms = lock_timeout_ms
+
+    def count_expired(self, now=None) -> int:
+        now = now or timezone.now()
+        return StockReservation.objects.filter(expires_at__lte=now, order__isnull=True).count()
+
+    def iter_batches(self, now=None, max_batches: Optional[int] = None) -> Iterator[ReservationsSweepBatch]:
+        now = now or timezone.now()
+        after_id = 0
+        batches = 0
+
+        while max_batches is None or batches < max_batches:
+            start_time = time.perf_counter()
+            last_id, released, units, products = self._release_batch(now, after_id)
+            if last_id is None:
+                return
+
+            after_id = last_id
+            batches += 1
+            yield ReservationsSweepBatch(
+                reservations_released=released,
+                units_released=units,
+                products_updated=products,
+                elapsed=time.perf_counter() - start_time,
+            )
+
+    def iter_reconcile_batches(self, max_batches: Optional[int] = None) -> Iterator[ReservationsReconcileBatch]:
+        after_product_id = 0
+        batches = 0
+
+        while max_batches is None or batches < max_batches:
+            start_time = time.perf_counter()
+            last_product_id, checked, fixed, drift = self._reconcile_batch(after_product_id)
+            if last_product_id is None:
+                return
+
+            after_product_id = last_product_id
+            batches += 1
+            yield ReservationsReconcileBatch(
+                products_checked=checked,
+                products_fixed=fixed,
+                drift_units=drift,
+                elapsed=time.perf_counter() - start_time,
+            )
+
+    def _release_batch(self, now, after_id: int):
+        inventory_table = ProductInventory._meta.db_table
+        reservations_table = StockReservation._meta.db_table
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(f"SET LOCAL lock_timeout = {int(self.lock_timeout_ms)}")
+            cursor.execute(
+                f"""
+                SELECT id, product_id
+                FROM {reservations_table}
+                WHERE expires_at <= %s AND order_id IS NULL AND id > %s
+                ORDER BY id
+                LIMIT %s
+                """,
+                [now, after_id, self.batch_size],
+            )
+            rows = cursor.fetchall()
+            if not rows:
+                return None, 0, 0, 0
+
+            reservation_ids = [row[0] for row in rows]
+            product_ids = ProductInventory._lock_inventory_rows(cursor, {row[1] for row in rows})
+
+            cursor.execute(
+                f"""
+                WITH released AS (
+                    DELETE FROM {reservations_table}
+                    WHERE id = ANY(%s) AND expires_at <= %s AND order_id IS NULL
+                    RETURNING product_id, quantity
+                ),
+                per_product AS (
+                    SELECT product_id, SUM(quantity) AS quantity
+                    FROM released
+                    GROUP BY product_id
+                ),
+                updated AS (
+                    UPDATE {inventory_table} inv
+                    SET reserved_quantity = GREATEST(inv.reserved_quantity - p.quantity, 0),
+                        updated_at = now()
+                    FROM per_product p
+                    WHERE inv.product_id = p.product_id
+                    RETURNING 1
+                )
+                SELECT
+                    (SELECT count(*) FROM released),
+                    (SELECT COALESCE(SUM(quantity), 0) FROM released),
+                    (SELECT count(*) FROM updated)
+                """,
+                [reservation_ids, now],
+            )
+            released, units, products = cursor.fetchone()
+
+            if released:
+                publish(INVENTORY_CHANGED, product_ids, {'prices': False, 'stock': True, 'source': 'reservations_sweep'})
+
+        return reservation_ids[-1], released, units, products
+
+    def _reconcile_batch(self, after_product_id: int):
+        inventory_table = ProductInventory._meta.db_table
+        reservations_table = StockReservation._meta.db_table
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(f"SET LOCAL lock_timeout = {int(self.lock_timeout_ms)}")
+            cursor.execute(
+                f"""
+                SELECT product_id
+                FROM {inventory_table}
+                WHERE product_id > %s
+                ORDER BY product_id
+                LIMIT %s
+                FOR UPDATE
+                """,
+                [after_product_id, self.batch_size],
+            )
+            product_ids = [row[0] for row in cursor.fetchall()]
+            if not product_ids:
+                return None, 0, 0, 0
+
+            cursor.execute(
+                f"""
+                WITH expected AS (
+                    SELECT inv.product_id,
+                           inv.reserved_quantity AS current_quantity,
+                           LEAST(COALESCE(SUM(r.quantity), 0), inv.stock_quantity) AS quantity
+                    FROM {inventory_table} inv
+                    LEFT JOIN {reservations_table} r ON r.product_id = inv.product_id
+                    WHERE inv.product_id = ANY(%s)
+                    GROUP BY inv.product_id, inv.reserved_quantity, inv.stock_quantity
+                ),
+                fixed AS (
+                    UPDATE {inventory_table} inv
+                    SET reserved_quantity = e.quantity,
+                        updated_at = now()
+                    FROM expected e
+                    WHERE inv.product_id = e.product_id
+                      AND inv.reserved_quantity <> e.quantity
+                    RETURNING inv.product_id, abs(e.current_quantity - e.quantity) AS drift
+                )
+                SELECT count(*), COALESCE(SUM(drift), 0), array_agg(product_id) FROM fixed
+                """,
+                [product_ids],
+            )
+            fixed, drift, fixed_ids = cursor.fetchone()
+
+            if fixed:
+                publish(INVENTORY_CHANGED, fixed_ids, {'prices': False, 'stock': True, 'source': 'reservations_reconcile'})
+
+        return product_ids[-1], len(product_ids), fixed, drift
@@ -1,3 +1,134 @@
+from datetime import timedelta
+
 from django.test import TestCase
+from django.utils import timezone
+
+from apps.orders.models import Order
+from fixtures.factories.catalog import CurrencyFactory, ProductInventoryFactory
+
+from .models import ProductInventory, StockReservation
+from .reservations import ExpiredReservationsSweeper
+
+
+class ExpiredReservationsSweeperTests(TestCase):
+
+    def setUp(self):
+        self.inventory = ProductInventoryFactory(stock_quantity=10)
+        self.product_id = self.inventory.product_id
+        self.past = timezone.now() - timedelta(minutes=5)
+        self.future = timezone.now() + timedelta(minutes=30)
+
+    def reserve(self, quantity, expires_at, order=None):
+        ProductInventory.reserve_many({self.product_id: quantity}, expires_at=expires_at, order=order)
+
+    def reserved_quantity(self):
+        return ProductInventory.objects.get(pk=self.inventory.pk).reserved_quantity
+
+    def test_expired_reservations_are_released(self):
+        self.reserve(2, self.past)
+        self.reserve(3, self.future)
+
+        batches = list(ExpiredReservationsSweeper().iter_batches())
+
+        self.assertEqual(sum(batch.reservations_released for batch in batches), 1)
+        self.assertEqual(sum(batch.units_released for batch in batches), 2)
+        self.assertEqual(self.reserved_quantity(), 3)
+        self.assertEqual(list(StockReservation.objects.values_list('quantity', flat=True)), [3])
+
+    def test_sweeps_in_keyset_batches(self):
+        for _ in range(3):
+            self.reserve(1, self.past)
+
+        batches = list(ExpiredReservationsSweeper(batch_size=1).iter_batches())
+
+        self.assertEqual([batch.reservations_released for batch in batches], [1, 1, 1])
+        self.assertEqual(self.reserved_quantity(), 0)
+
+    def test_max_batches_stops_early(self):
+        for _ in range(3):
+            self.reserve(1, self.past)
+
+        batches = list(ExpiredReservationsSweeper(batch_size=1).iter_batches(max_batches=2))
+
+        self.assertEqual(len(batches), 2)
+        self.assertEqual(self.reserved_quantity(), 1)
+
+    def test_order_reservations_are_never_swept(self):
+        order = Order.objects.create(currency=CurrencyFactory())
+        self.reserve(4, self.past, order=order)
+
+        sweeper = ExpiredReservationsSweeper()
+        self.assertEqual(sweeper.count_expired(), 0)
+        self.assertEqual(list(sweeper.iter_batches()), [])
+        self.assertEqual(self.reserved_quantity(), 4)
+
+    def test_reconcile_resets_drifted_counters(self):
+        self.reserve(2, self.future)
+        ProductInventory.objects.filter(pk=self.inventory.pk).update(reserved_quantity=7)
+        in_sync = ProductInventoryFactory(stock_quantity=5)
+
+        batches = list(ExpiredReservationsSweeper().iter_reconcile_batches())
+
+        self.assertEqual(sum(batch.products_checked for batch in batches), 2)
+        self.assertEqual(sum(batch.products_fixed for batch in batches), 1)
+        self.assertEqual(sum(batch.drift_units for batch in batches), 5)
+        self.assertEqual(self.reserved_quantity(), 2)
+        self.assertEqual(ProductInventory.objects.get(pk=in_sync.pk).reserved_quantity, 0)
+
+    def test_reconcile_caps_reservations_at_stock(self):
+        self.reserve(6, self.future)
+        ProductInventory.objects.filter(pk=self.inventory.pk).update(stock_quantity=6, reserved_quantity=0)
+        StockReservation.objects.create(product_id=self.product_id, quantity=3, expires_at=self.future)
+
+        list(ExpiredReservationsSweeper().iter_reconcile_batches())
+
+        self.assertEqual(self.reserved_quantity(), 6)
+
+
+class OwnedReservationsTests(TestCase):
+
+    def setUp(self):
+        self.inventory = ProductInventoryFactory(stock_quantity=10)
+        self.product_id = self.inventory.product_id
+        self.order = Order.objects.create(currency=CurrencyFactory())
+        ProductInventory.reserve_many({self.product_id: 3}, order=self.order)
+        ProductInventory.reserve_many({self.product_id: 2})
+
+    def inventory_counters(self):
+        inventory = ProductInventory.objects.get(pk=self.inventory.pk)
+        return inventory.stock_quantity, inventory.reserved_quantity
+
+    def test_release_without_owner_leaves_owned_holds_alone(self):
+        with self.assertRaises(ValueError):
+            self.inventory.release_stock(3)
+
+        self.inventory.release_stock(2)
+
+        self.assertEqual(self.inventory_counters(), (10, 3))
+        self.assertEqual(list(StockReservation.objects.values_list('order_id', 'quantity')), [(self.order.pk, 3)])
+
+    def test_release_is_scoped_to_its_order(self):
+        self.inventory.release_stock(1, order=self.order)
+
+        self.assertEqual(self.inventory_counters(), (10, 4))
+        self.assertEqual(StockReservation.objects.get(order=self.order).quantity, 2)
+        self.assertEqual(StockReservation.objects.get(order__isnull=True).quantity, 2)
+
+    def test_release_reservations_returns_order_stock(self):
+        released = ProductInventory.release_reservations(order=self.order)
+
+        self.assertEqual(released, 3)
+        self.assertEqual(self.inventory_counters(), (10, 2))
+        self.assertFalse(StockReservation.objects.filter(order=self.order).exists())
+
+    def test_sold_reservations_leave_the_stock(self):
+        released = ProductInventory.release_reservations(order=self.order, sold=True)
+
+        self.assertEqual(released, 3)
+        self.assertEqual(self.inventory_counters(), (7, 2))
+        self.assertEqual(ProductInventory.objects.get(pk=self.inventory.pk).available_quantity, 5)
 
-# Create your tests here.
+    def test_release_reservations_requires_an_owner(self):
+        with self.assertRaises(ValueError):
+            ProductInventory.release_reservations()
+        self.assertEqual(ProductInventory.release_reservations(order=Order.objects.create(currency=CurrencyFactory())), 0)
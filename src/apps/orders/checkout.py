@@ -0,0 +1,168 @@
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import List, Optional
+
+from django.db import connection, transaction
+from django.db.models import F
+
+from apps.cart.models import Cart, CartItem
+from apps.inventories.models import InsufficientStockError, ProductInventory
+
+from .models import Order, OrderItem
+
+
+class CheckoutError(Exception):
+    """Base class for errors that prevent an order from being placed"""
+
+
+class EmptyCartError(CheckoutError):
+    def __init__(self):
+        super().__init__("Cart is empty")
+
+
+class MixedCurrencyError(CheckoutError):
+    def __init__(self, currencies):
+        self.currencies = sorted(currencies)
+        super().__init__(f"Cart mixes prices in several currencies: {', '.join(self.currencies)}")
+
+
+@dataclass(frozen=True)
+class ShortItem:
+    product_id: int
+    requested: int
+    available: int
+
+
+class OutOfStockError(CheckoutError):
+    def __init__(self, short_items: List[ShortItem]):
+        self.short_items = short_items
+        super().__init__(f"Not enough stock for {len(short_items)} cart item(s)")
+
+
+@dataclass(frozen=True)
+class CartLine:
+    product_id: int
+    quantity: int
+    unit_price: Optional[Decimal]
+    currency_id: Optional[str]
+
+    @property
+    def is_sellable(self) -> bool:
+        return self.unit_price is not None
+
+    @property
+    def line_total(self) -> Decimal:
+        return self.unit_price * self.quantity
+
+
+class CheckoutService:
+    """
+    Turns a cart into a pending order in a single transaction.
+
+    The cart row is locked so the same cart cannot be checked out twice, the
+    lines and effective prices are snapshotted in one query, stock for every
+    line is reserved for the order with one set-based UPDATE that locks
+    inventory rows in product id order, and the order and its lines are
+    written with two inserts. Any short line rolls the whole checkout back.
+    The reservations belong to the order and do not expire: like the order's
+    pending status, they hold the stock until Order.mark_paid() or
+    Order.cancel() releases them.
+    """
+
+    def __init__(self, cart: Cart) -> None:
+        self.cart = cart
+
+    def place_order(self) -> Order:
+        with transaction.atomic():
+            self._lock_cart()
+
+            lines = self.snapshot_lines()
+            if not lines:
+                raise EmptyCartError()
+
+            unsellable = [
+                ShortItem(line.product_id, line.quantity, 0)
+                for line in lines
+                if not line.is_sellable
+            ]
+            if unsellable:
+                raise OutOfStockError(unsellable)
+
+            currencies = {line.currency_id for line in lines}
+            if len(currencies) > 1:
+                raise MixedCurrencyError(currencies)
+
+            order = self._create_order(lines, currencies.pop())
+            self._reserve(lines, order)
+            self._create_order_items(order, lines)
+            self.cart.clear()
+
+        return order
+
+    def snapshot_lines(self) -> List[CartLine]:
+        items_table = CartItem._meta.db_table
+        inventory_table = ProductInventory._meta.db_table
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                SELECT ci.product_id,
+                       ci.quantity,
+                       COALESCE(inv.sale_price, inv.base_price),
+                       inv.currency_id
+                FROM {items_table} ci
+                LEFT JOIN {inventory_table} inv
+                       ON inv.product_id = ci.product_id AND inv.is_active
+                WHERE ci.cart_id = %s
+                ORDER BY ci.product_id
+                """,
+                [self.cart.pk],
+            )
+            return [CartLine(*row) for row in cursor.fetchall()]
+
+    def _lock_cart(self) -> None:
+        # Locked in its own statement so the snapshot below, taken after any
+        # concurrent checkout of the same cart commits, sees its cleared items.
+        locked = Cart.objects.select_for_update().filter(pk=self.cart.pk).values_list('pk', flat=True)
+        if not list(locked):
+            raise Cart.DoesNotExist(f"Cart {self.cart.pk} no longer exists.")
+
+    @staticmethod
+    def _reserve(lines: List[CartLine], order: Order) -> None:
+        requested = {line.product_id: line.quantity for line in lines}
+
+        try:
+            ProductInventory.reserve_many(requested, order=order)
+        except InsufficientStockError as exc:
+            available = dict(
+                ProductInventory.objects
+                .filter(product_id__in=exc.product_ids)
+                .annotate(available=F('stock_quantity') - F('reserved_quantity'))
+                .values_list('product_id', 'available')
+            )
+            raise OutOfStockError([
+                ShortItem(product_id, requested[product_id], available.get(product_id, 0))
+                for product_id in exc.product_ids
+            ]) from exc
+
+    def _create_order(self, lines: List[CartLine], currency_id: str) -> Order:
+        return Order.objects.create(
+            user_id=self.cart.user_id,
+            currency_id=currency_id,
+            items_count=len(lines),
+            total_quantity=sum(line.quantity for line in lines),
+            total_amount=sum((line.line_total for line in lines), Decimal('0.00')),
+        )
+
+    @staticmethod
+    def _create_order_items(order: Order, lines: List[CartLine]) -> None:
+        OrderItem.objects.bulk_create([
+            OrderItem(
+                order=order,
+                product_id=line.product_id,
+                quantity=line.quantity,
+                unit_price=line.unit_price,
+                line_total=line.line_total,
+            )
+            for line in lines
+        ])
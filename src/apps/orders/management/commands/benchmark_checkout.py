@@ -0,0 +1,292 @@
+import random
+import secrets
+import threading
+import time
+from collections import Counter
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError, connection, transaction
+from django.db.models import Sum
+from django.utils import timezone
+
+from apps.cart.models import Cart, CartItem, CartToken
+from apps.inventories.models import ProductInventory
+from apps.orders.checkout import CheckoutError, CheckoutService, OutOfStockError
+from apps.orders.models import Order, OrderItem
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark concurrent checkouts against a few hot products. "
+        "Temporarily rewrites stock of the chosen products; run it against a dev database only."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--checkouts",
+            dest="checkouts",
+            type=int,
+            default=500,
+            help="Number of carts checked out (default: 500)",
+        )
+        parser.add_argument(
+            "--concurrency",
+            dest="concurrency",
+            type=int,
+            default=16,
+            help="Number of worker threads, each with its own DB connection (default: 16)",
+        )
+        parser.add_argument(
+            "--hot-products",
+            dest="hot_products",
+            type=int,
+            default=5,
+            help="Number of contended products every cart draws from (default: 5)",
+        )
+        parser.add_argument(
+            "--stock",
+            dest="stock",
+            type=int,
+            default=300,
+            help="Available stock set on each hot product before the run (default: 300)",
+        )
+        parser.add_argument(
+            "--max-lines",
+            dest="max_lines",
+            type=int,
+            default=3,
+            help="Maximum distinct hot products per cart (default: 3)",
+        )
+        parser.add_argument(
+            "--max-qty",
+            dest="max_qty",
+            type=int,
+            default=2,
+            help="Maximum quantity per cart line (default: 2)",
+        )
+        parser.add_argument(
+            "--currency",
+            dest="currency",
+            type=str,
+            default="USD",
+            help="Only pick hot products priced in this currency (default: USD)",
+        )
+        parser.add_argument(
+            "--seed",
+            dest="seed",
+            type=int,
+            default=None,
+            help="Random seed for cart contents",
+        )
+        parser.add_argument(
+            "--keep-data",
+            action="store_true",
+            dest="keep_data",
+            default=False,
+            help="Keep benchmark orders and do not restore the original stock.",
+        )
+
+    def handle(self, *args, **options):
+        checkouts = options["checkouts"]
+        concurrency = options["concurrency"]
+        hot_products = options["hot_products"]
+        stock = options["stock"]
+        max_lines = options["max_lines"]
+        max_qty = options["max_qty"]
+
+        if min(checkouts, concurrency, hot_products, max_lines, max_qty) <= 0:
+            raise CommandError("checkouts, concurrency, hot-products, max-lines and max-qty must be positive")
+        if stock < 0:
+            raise CommandError("stock must not be negative")
+
+        product_ids = list(
+            ProductInventory.objects
+            .filter(is_active=True, currency_id=options["currency"])
+            .order_by("product_id")
+            .values_list("product_id", flat=True)[:hot_products]
+        )
+        if not product_ids:
+            raise CommandError("No active inventory found; seed inventories first.")
+
+        rng = random.Random(options["seed"])
+        original_stock = self._snapshot_stock(product_ids)
+        self._set_available_stock(product_ids, stock)
+        cart_ids = self._create_carts(product_ids, checkouts, min(max_lines, len(product_ids)), max_qty, rng)
+
+        self.stdout.write(
+            self.style.NOTICE(
+                f"Checking out {checkouts:,} carts with {concurrency} threads "
+                f"against {len(product_ids)} hot products ({stock} units each)..."
+            )
+        )
+
+        results = []
+        try:
+            total_time = self._run(cart_ids, concurrency, results)
+            self._report(results, total_time, product_ids, original_stock)
+        finally:
+            if not options["keep_data"]:
+                self._cleanup(cart_ids, results, original_stock)
+
+    def _run(self, cart_ids, concurrency, results):
+        queue = list(reversed(cart_ids))
+        queue_lock = threading.Lock()
+        barrier = threading.Barrier(concurrency + 1)
+
+        def worker():
+            barrier.wait()
+            try:
+                while True:
+                    with queue_lock:
+                        if not queue:
+                            return
+                        cart_id = queue.pop()
+                    results.append(self._checkout(cart_id))
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=worker, daemon=True) for _ in range(concurrency)]
+        for thread in threads:
+            thread.start()
+
+        barrier.wait()
+        start_time = time.perf_counter()
+        for thread in threads:
+            thread.join()
+        return time.perf_counter() - start_time
+
+    @staticmethod
+    def _checkout(cart_id):
+        start_time = time.perf_counter()
+        order_id = None
+        try:
+            order_id = CheckoutService(Cart.from_reference(cart_id)).place_order().pk
+            outcome = "placed"
+        except OutOfStockError:
+            outcome = "out_of_stock"
+        except CheckoutError:
+            outcome = "rejected"
+        except DatabaseError as exc:
+            outcome = "deadlock" if "deadlock" in str(exc).lower() else "db_error"
+        return outcome, time.perf_counter() - start_time, order_id
+
+    def _report(self, results, total_time, product_ids, original_stock):
+        outcomes = Counter(outcome for outcome, _, _ in results)
+        latencies = sorted(elapsed for _, elapsed, _ in results)
+        order_ids = [order_id for _, _, order_id in results if order_id]
+
+        def percentile(p):
+            if not latencies:
+                return 0.0
+            return latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000
+
+        rate = len(results) / total_time if total_time > 0 else 0.0
+        placed_rate = outcomes["placed"] / total_time if total_time > 0 else 0.0
+
+        self.stdout.write(
+            f"- Outcomes: {outcomes['placed']:,} placed, {outcomes['out_of_stock']:,} out of stock, "
+            f"{outcomes['rejected']:,} rejected, {outcomes['deadlock']:,} deadlocks, "
+            f"{outcomes['db_error']:,} other DB errors"
+        )
+        self.stdout.write(
+            f"- Latency: p50 {percentile(0.50):.1f}ms, p95 {percentile(0.95):.1f}ms, "
+            f"p99 {percentile(0.99):.1f}ms, max {percentile(1.0):.1f}ms"
+        )
+
+        ordered = dict(
+            OrderItem.objects
+            .filter(order_id__in=order_ids)
+            .values("product_id")
+            .annotate(total=Sum("quantity"))
+            .values_list("product_id", "total")
+        )
+        current = self._snapshot_stock(product_ids)
+        mismatches = [
+            product_id for product_id in product_ids
+            if current[product_id][1] - original_stock[product_id][1] != ordered.get(product_id, 0)
+            or current[product_id][1] > current[product_id][0]
+        ]
+
+        if mismatches:
+            self.stdout.write(self.style.ERROR(f"- Reservation mismatch for products: {mismatches}"))
+        else:
+            self.stdout.write("- Reserved stock matches ordered quantities; nothing oversold")
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Checkout benchmark completed: {len(results):,} checkouts in {total_time:.3f}s "
+                f"({rate:,.0f} checkouts/s, {placed_rate:,.0f} orders/s)"
+            )
+        )
+
+    @staticmethod
+    def _snapshot_stock(product_ids):
+        return {
+            product_id: (stock_quantity, reserved_quantity)
+            for product_id, stock_quantity, reserved_quantity in (
+                ProductInventory.objects
+                .filter(product_id__in=product_ids)
+                .values_list("product_id", "stock_quantity", "reserved_quantity")
+            )
+        }
+
+    @staticmethod
+    def _set_available_stock(product_ids, stock):
+        table_name = ProductInventory._meta.db_table
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                UPDATE {table_name}
+                SET stock_quantity = reserved_quantity + %s, updated_at = now()
+                WHERE product_id = ANY(%s)
+                """,
+                [stock, product_ids],
+            )
+
+    @staticmethod
+    def _create_carts(product_ids, checkouts, max_lines, max_qty, rng):
+        expires_at = timezone.now() + timedelta(hours=1)
+
+        with transaction.atomic():
+            tokens = CartToken.objects.bulk_create([
+                CartToken(token=f"bench-{secrets.token_hex(16)}", expires_at=expires_at)
+                for _ in range(checkouts)
+            ])
+            carts = Cart.objects.bulk_create([Cart(token=token) for token in tokens])
+            CartItem.objects.bulk_create([
+                CartItem(cart=cart, product_id=product_id, quantity=rng.randint(1, max_qty))
+                for cart in carts
+                for product_id in rng.sample(product_ids, rng.randint(1, max_lines))
+            ])
+
+        return [cart.pk for cart in carts]
+
+    def _cleanup(self, cart_ids, results, original_stock):
+        order_ids = [order_id for _, _, order_id in results if order_id]
+        table_name = ProductInventory._meta.db_table
+        values_sql = ", ".join(["(%s::bigint, %s::integer, %s::integer)"] * len(original_stock))
+        params = [value for product_id, counts in sorted(original_stock.items()) for value in (product_id, *counts)]
+
+        with transaction.atomic():
+            OrderItem.objects.filter(order_id__in=order_ids).delete()
+            Order.objects.filter(pk__in=order_ids).delete()
+            CartItem.objects.filter(cart_id__in=cart_ids).delete()
+            token_ids = list(Cart.objects.filter(pk__in=cart_ids).values_list("token_id", flat=True))
+            Cart.objects.filter(pk__in=cart_ids).delete()
+            CartToken.objects.filter(pk__in=token_ids).delete()
+
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"""
+                    UPDATE {table_name} inv
+                    SET stock_quantity = v.stock_quantity,
+                        reserved_quantity = v.reserved_quantity,
+                        updated_at = now()
+                    FROM (VALUES {values_sql}) AS v(product_id, stock_quantity, reserved_quantity)
+                    WHERE inv.product_id = v.product_id
+                    """,
+                    params,
+                )
+
+        self.stdout.write(self.style.NOTICE("Benchmark orders and carts removed, original stock restored."))
@@ -0,0 +1,54 @@
+# Generated by Django 5.2.5 on 2026-10-19 10:00
+
+import django.core.validators
+import django.db.models.deletion
+from decimal import Decimal
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('catalog', '0018_productviewstats'),
+        ('inventories', '0002_productinventory_idx_inventory_availability_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Order',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('paid', 'Paid'), ('cancelled', 'Cancelled')], default='pending', help_text='Pending orders hold reserved stock until paid or cancelled.', max_length=16)),
+                ('items_count', models.PositiveIntegerField(default=0)),
+                ('total_quantity', models.PositiveIntegerField(default=0)),
+                ('total_amount', models.DecimalField(decimal_places=2, default=Decimal('0.00'), help_text='Sum of line totals at checkout time', max_digits=14, validators=[django.core.validators.MinValueValidator(Decimal('0.00'))])),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('currency', models.ForeignKey(help_text='Currency of every line in this order', on_delete=django.db.models.deletion.RESTRICT, to='inventories.currency')),
+                ('user', models.ForeignKey(blank=True, help_text='Customer who placed the order; null for anonymous checkouts.', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='orders', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['user', '-created_at'], name='idx_order_user_created'), models.Index(fields=['status', 'created_at'], name='idx_order_status_created')],
+            },
+        ),
+        migrations.CreateModel(
+            name='OrderItem',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('quantity', models.PositiveIntegerField()),
+                ('unit_price', models.DecimalField(decimal_places=2, help_text='Effective product price captured at checkout', max_digits=10)),
+                ('line_total', models.DecimalField(decimal_places=2, help_text='unit_price * quantity captured at checkout', max_digits=14)),
+                ('order', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='items', to='orders.order')),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='order_items', to='catalog.product')),
+            ],
+            options={
+                'ordering': ['order', 'product'],
+                'unique_together': {('order', 'product')},
+            },
+        ),
+    ]
@@ -0,0 +1,127 @@
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.validators import MinValueValidator
+from django.db import models, transaction
+from django.utils import timezone
+
+from apps.inventories.models import ProductInventory
+
+User = get_user_model()
+
+
+class OrderStatusError(ValueError):
+    """Raised when an order is not in a status the requested transition starts from"""
+
+    def __init__(self, order_id, status):
+        self.order_id = order_id
+        self.status = status
+        super().__init__(f"Order #{order_id} is {status}, expected pending")
+
+
+class Order(models.Model):
+    class Status(models.TextChoices):
+        PENDING = 'pending', 'Pending'
+        PAID = 'paid', 'Paid'
+        CANCELLED = 'cancelled', 'Cancelled'
+
+    user = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        related_name='orders',
+        null=True,
+        blank=True,
+        help_text="Customer who placed the order; null for anonymous checkouts."
+    )
+    status = models.CharField(
+        max_length=16,
+        choices=Status.choices,
+        default=Status.PENDING,
+        help_text="Pending orders hold reserved stock until paid or cancelled."
+    )
+    currency = models.ForeignKey(
+        'inventories.Currency',
+        on_delete=models.RESTRICT,
+        help_text="Currency of every line in this order"
+    )
+
+    items_count = models.PositiveIntegerField(default=0)
+    total_quantity = models.PositiveIntegerField(default=0)
+    total_amount = models.DecimalField(
+        max_digits=14,
+        decimal_places=2,
+        default=Decimal('0.00'),
+        validators=[MinValueValidator(Decimal('0.00'))],
+        help_text="Sum of line totals at checkout time"
+    )
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', '-created_at'], name='idx_order_user_created'),
+            models.Index(fields=['status', 'created_at'], name='idx_order_status_created'),
+        ]
+
+    def __str__(self) -> str:
+        return f"Order #{self.pk} ({self.status})"
+
+    def mark_paid(self) -> int:
+        """Mark a pending order paid; its reserved units are taken out of stock. Returns the units."""
+        return self._transition(Order.Status.PAID, sold=True)
+
+    def cancel(self) -> int:
+        """Cancel a pending order and return its reserved units to stock. Returns the units."""
+        return self._transition(Order.Status.CANCELLED, sold=False)
+
+    def _transition(self, status, sold: bool) -> int:
+        with transaction.atomic():
+            # The status guard makes concurrent transitions of one order mutually exclusive.
+            updated = Order.objects.filter(pk=self.pk, status=Order.Status.PENDING).update(
+                status=status,
+                updated_at=timezone.now(),
+            )
+            if not updated:
+                current = Order.objects.filter(pk=self.pk).values_list('status', flat=True).first()
+                raise OrderStatusError(self.pk, current)
+
+            units = ProductInventory.release_reservations(order=self, sold=sold)
+
+        self.refresh_from_db(fields=['status', 'updated_at'])
+        return units
+
+
+class OrderItem(models.Model):
+    order = models.ForeignKey(
+        Order,
+        on_delete=models.CASCADE,
+        related_name='items',
+        db_index=True
+    )
+    product = models.ForeignKey(
+        'catalog.Product',
+        on_delete=models.PROTECT,
+        related_name='order_items',
+        db_index=True
+    )
+
+    quantity = models.PositiveIntegerField()
+    unit_price = models.DecimalField(
+        max_digits=10,
+        decimal_places=2,
+        help_text="Effective product price captured at checkout"
+    )
+    line_total = models.DecimalField(
+        max_digits=14,
+        decimal_places=2,
+        help_text="unit_price * quantity captured at checkout"
+    )
+
+    class Meta:
+        unique_together = [('order', 'product')]
+        ordering = ['order', 'product']
+
+    def __str__(self) -> str:
+        return f"{self.order_id} | {self.product_id} x {self.quantity}"
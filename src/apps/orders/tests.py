@@ -0,0 +1,165 @@
+import threading
+from decimal import Decimal
+
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+
+from apps.cart.models import Cart, CartItem
+from apps.inventories.models import ProductInventory, StockReservation
+from fixtures.factories.catalog import ProductFactory, ProductInventoryFactory
+from fixtures.factories.users import UserFactory
+
+from .checkout import CheckoutService, EmptyCartError, OutOfStockError, ShortItem
+from .models import Order, OrderItem, OrderStatusError
+
+
+def make_cart(*lines):
+    cart = Cart.get_or_create_for_user(UserFactory())
+    for product, quantity in lines:
+        cart.add_product(product, quantity)
+    return cart
+
+
+class CheckoutServiceTests(TestCase):
+
+    def test_place_order_reserves_stock_and_clears_cart(self):
+        shirt = ProductInventoryFactory(stock_quantity=5, base_price=Decimal('20.00'))
+        cap = ProductInventoryFactory(stock_quantity=2, base_price=Decimal('15.00'), sale_price=Decimal('10.00'))
+        cart = make_cart((shirt.product, 2), (cap.product, 1))
+
+        order = CheckoutService(cart).place_order()
+
+        self.assertEqual(order.status, Order.Status.PENDING)
+        self.assertEqual(order.items_count, 2)
+        self.assertEqual(order.total_quantity, 3)
+        self.assertEqual(order.total_amount, Decimal('50.00'))
+        self.assertEqual(
+            dict(OrderItem.objects.filter(order=order).values_list('product_id', 'unit_price')),
+            {shirt.product_id: Decimal('20.00'), cap.product_id: Decimal('10.00')},
+        )
+        self.assertFalse(CartItem.objects.filter(cart=cart).exists())
+
+        shirt.refresh_from_db()
+        cap.refresh_from_db()
+        self.assertEqual((shirt.reserved_quantity, cap.reserved_quantity), (2, 1))
+
+    def test_order_reservations_do_not_expire(self):
+        inventory = ProductInventoryFactory(stock_quantity=5)
+        order = CheckoutService(make_cart((inventory.product, 1))).place_order()
+
+        reservation = StockReservation.objects.get(order=order)
+        self.assertEqual(reservation.quantity, 1)
+        self.assertIsNone(reservation.expires_at)
+
+    def test_empty_cart_is_rejected(self):
+        with self.assertRaises(EmptyCartError):
+            CheckoutService(make_cart()).place_order()
+
+    def test_oversell_is_rejected_with_short_items(self):
+        inventory = ProductInventoryFactory(stock_quantity=3)
+        CheckoutService(make_cart((inventory.product, 2))).place_order()
+
+        with self.assertRaises(OutOfStockError) as raised:
+            CheckoutService(make_cart((inventory.product, 2))).place_order()
+
+        self.assertEqual(raised.exception.short_items, [ShortItem(inventory.product_id, 2, 1)])
+        inventory.refresh_from_db()
+        self.assertEqual(inventory.reserved_quantity, 2)
+        self.assertEqual(Order.objects.count(), 1)
+
+    def test_one_short_line_rolls_back_the_whole_checkout(self):
+        plenty = ProductInventoryFactory(stock_quantity=10)
+        scarce = ProductInventoryFactory(stock_quantity=1)
+        cart = make_cart((plenty.product, 3), (scarce.product, 2))
+
+        with self.assertRaises(OutOfStockError) as raised:
+            CheckoutService(cart).place_order()
+
+        self.assertEqual(raised.exception.short_items, [ShortItem(scarce.product_id, 2, 1)])
+        self.assertFalse(Order.objects.exists())
+        self.assertFalse(StockReservation.objects.exists())
+        self.assertEqual(CartItem.objects.filter(cart=cart).count(), 2)
+        plenty.refresh_from_db()
+        self.assertEqual(plenty.reserved_quantity, 0)
+
+    def test_product_without_active_inventory_is_short(self):
+        product = ProductFactory()
+        inactive = ProductInventoryFactory(is_active=False)
+        cart = make_cart((product, 1), (inactive.product, 1))
+
+        with self.assertRaises(OutOfStockError) as raised:
+            CheckoutService(cart).place_order()
+
+        self.assertEqual(
+            sorted(raised.exception.short_items, key=lambda item: item.product_id),
+            sorted([ShortItem(product.pk, 1, 0), ShortItem(inactive.product_id, 1, 0)], key=lambda item: item.product_id),
+        )
+
+
+class OrderTransitionTests(TestCase):
+
+    def setUp(self):
+        self.inventory = ProductInventoryFactory(stock_quantity=5)
+        self.other = ProductInventoryFactory(stock_quantity=5)
+        self.order = CheckoutService(make_cart((self.inventory.product, 2))).place_order()
+        CheckoutService(make_cart((self.inventory.product, 1), (self.other.product, 1))).place_order()
+
+    def counters(self, inventory):
+        inventory = ProductInventory.objects.get(pk=inventory.pk)
+        return inventory.stock_quantity, inventory.reserved_quantity
+
+    def test_mark_paid_takes_reserved_units_out_of_stock(self):
+        self.assertEqual(self.order.mark_paid(), 2)
+
+        self.assertEqual(self.order.status, Order.Status.PAID)
+        self.assertEqual(self.counters(self.inventory), (3, 1))
+        self.assertEqual(self.counters(self.other), (5, 1))
+        self.assertFalse(StockReservation.objects.filter(order=self.order).exists())
+
+    def test_cancel_returns_reserved_units(self):
+        self.assertEqual(self.order.cancel(), 2)
+
+        self.assertEqual(Order.objects.get(pk=self.order.pk).status, Order.Status.CANCELLED)
+        self.assertEqual(self.counters(self.inventory), (5, 1))
+        self.assertEqual(StockReservation.objects.filter(order__isnull=False).count(), 2)
+
+    def test_only_pending_orders_transition(self):
+        self.order.cancel()
+
+        with self.assertRaises(OrderStatusError):
+            self.order.mark_paid()
+        with self.assertRaises(OrderStatusError):
+            self.order.cancel()
+
+        self.assertEqual(Order.objects.get(pk=self.order.pk).status, Order.Status.CANCELLED)
+        self.assertEqual(self.counters(self.inventory), (5, 1))
+
+
+class CheckoutConcurrencyTests(TransactionTestCase):
+
+    def test_concurrent_checkouts_never_oversell(self):
+        inventory = ProductInventoryFactory(stock_quantity=3)
+        carts = [make_cart((inventory.product, 1)) for _ in range(6)]
+        barrier = threading.Barrier(len(carts))
+        results = []
+
+        def checkout(cart):
+            try:
+                barrier.wait()
+                CheckoutService(cart).place_order()
+                results.append('ordered')
+            except OutOfStockError:
+                results.append('short')
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=checkout, args=(cart,)) for cart in carts]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(sorted(results), ['ordered'] * 3 + ['short'] * 3)
+        inventory = ProductInventory.objects.get(pk=inventory.pk)
+        self.assertEqual(inventory.reserved_quantity, 3)
+        self.assertEqual(inventory.available_quantity, 0)
@@ -0,0 +1,111 @@
+import time
+from dataclasses import dataclass, field
+from typing import List
+
+from django.db import connection, transaction
+
+from .handlers import get_handlers
+from .models import OutboxCheckpoint, OutboxEvent
+from .publisher import OUTBOX_CHANNEL
+
+
+@dataclass
+class OutboxBatch:
+    events: int
+    last_txid: int
+    last_event_id: int
+    handlers: List[str] = field(default_factory=list)
+    elapsed: float = 0.0
+
+
+class OutboxConsumer:
+    """
+    Fan outbox events out to the registered invalidation handlers.
+
+    Events are read in (txid, id) order, limited to transactions older than
+    the oldest one still running, so nothing can later commit behind the
+    checkpoint. The checkpoint only advances after every handler of the batch
+    succeeded, which makes delivery at-least-once; handlers are idempotent.
+    """
+
+    def __init__(self, name: str = 'default', batch_size: int = 500) -> None:
+        self.name = name
+        self.batch_size = batch_size
+
+    def listen(self) -> None:
+        with connection.cursor() as cursor:
+            cursor.execute(f"LISTEN {OUTBOX_CHANNEL}")
+
+    def wait(self, timeout: float) -> bool:
+        """Block until an event is published or `timeout` seconds pass."""
+        connection.ensure_connection()
+        for _ in connection.connection.notifies(timeout=timeout, stop_after=1):
+            return True
+        return False
+
+    def process_batch(self) -> OutboxBatch:
+        start_time = time.perf_counter()
+        checkpoint, _ = OutboxCheckpoint.objects.get_or_create(consumer=self.name)
+        events = self._fetch(checkpoint)
+
+        if not events:
+            return OutboxBatch(0, checkpoint.last_txid, checkpoint.last_event_id)
+
+        ran = []
+        for name, (topics, handler) in get_handlers().items():
+            matching = [event for event in events if event.topic in topics]
+            if matching:
+                handler(matching)
+                ran.append(name)
+
+        last = events[-1]
+        with transaction.atomic():
+            OutboxCheckpoint.objects.filter(consumer=self.name).update(
+                last_txid=last.txid,
+                last_event_id=last.pk,
+            )
+
+        return OutboxBatch(
+            events=len(events),
+            last_txid=last.txid,
+            last_event_id=last.pk,
+            handlers=ran,
+            elapsed=time.perf_counter() - start_time,
+        )
+
+    def _fetch(self, checkpoint: OutboxCheckpoint) -> List[OutboxEvent]:
+        table_name = OutboxEvent._meta.db_table
+        return list(
+            OutboxEvent.objects.raw(
+                f"""
+                SELECT id, txid, topic, object_ids, payload, created_at
+                FROM {table_name}
+                WHERE (txid, id) > (%s, %s)
+                  AND txid < pg_snapshot_xmin(pg_current_snapshot())::text::bigint
+                ORDER BY txid, id
+                LIMIT %s
+                """,
+                [checkpoint.last_txid, checkpoint.last_event_id, self.batch_size],
+            )
+        )
+
+    @staticmethod
+    def purge(older_than) -> int:
+        """Delete events every consumer has processed and that are older than `older_than`."""
+        table_name = OutboxEvent._meta.db_table
+        checkpoints_table = OutboxCheckpoint._meta.db_table
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                DELETE FROM {table_name} e
+                WHERE e.created_at < %s
+                  AND EXISTS (SELECT 1 FROM {checkpoints_table})
+                  AND NOT EXISTS (
+                      SELECT 1 FROM {checkpoints_table} c
+                      WHERE (e.txid, e.id) > (c.last_txid, c.last_event_id)
+                  )
+                """,
+                [older_than],
+            )
+            return cursor.rowcount
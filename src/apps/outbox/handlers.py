@@ -0,0 +1,101 @@
+from collections import OrderedDict
+from typing import Callable, Dict, List, Sequence
+
+from django.db import connection
+
+from apps.catalog.pgviews import GenderFilterOptionsMV, PriceRangesMV
+from apps.favorites.models import FavoriteCollection, FavoriteItem
+
+from .models import OutboxEvent
+from .publisher import INVENTORY_CHANGED, PRODUCT_CHANGED
+
+SUMMARIES_BATCH_SIZE = 1000
+
+_handlers: "OrderedDict[str, tuple]" = OrderedDict()
+
+
+def handles(*topics: str):
+    """
+    Register an invalidation handler for `topics`.
+
+    Handlers run in registration order and receive every matching event of a
+    consumer batch at once (in commit order), so repeated changes collapse into
+    a single refresh.
+    """
+    def decorator(func: Callable[[List[OutboxEvent]], None]):
+        _handlers[func.__name__] = (frozenset(topics), func)
+        return func
+
+    return decorator
+
+
+def get_handlers() -> Dict[str, tuple]:
+    return _handlers
+
+
+def _touches_prices(events: Sequence[OutboxEvent]) -> bool:
+    return any(
+        event.topic == PRODUCT_CHANGED or event.payload.get('prices', True)
+        for event in events
+    )
+
+
+@handles(PRODUCT_CHANGED, INVENTORY_CHANGED)
+def refresh_price_ranges(events: List[OutboxEvent]) -> None:
+    if _touches_prices(events):
+        PriceRangesMV.refresh(concurrently=True)
+
+
+@handles(PRODUCT_CHANGED)
+def refresh_gender_options(events: List[OutboxEvent]) -> None:
+    GenderFilterOptionsMV.refresh(concurrently=True)
+
+
+@handles(PRODUCT_CHANGED, INVENTORY_CHANGED)
+def refresh_favorite_summaries(events: List[OutboxEvent]) -> None:
+    """Re-price and re-cover the favorite collections holding changed products."""
+    events = [event for event in events if event.topic == PRODUCT_CHANGED or event.payload.get('prices', True)]
+    if not events:
+        return
+
+    product_ids = set()
+    for event in events:
+        if not event.object_ids:
+            product_ids = None
+            break
+        product_ids.update(event.object_ids)
+
+    for collection_ids in _iter_collection_batches(product_ids):
+        FavoriteCollection.refresh_summaries(collection_ids)
+
+
+def _iter_collection_batches(product_ids):
+    """Yield ids of collections holding `product_ids` (every collection for None) in batches."""
+    items_table = FavoriteItem._meta.db_table
+    collections_table = FavoriteCollection._meta.db_table
+    after_id = 0
+
+    while True:
+        with connection.cursor() as cursor:
+            if product_ids is None:
+                cursor.execute(
+                    f"SELECT id FROM {collections_table} WHERE id > %s ORDER BY id LIMIT %s",
+                    [after_id, SUMMARIES_BATCH_SIZE],
+                )
+            else:
+                cursor.execute(
+                    f"""
+                    SELECT DISTINCT collection_id FROM {items_table}
+                    WHERE product_id = ANY(%s) AND collection_id > %s
+                    ORDER BY collection_id
+                    LIMIT %s
+                    """,
+                    [sorted(product_ids), after_id, SUMMARIES_BATCH_SIZE],
+                )
+            collection_ids = [row[0] for row in cursor.fetchall()]
+
+        if not collection_ids:
+            return
+
+        yield collection_ids
+        after_id = collection_ids[-1]
@@ -0,0 +1,90 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from apps.outbox.consumer import OutboxConsumer
+
+
+class Command(BaseCommand):
+    help = (
+        "Deliver outbox change events to the invalidation handlers (materialized views, favorite summaries). "
+        "Uses LISTEN/NOTIFY, so connect directly to PostgreSQL rather than through a transaction-pooling PgBouncer."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--consumer",
+            dest="consumer",
+            type=str,
+            default="default",
+            help="Checkpoint name of this consumer (default: default)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            dest="batch_size",
+            type=int,
+            default=500,
+            help="Maximum number of events handed to handlers at once (default: 500)",
+        )
+        parser.add_argument(
+            "--idle-timeout",
+            dest="idle_timeout",
+            type=float,
+            default=5.0,
+            help="Seconds to wait for a notification before re-checking the outbox (default: 5.0)",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            dest="once",
+            default=False,
+            help="Drain pending events and exit instead of waiting for new ones.",
+        )
+        parser.add_argument(
+            "--purge-after-hours",
+            dest="purge_after_hours",
+            type=float,
+            default=None,
+            help="Delete events processed by every consumer and older than this many hours.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        idle_timeout = options["idle_timeout"]
+
+        if batch_size <= 0:
+            raise CommandError("batch-size must be positive")
+        if idle_timeout <= 0:
+            raise CommandError("idle-timeout must be positive")
+
+        consumer = OutboxConsumer(name=options["consumer"], batch_size=batch_size)
+
+        if not options["once"]:
+            consumer.listen()
+            self.stdout.write(self.style.NOTICE(f"Consuming outbox events as '{consumer.name}'..."))
+
+        total_events = 0
+        while True:
+            batch = consumer.process_batch()
+            total_events += batch.events
+
+            if batch.events:
+                self.stdout.write(
+                    f"- {batch.events} events up to ({batch.last_txid}, {batch.last_event_id}) "
+                    f"-> {', '.join(batch.handlers) or 'no handlers'} in {batch.elapsed:.3f}s"
+                )
+                continue
+
+            if options["purge_after_hours"] is not None:
+                older_than = timezone.now() - timedelta(hours=options["purge_after_hours"])
+                purged = consumer.purge(older_than)
+                if purged:
+                    self.stdout.write(f"- Purged {purged:,} processed events")
+
+            if options["once"]:
+                break
+
+            consumer.wait(idle_timeout)
+
+        self.stdout.write(self.style.SUCCESS(f"Outbox drained: {total_events:,} events delivered."))
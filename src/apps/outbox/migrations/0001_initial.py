@@ -0,0 +1,39 @@
+# Generated by Django 5.2.5 on 2026-10-19 16:00
+
+import django.contrib.postgres.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OutboxCheckpoint',
+            fields=[
+                ('consumer', models.CharField(help_text='Consumer name', max_length=64, primary_key=True, serialize=False)),
+                ('last_txid', models.BigIntegerField(default=0)),
+                ('last_event_id', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='OutboxEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('txid', models.BigIntegerField(help_text='pg_current_xact_id() of the transaction that recorded the event')),
+                ('topic', models.CharField(help_text='Event topic, e.g. inventory.changed', max_length=64)),
+                ('object_ids', django.contrib.postgres.fields.ArrayField(base_field=models.BigIntegerField(), blank=True, default=list, help_text='Ids of the changed objects; empty when a bulk path changed an unknown set', size=None)),
+                ('payload', models.JSONField(blank=True, default=dict, help_text='Topic specific details (changed fields, row counts, ...)')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['txid', 'id'],
+                'indexes': [models.Index(fields=['txid', 'id'], name='idx_outbox_txid_id')],
+            },
+        ),
+    ]
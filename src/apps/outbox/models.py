@@ -0,0 +1,56 @@
+from django.contrib.postgres.fields import ArrayField
+from django.db import models
+
+
+class OutboxEvent(models.Model):
+    """
+    A change event written in the same transaction as the change itself.
+
+    `txid` is the writing transaction id; consumers read events in
+    (txid, id) order below the oldest running transaction so an event can
+    never be committed behind a consumer's checkpoint.
+    """
+    txid = models.BigIntegerField(
+        help_text="pg_current_xact_id() of the transaction that recorded the event"
+    )
+    topic = models.CharField(
+        max_length=64,
+        help_text="Event topic, e.g. inventory.changed"
+    )
+    object_ids = ArrayField(
+        models.BigIntegerField(),
+        default=list,
+        blank=True,
+        help_text="Ids of the changed objects; empty when a bulk path changed an unknown set"
+    )
+    payload = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text="Topic specific details (changed fields, row counts, ...)"
+    )
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['txid', 'id']
+        indexes = [
+            models.Index(fields=['txid', 'id'], name='idx_outbox_txid_id'),
+        ]
+
+    def __str__(self):
+        return f"{self.topic}#{self.pk} ({len(self.object_ids)} objects)"
+
+
+class OutboxCheckpoint(models.Model):
+    consumer = models.CharField(
+        max_length=64,
+        primary_key=True,
+        help_text="Consumer name"
+    )
+    last_txid = models.BigIntegerField(default=0)
+    last_event_id = models.BigIntegerField(default=0)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.consumer} @ ({self.last_txid}, {self.last_event_id})"
@@ -0,0 +1,46 @@
+import json
+from typing import Iterable, Optional
+
+from django.db import connection
+
+from .models import OutboxEvent
+
+OUTBOX_CHANNEL = 'outbox_events'
+
+PRODUCT_CHANGED = 'product.changed'
+INVENTORY_CHANGED = 'inventory.changed'
+RATING_CHANGED = 'rating.changed'
+FAVORITE_CHANGED = 'favorite.changed'
+
+ALL_TOPICS = [PRODUCT_CHANGED, INVENTORY_CHANGED, RATING_CHANGED, FAVORITE_CHANGED]
+
+
+def publish(topic: str, object_ids: Iterable[int] = (), payload: Optional[dict] = None) -> None:
+    """
+    Record a change event on the current connection.
+
+    Call it inside the transaction that makes the change, so the event
+    commits or rolls back together with it. Bulk paths publish one event per
+    batch; an empty `object_ids` means "an unknown set of objects changed".
+    Consumers listening on OUTBOX_CHANNEL are woken up when it commits.
+    """
+    table_name = OutboxEvent._meta.db_table
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            WITH recorded AS (
+                INSERT INTO {table_name} (txid, topic, object_ids, payload, created_at)
+                VALUES (pg_current_xact_id()::text::bigint, %s, %s::bigint[], %s::jsonb, now())
+                RETURNING id
+            )
+            SELECT pg_notify(%s, %s) FROM recorded
+            """,
+            [
+                topic,
+                sorted({int(object_id) for object_id in object_ids}),
+                json.dumps(payload or {}),
+                OUTBOX_CHANNEL,
+                topic,
+            ],
+        )
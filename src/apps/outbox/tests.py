@@ -0,0 +1,159 @@
+import threading
+from datetime import timedelta
+from unittest import mock
+
+from django.db import connection, transaction
+from django.test import TransactionTestCase
+from django.utils import timezone
+
+from .consumer import OutboxConsumer
+from .models import OutboxCheckpoint, OutboxEvent
+from .publisher import FAVORITE_CHANGED, INVENTORY_CHANGED, PRODUCT_CHANGED, publish
+
+
+class RecordingHandler:
+
+    def __init__(self, fail=False):
+        self.calls = []
+        self.fail = fail
+
+    def __call__(self, events):
+        self.calls.append([event.pk for event in events])
+        if self.fail:
+            raise RuntimeError("handler failed")
+
+
+def consume_with(handlers, **kwargs):
+    """Run one consumer batch with `handlers` ({name: (topics, handler)}) instead of the registered ones."""
+    with mock.patch('apps.outbox.consumer.get_handlers', return_value=handlers):
+        return OutboxConsumer(**kwargs).process_batch()
+
+
+# The consumer only reads transactions older than the oldest running one, so
+# these tests need real commits rather than TestCase's wrapping transaction.
+class OutboxPublishTests(TransactionTestCase):
+
+    def test_publish_records_event_in_current_transaction(self):
+        with transaction.atomic():
+            publish(INVENTORY_CHANGED, [3, 1, 3, 2], {'prices': False})
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT pg_current_xact_id()::text::bigint")
+                txid = cursor.fetchone()[0]
+
+        event = OutboxEvent.objects.get()
+        self.assertEqual(event.topic, INVENTORY_CHANGED)
+        self.assertEqual(event.object_ids, [1, 2, 3])
+        self.assertEqual(event.payload, {'prices': False})
+        self.assertEqual(event.txid, txid)
+
+    def test_rolled_back_change_publishes_nothing(self):
+        with self.assertRaises(RuntimeError):
+            with transaction.atomic():
+                publish(PRODUCT_CHANGED, [1])
+                raise RuntimeError("rollback")
+
+        self.assertFalse(OutboxEvent.objects.exists())
+
+
+class OutboxConsumerTests(TransactionTestCase):
+
+    def test_events_are_delivered_in_commit_order_per_topic(self):
+        with transaction.atomic():
+            publish(PRODUCT_CHANGED, [1])
+            publish(FAVORITE_CHANGED, [2])
+        with transaction.atomic():
+            publish(PRODUCT_CHANGED, [3])
+        event_ids = list(OutboxEvent.objects.order_by('txid', 'id').values_list('pk', flat=True))
+
+        products, favorites = RecordingHandler(), RecordingHandler()
+        batch = consume_with({
+            'products': (frozenset({PRODUCT_CHANGED}), products),
+            'favorites': (frozenset({FAVORITE_CHANGED}), favorites),
+        })
+
+        self.assertEqual(batch.events, 3)
+        self.assertEqual(batch.handlers, ['products', 'favorites'])
+        self.assertEqual(products.calls, [[event_ids[0], event_ids[2]]])
+        self.assertEqual(favorites.calls, [[event_ids[1]]])
+        self.assertEqual(batch.last_event_id, event_ids[2])
+
+    def test_checkpoint_advances_and_batches_are_limited(self):
+        for object_id in range(3):
+            with transaction.atomic():
+                publish(PRODUCT_CHANGED, [object_id])
+        handler = RecordingHandler()
+        handlers = {'products': (frozenset({PRODUCT_CHANGED}), handler)}
+
+        batches = [consume_with(handlers, batch_size=2) for _ in range(3)]
+
+        self.assertEqual([batch.events for batch in batches], [2, 1, 0])
+        self.assertEqual([len(call) for call in handler.calls], [2, 1])
+        checkpoint = OutboxCheckpoint.objects.get(consumer='default')
+        self.assertEqual(checkpoint.last_event_id, OutboxEvent.objects.order_by('txid', 'id').last().pk)
+
+    def test_failed_handler_keeps_checkpoint(self):
+        with transaction.atomic():
+            publish(PRODUCT_CHANGED, [1])
+
+        with self.assertRaises(RuntimeError):
+            consume_with({'products': (frozenset({PRODUCT_CHANGED}), RecordingHandler(fail=True))})
+
+        handler = RecordingHandler()
+        batch = consume_with({'products': (frozenset({PRODUCT_CHANGED}), handler)})
+        self.assertEqual(batch.events, 1)
+        self.assertEqual(len(handler.calls), 1)
+
+    def test_events_behind_a_running_transaction_wait_for_it(self):
+        xid_assigned = threading.Event()
+        may_commit = threading.Event()
+        errors = []
+
+        def slow_writer():
+            try:
+                with transaction.atomic():
+                    with connection.cursor() as cursor:
+                        cursor.execute("SELECT pg_current_xact_id()")
+                    xid_assigned.set()
+                    may_commit.wait(timeout=10)
+                    publish(PRODUCT_CHANGED, [1])
+            except Exception as exc:
+                errors.append(exc)
+            finally:
+                xid_assigned.set()
+                connection.close()
+
+        writer = threading.Thread(target=slow_writer)
+        writer.start()
+        try:
+            self.assertTrue(xid_assigned.wait(timeout=10))
+            with transaction.atomic():
+                publish(PRODUCT_CHANGED, [2])
+
+            handler = RecordingHandler()
+            handlers = {'products': (frozenset({PRODUCT_CHANGED}), handler)}
+            self.assertEqual(consume_with(handlers).events, 0)
+        finally:
+            may_commit.set()
+            writer.join()
+        self.assertEqual(errors, [])
+
+        batch = consume_with(handlers)
+
+        older, newer = OutboxEvent.objects.order_by('txid', 'id')
+        self.assertEqual((older.object_ids, newer.object_ids), ([1], [2]))
+        self.assertGreater(older.pk, newer.pk)
+        self.assertEqual(batch.events, 2)
+        self.assertEqual(handler.calls, [[older.pk, newer.pk]])
+
+    def test_purge_keeps_unprocessed_events(self):
+        with transaction.atomic():
+            publish(PRODUCT_CHANGED, [1])
+        consume_with({})
+        with transaction.atomic():
+            publish(PRODUCT_CHANGED, [2])
+        OutboxEvent.objects.update(created_at=timezone.now() - timedelta(days=1))
+
+        purged = OutboxConsumer.purge(timezone.now() - timedelta(hours=1))
+
+        self.assertEqual(purged, 1)
+        self.assertEqual(list(OutboxEvent.objects.values_list('object_ids', flat=True)), [[2]])
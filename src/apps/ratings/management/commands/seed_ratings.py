@@ -80,6 +80,13 @@ class Command(BaseCommand):
             default=False,
             help="Do not drop indexes or apply PostgreSQL optimizations.",
         )
+        parser.add_argument(
+            "--seed",
+            dest="seed",
+            type=int,
+            default=None,
+            help="Seed for the random generator, to reproduce a run (default: random)",
+        )
 
     def handle(self, *args, **options):
         coverage = options["coverage"]
@@ -148,7 +155,7 @@ class Command(BaseCommand):
         start_time = time.perf_counter()
 
         generation_error: DatabaseError | None = None
-        generator = RatingsGenerator(batch_size=batch_size)
+        generator = RatingsGenerator(batch_size=batch_size, seed=options["seed"])
 
         try:
             generator.generate_all_ratings(
@@ -2,6 +2,8 @@ from django.db.models import F, Sum, Count
 from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 
+from apps.outbox.publisher import RATING_CHANGED, publish
+
 from .models import Rating
 
 
@@ -22,6 +24,8 @@ def rating_saved(sender, instance, created, **kwargs):
         product.ratings_count = aggregates['ratings_count'] or 0
         product.save(update_fields=['ratings_sum', 'ratings_count'])
 
+    publish(RATING_CHANGED, [product.pk])
+
 
 @receiver(post_delete, sender=Rating)
 def rating_deleted(sender, instance, **kwargs):
@@ -29,3 +33,4 @@ def rating_deleted(sender, instance, **kwargs):
     product.ratings_sum = F('ratings_sum') - instance.score
     product.ratings_count = F('ratings_count') - 1
     product.save(update_fields=['ratings_sum', 'ratings_count'])
+    publish(RATING_CHANGED, [product.pk])
@@ -1,6 +1,8 @@
 from django import template
 from django.urls import reverse
 
+from apps.catalog.engagement import UserEngagement
+
 register = template.Library()
 
 
@@ -29,6 +31,7 @@ def rating_stars(
 
     request = context['request']
     user = request.user
+    UserEngagement.for_request(request).bind(product)
     user_rated = product.is_rated_by(user)
     user_score = product.get_user_rating(user)
 
@@ -77,6 +80,7 @@ def likes_dislikes(
 
     request = context['request']
     user = request.user
+    UserEngagement.for_request(request).bind(product)
 
     user_liked = product.is_liked_by(user)
     user_disliked = product.is_disliked_by(user)
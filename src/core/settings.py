@@ -34,6 +34,7 @@ else:
     DATASETS_DIR = Path(DATASETS_DIR_ENV)
     IMAGES_DATASET_CSV = DATASETS_DIR / 'images.csv'
     PRODUCTS_DATASET_CSV = DATASETS_DIR / 'products.csv'
+    CATALOG_FRAMES_CACHE_DIR = DATASETS_DIR / '.etl_cache'
 
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/5.2/howto/deployment/checklist/
@@ -82,6 +83,8 @@ INSTALLED_APPS = [
     'apps.catalog',
     'apps.inventories',
     'apps.favorites',
+    'apps.orders',
+    'apps.outbox',
     'apps.ratings'
 ]
 
@@ -251,3 +254,12 @@ CART_COOKIE_AGE = int(CART_TOKEN_LIFETIME.total_seconds())
 CART_COOKIE_SECURE = True
 CART_COOKIE_HTTPONLY = True
 CART_COOKIE_SAMESITE = "Lax"
+
+# Stock reservations (default hold lifetime for ProductInventory.reserve_many)
+
+STOCK_RESERVATION_TTL = timedelta(minutes=30)
+
+# Product views counter (write-behind buffer flushed into product_view_stats)
+
+PRODUCT_VIEWS_FLUSH_INTERVAL = 30.0
+PRODUCT_VIEWS_BUFFER_MAX_SIZE = 10000
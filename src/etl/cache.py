@@ -0,0 +1,125 @@
+import hashlib
+import json
+import shutil
+import tempfile
+from dataclasses import fields
+from pathlib import Path
+from typing import Callable, Optional, Tuple, Union
+
+import pandas as pd
+
+from etl.dto import CatalogFramesDTO
+
+try:
+    import pyarrow  # noqa: F401
+except ImportError:  # pragma: no cover - pyarrow is a declared dependency
+    pyarrow = None
+
+# Bump when the columnar transform changes its output, so old caches are ignored.
+FRAMES_CACHE_VERSION = 1
+
+MANIFEST_NAME = "manifest.json"
+
+
+class CatalogFramesCacheError(Exception):
+    pass
+
+
+class CatalogFramesCache:
+    """
+    On-disk cache of the columnar transform output, keyed by the source CSVs.
+
+    The key is a SHA-256 over the bytes of both CSV files and
+    FRAMES_CACHE_VERSION, so any edit to the feed (or to the transform) misses
+    the cache. Each entity of CatalogFramesDTO is stored as its own Parquet
+    file and read back memory-mapped. pyarrow is required; there is no
+    pickle fallback, since unpickling files from a shared dataset directory
+    would execute whatever they contain.
+
+    A cache directory only counts once its manifest is written, and it is
+    built in a temporary sibling directory and renamed into place, so an
+    interrupted run never leaves a half-written cache behind.
+    """
+
+    def __init__(self, cache_dir: Union[str, Path], styles_path: Union[str, Path], images_path: Union[str, Path]) -> None:
+        if pyarrow is None:
+            raise CatalogFramesCacheError(
+                "The catalog dataset cache requires pyarrow; install the project dependencies or disable the cache"
+            )
+        self._cache_dir = Path(cache_dir)
+        self._styles_path = Path(styles_path)
+        self._images_path = Path(images_path)
+        self._checksum: Optional[str] = None
+
+    @property
+    def checksum(self) -> str:
+        if self._checksum is None:
+            digest = hashlib.sha256(f"catalog-frames-v{FRAMES_CACHE_VERSION}".encode())
+            for path in (self._styles_path, self._images_path):
+                with path.open("rb") as source:
+                    for block in iter(lambda: source.read(1024 * 1024), b""):
+                        digest.update(block)
+                digest.update(b"\0")
+            self._checksum = digest.hexdigest()
+        return self._checksum
+
+    @property
+    def path(self) -> Path:
+        return self._cache_dir / f"{self.checksum[:32]}-parquet"
+
+    def get_or_build(self, build: Callable[[], CatalogFramesDTO], rebuild: bool = False) -> Tuple[CatalogFramesDTO, bool]:
+        """Return `(frames, hit)`; on a miss (or with `rebuild`) run `build` and store its result."""
+        if not rebuild:
+            frames = self.load()
+            if frames is not None:
+                return frames, True
+
+        frames = build()
+        self.store(frames)
+        return frames, False
+
+    def load(self) -> Optional[CatalogFramesDTO]:
+        path = self.path
+        manifest_path = path / MANIFEST_NAME
+        if not manifest_path.is_file():
+            return None
+
+        manifest = json.loads(manifest_path.read_text())
+        if manifest.get("checksum") != self.checksum:
+            return None
+
+        return CatalogFramesDTO(
+            **{name: self._read(path / file_name) for name, file_name in manifest["files"].items()}
+        )
+
+    def store(self, frames: CatalogFramesDTO) -> Path:
+        path = self.path
+        self._cache_dir.mkdir(parents=True, exist_ok=True)
+        staging_dir = Path(tempfile.mkdtemp(prefix=".tmp-", dir=self._cache_dir))
+
+        try:
+            files = {}
+            for entity in fields(CatalogFramesDTO):
+                file_name = f"{entity.name}.parquet"
+                self._write(getattr(frames, entity.name), staging_dir / file_name)
+                files[entity.name] = file_name
+
+            (staging_dir / MANIFEST_NAME).write_text(
+                json.dumps({"checksum": self.checksum, "version": FRAMES_CACHE_VERSION, "files": files})
+            )
+
+            shutil.rmtree(path, ignore_errors=True)
+            staging_dir.rename(path)
+        except BaseException:
+            shutil.rmtree(staging_dir, ignore_errors=True)
+            raise
+
+        return path
+
+    @staticmethod
+    def _read(file_path: Path) -> pd.DataFrame:
+        return pd.read_parquet(file_path, engine="pyarrow", memory_map=True)
+
+    @staticmethod
+    def _write(frame: pd.DataFrame, file_path: Path) -> None:
+        frame.to_parquet(file_path, engine="pyarrow", index=False)
@@ -1,6 +1,8 @@
 from dataclasses import dataclass, field
 from typing import List, Optional
 
+import pandas as pd
+
 
 @dataclass
 class MasterCategoryDTO:
@@ -62,3 +64,39 @@ class CatalogResultDTO:
     usage_types: List[UsageTypeDTO] = field(default_factory=list)
     products: List[ProductDTO] = field(default_factory=list)
     images: List[ImageDTO] = field(default_factory=list)
+
+
+PRODUCT_FRAME_COLUMNS = (
+    "product_id",
+    "gender",
+    "year",
+    "product_display_name",
+    "article_type",
+    "base_colour",
+    "season",
+    "usage",
+    "image_url",
+    "slug",
+)
+
+
+def _empty_frame(*columns: str) -> pd.DataFrame:
+    return pd.DataFrame({column: pd.Series(dtype="string") for column in columns})
+
+
+@dataclass
+class CatalogFramesDTO:
+    """
+    Columnar counterpart of CatalogResultDTO: one DataFrame per entity.
+
+    `products` carries the dimension names (article_type, base_colour,
+    season, usage) plus the joined image_url and the precomputed slug; the
+    loader maps names to foreign key ids column-wise.
+    """
+    master_categories: pd.DataFrame = field(default_factory=lambda: _empty_frame("name"))
+    sub_categories: pd.DataFrame = field(default_factory=lambda: _empty_frame("master_category", "name"))
+    article_types: pd.DataFrame = field(default_factory=lambda: _empty_frame("sub_category", "name"))
+    base_colours: pd.DataFrame = field(default_factory=lambda: _empty_frame("name"))
+    seasons: pd.DataFrame = field(default_factory=lambda: _empty_frame("name"))
+    usage_types: pd.DataFrame = field(default_factory=lambda: _empty_frame("name"))
+    products: pd.DataFrame = field(default_factory=lambda: _empty_frame(*PRODUCT_FRAME_COLUMNS))
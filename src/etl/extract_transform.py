@@ -1,5 +1,5 @@
 from pathlib import Path
-from typing import Tuple, Union
+from typing import Iterator, Tuple, Union
 
 import pandas as pd
 
@@ -13,8 +13,42 @@ from etl.dto import (
     ProductDTO,
     ImageDTO,
     CatalogResultDTO,
+    CatalogFramesDTO,
+    PRODUCT_FRAME_COLUMNS,
 )
 
+TEXT_COLUMNS = (
+    "gender",
+    "master_category",
+    "sub_category",
+    "article_type",
+    "base_colour",
+    "season",
+    "usage",
+    "product_display_name",
+)
+
+
+def normalize_text_column(series: pd.Series) -> pd.Series:
+    """Vectorized `_none_if_nan`: turn NaN and blank strings into <NA>."""
+    series = series.astype("string")
+    return series.mask(series.str.strip() == "")
+
+
+def slugify_series(series: pd.Series) -> pd.Series:
+    """Vectorized django.utils.text.slugify (allow_unicode=False) over a string column."""
+    return (
+        series.fillna("")
+        .astype("string")
+        .str.normalize("NFKD")
+        .str.encode("ascii", "ignore")
+        .str.decode("ascii")
+        .str.lower()
+        .str.replace(r"[^\w\s-]", "", regex=True)
+        .str.replace(r"[-\s]+", "-", regex=True)
+        .str.strip("-_")
+    )
+
 
 class CatalogCSVExtractTransformer:
     """Extract & Transform pipeline for products and images CSV files."""
@@ -28,9 +62,29 @@ class CatalogCSVExtractTransformer:
         styles_dataframe, images_dataframe = self._extract()
         return self._transform(styles_dataframe, images_dataframe)
 
+    def execute_columnar(self) -> CatalogFramesDTO:
+        """Run extract + columnar transform and return a CatalogFramesDTO."""
+        styles_dataframe, images_dataframe = self._extract()
+        return self.transform_columnar(styles_dataframe, images_dataframe)
+
+    def iter_columnar_chunks(self, chunksize: int) -> Iterator[CatalogFramesDTO]:
+        """
+        Stream the styles file in chunks of `chunksize` rows, each transformed column-wise.
+
+        Only the compact product_id -> image URL index is held for the whole
+        run; styles are never fully in memory. Dimension frames are per chunk,
+        so the loader has to resolve names it has not seen yet incrementally.
+        """
+        image_urls = self._image_urls(self._read_images())
+        for styles_chunk in self._read_styles(chunksize=chunksize):
+            yield self._transform_styles(styles_chunk, image_urls)
+
     def _extract(self) -> Tuple[pd.DataFrame, pd.DataFrame]:
         """Read raw CSV files."""
-        styles_dataframe = pd.read_csv(
+        return self._read_styles(), self._read_images()
+
+    def _read_styles(self, **kwargs):
+        return pd.read_csv(
             self._styles_path,
             skipinitialspace=True,
             dtype={
@@ -38,14 +92,17 @@ class CatalogCSVExtractTransformer:
                 "year": "Int64",
             },
             keep_default_na=True,
+            **kwargs,
         )
-        images_dataframe = pd.read_csv(
+
+    def _read_images(self) -> pd.DataFrame:
+        return pd.read_csv(
             self._images_path,
             skipinitialspace=True,
+            usecols=["filename", "link"],
             dtype={"filename": "string", "link": "string"},
             keep_default_na=True,
         )
-        return styles_dataframe, images_dataframe
 
     @staticmethod
     def _none_if_nan(value):
@@ -137,3 +194,63 @@ class CatalogCSVExtractTransformer:
             products=products,
             images=images,
         )
+
+    @classmethod
+    def transform_columnar(
+        cls, styles_dataframe: pd.DataFrame, images_dataframe: pd.DataFrame
+    ) -> CatalogFramesDTO:
+        """Normalize data column-wise; no per-row Python objects are built."""
+        return cls._transform_styles(styles_dataframe, cls._image_urls(images_dataframe))
+
+    @staticmethod
+    def _image_urls(images_dataframe: pd.DataFrame) -> pd.Series:
+        """First image URL per product id, as a Series indexed by product_id."""
+        product_ids = pd.to_numeric(
+            images_dataframe["filename"].str.split(".", n=1).str[0], errors="coerce"
+        ).astype("Int64")
+        images = pd.DataFrame({"product_id": product_ids, "image_url": images_dataframe["link"]})
+        images = images.dropna().drop_duplicates(subset="product_id", keep="first")
+        return images.set_index("product_id")["image_url"]
+
+    @staticmethod
+    def _transform_styles(styles_dataframe: pd.DataFrame, image_urls: pd.Series) -> CatalogFramesDTO:
+        styles = styles_dataframe.copy()
+        for column in TEXT_COLUMNS:
+            if column in styles.columns:
+                styles[column] = normalize_text_column(styles[column])
+            else:
+                styles[column] = pd.Series(pd.NA, index=styles.index, dtype="string")
+
+        styles = styles[styles["product_id"].notna()]
+
+        def names(column: str) -> pd.DataFrame:
+            values = styles[column].dropna().drop_duplicates().sort_values(ignore_index=True)
+            return values.to_frame("name")
+
+        def pairs(parent: str, child: str) -> pd.DataFrame:
+            return (
+                styles[[parent, child]]
+                .dropna()
+                .drop_duplicates(ignore_index=True)
+                .rename(columns={child: "name"})
+            )
+
+        products = styles[
+            ["product_id", "gender", "year", "product_display_name", "article_type", "base_colour", "season", "usage"]
+        ].reset_index(drop=True)
+        products["image_url"] = products["product_id"].map(image_urls)
+
+        base_slug = slugify_series(products["product_display_name"])
+        products["slug"] = (
+            base_slug.mask(base_slug == "", "product") + "-" + products["product_id"].astype("string")
+        )
+
+        return CatalogFramesDTO(
+            master_categories=names("master_category"),
+            sub_categories=pairs("master_category", "sub_category"),
+            article_types=pairs("sub_category", "article_type"),
+            base_colours=names("base_colour"),
+            seasons=names("season"),
+            usage_types=names("usage"),
+            products=products[list(PRODUCT_FRAME_COLUMNS)].reset_index(drop=True),
+        )
@@ -1,6 +1,11 @@
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
 from typing import Dict, Iterable, List
 
-from django.db import transaction
+import pandas as pd
+from django.db import connection, transaction
 from django.utils.text import slugify
 from tqdm import tqdm
 
@@ -13,6 +18,7 @@ from apps.catalog.models import (
     UsageType,
     Product,
 )
+from apps.outbox.publisher import PRODUCT_CHANGED, publish
 from etl.dto import (
     MasterCategoryDTO,
     SubCategoryDTO,
@@ -23,7 +29,56 @@ from etl.dto import (
     ProductDTO,
     ImageDTO,
     CatalogResultDTO,
+    CatalogFramesDTO,
+    PRODUCT_FRAME_COLUMNS,
 )
+from etl.extract_transform import slugify_series
+
+# Feed row hash over a staging row `s`. Dimensions are hashed by name, so the
+# backfill in catalog migration 0019 can reproduce it from the stored rows.
+PRODUCT_CONTENT_HASH_SQL = """
+    md5(ROW(
+        s.product_id, s.gender, s.year, s.product_display_name, s.image_url,
+        s.article_type, s.base_colour, s.season, s.usage
+    )::text)
+"""
+
+PRODUCT_STAGING_COLUMNS = [
+    ("product_id", "int4"),
+    ("gender", "text"),
+    ("year", "int2"),
+    ("product_display_name", "text"),
+    ("image_url", "text"),
+    ("slug", "text"),
+    ("article_type", "text"),
+    ("base_colour", "text"),
+    ("season", "text"),
+    ("usage", "text"),
+]
+
+PRODUCT_INSERT_COLUMNS = (
+    "product_id, gender, year, product_display_name, image_url, slug, "
+    "article_type_id, base_colour_id, season_id, usage_type_id, content_hash"
+)
+
+
+@dataclass
+class DimensionMaps:
+    """Dimension name -> instance caches, shared across the chunks of one load."""
+    master_categories: Dict[str, MasterCategory] = field(default_factory=dict)
+    sub_categories: Dict[str, SubCategory] = field(default_factory=dict)
+    article_types: Dict[str, ArticleType] = field(default_factory=dict)
+    base_colours: Dict[str, BaseColour] = field(default_factory=dict)
+    seasons: Dict[str, Season] = field(default_factory=dict)
+    usage_types: Dict[str, UsageType] = field(default_factory=dict)
+
+
+@dataclass
+class _ProducerError:
+    exc: BaseException
+
+
+_END_OF_STREAM = object()
 
 
 class DjangoCatalogSeeder:
@@ -53,6 +108,117 @@ class DjangoCatalogSeeder:
                 images_map,
             )
 
+    def seed_frames(self, frames: CatalogFramesDTO) -> None:
+        """
+        Seed from the columnar transform output.
+
+        Dimensions are small and go through the same bulk_create helpers as
+        `seed`. Products never become model instances: foreign key ids are
+        mapped column-wise and each batch is inserted from column arrays with
+        a single INSERT ... SELECT FROM unnest(...).
+        """
+        with transaction.atomic():
+            self._seed_frame(frames, DimensionMaps())
+
+    def seed_stream(self, chunks: Iterable[CatalogFramesDTO], queue_size: int = 2) -> int:
+        """
+        Seed chunk by chunk while the next chunks are still being parsed.
+
+        `chunks` is consumed by a producer thread (CSV parsing and the
+        columnar transform) and handed over through a queue of at most
+        `queue_size` chunks, so memory stays bounded by the chunk size. The
+        calling thread owns the database connection and commits every chunk
+        in its own transaction; dimension ids are cached across chunks and
+        only names not seen before are inserted. Returns the number of
+        product rows processed.
+        """
+        pipeline: queue.Queue = queue.Queue(maxsize=queue_size)
+        stop = threading.Event()
+
+        def put(item) -> bool:
+            while not stop.is_set():
+                try:
+                    pipeline.put(item, timeout=0.5)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def produce() -> None:
+            try:
+                for frames in chunks:
+                    if not put(frames):
+                        return
+            except BaseException as exc:
+                put(_ProducerError(exc))
+            finally:
+                put(_END_OF_STREAM)
+
+        producer = threading.Thread(target=produce, name="catalog-etl-producer", daemon=True)
+        producer.start()
+
+        maps = DimensionMaps()
+        rows = 0
+        try:
+            with tqdm(desc="Stream Products", unit="rows") as progress:
+                while True:
+                    item = pipeline.get()
+                    if item is _END_OF_STREAM:
+                        break
+                    if isinstance(item, _ProducerError):
+                        raise item.exc
+
+                    with transaction.atomic():
+                        self._seed_frame(item, maps, show_progress=False)
+                    rows += len(item.products)
+                    progress.update(len(item.products))
+        finally:
+            stop.set()
+            producer.join()
+
+        return rows
+
+    def _seed_frame(self, frames: CatalogFramesDTO, maps: DimensionMaps, show_progress: bool = True) -> None:
+        masters = [name for name in frames.master_categories["name"] if name not in maps.master_categories]
+        if masters:
+            maps.master_categories.update(
+                self._seed_master_categories([MasterCategoryDTO(name=name) for name in masters])
+            )
+
+        subs = [
+            SubCategoryDTO(master_category=row.master_category, name=row.name)
+            for row in frames.sub_categories.itertuples(index=False)
+            if row.name not in maps.sub_categories
+        ]
+        if subs:
+            maps.sub_categories.update(self._seed_sub_categories(subs, maps.master_categories))
+
+        article_types = [
+            ArticleTypeDTO(sub_category=row.sub_category, name=row.name)
+            for row in frames.article_types.itertuples(index=False)
+            if row.name not in maps.article_types
+        ]
+        if article_types:
+            maps.article_types.update(self._seed_article_types(article_types, maps.sub_categories))
+
+        for column, cache, seed_func, dto_class in (
+            ("base_colours", maps.base_colours, self._seed_base_colours, BaseColourDTO),
+            ("seasons", maps.seasons, self._seed_seasons, SeasonDTO),
+            ("usage_types", maps.usage_types, self._seed_usage_types, UsageTypeDTO),
+        ):
+            names = [name for name in getattr(frames, column)["name"] if name not in cache]
+            if names:
+                cache.update(seed_func([dto_class(name=name) for name in names]))
+
+        self._seed_product_frame(
+            frames.products,
+            maps.article_types,
+            maps.base_colours,
+            maps.seasons,
+            maps.usage_types,
+            show_progress=show_progress,
+        )
+
     def _seed_master_categories(
         self, items: Iterable[MasterCategoryDTO]
     ) -> Dict[str, MasterCategory]:
@@ -180,3 +346,276 @@ class DjangoCatalogSeeder:
         for i in tqdm(range(0, len(to_create), self._batch_size), desc="Bulk insert Products"):
             batch = to_create[i : i + self._batch_size]
             Product.objects.bulk_create(batch, batch_size=self._batch_size, ignore_conflicts=True)
+            publish(PRODUCT_CHANGED, payload={'source': 'seed_catalog', 'rows': len(batch)})
+
+    def _seed_product_frame(
+        self,
+        products: pd.DataFrame,
+        article_type_map: Dict[str, ArticleType],
+        base_colour_map: Dict[str, BaseColour],
+        season_map: Dict[str, Season],
+        usage_type_map: Dict[str, UsageType],
+        show_progress: bool = True,
+    ) -> None:
+        def ids(column: str, mapping: Dict[str, object]) -> pd.Series:
+            return products[column].map({name: obj.pk for name, obj in mapping.items()}).astype("Int64")
+
+        columns = pd.DataFrame(
+            {
+                "product_id": products["product_id"].astype("Int64"),
+                "gender": products["gender"],
+                "year": products["year"].astype("Int64"),
+                "product_display_name": products["product_display_name"],
+                "image_url": products["image_url"],
+                "slug": products["slug"],
+                "article_type_id": ids("article_type", article_type_map),
+                "base_colour_id": ids("base_colour", base_colour_map),
+                "season_id": ids("season", season_map),
+                "usage_type_id": ids("usage", usage_type_map),
+                # Dimension names only feed the content hash, like the COPY loader's staging rows.
+                "article_type": products["article_type"],
+                "base_colour": products["base_colour"],
+                "season": products["season"],
+                "usage": products["usage"],
+            }
+        )
+        columns = columns.astype(object).where(columns.notna(), None)
+
+        sql = f"""
+            INSERT INTO {Product._meta.db_table} ({PRODUCT_INSERT_COLUMNS}, ratings_sum, ratings_count, created_at, updated_at)
+            SELECT s.product_id, s.gender, s.year, s.product_display_name, s.image_url, s.slug,
+                   s.article_type_id, s.base_colour_id, s.season_id, s.usage_type_id,
+                   {PRODUCT_CONTENT_HASH_SQL}, 0, 0, now(), now()
+            FROM unnest(
+                %s::integer[], %s::text[], %s::smallint[], %s::text[], %s::text[], %s::text[],
+                %s::bigint[], %s::bigint[], %s::bigint[], %s::bigint[],
+                %s::text[], %s::text[], %s::text[], %s::text[]
+            ) AS s (
+                product_id, gender, year, product_display_name, image_url, slug,
+                article_type_id, base_colour_id, season_id, usage_type_id,
+                article_type, base_colour, season, usage
+            )
+            ON CONFLICT DO NOTHING
+        """
+
+        with connection.cursor() as cursor:
+            batch_starts = range(0, len(columns), self._batch_size)
+            for start in tqdm(batch_starts, desc="Bulk insert Products (columnar)", disable=not show_progress):
+                batch = columns.iloc[start : start + self._batch_size]
+                cursor.execute(sql, [batch[name].tolist() for name in batch.columns])
+                publish(PRODUCT_CHANGED, payload={'source': 'seed_catalog', 'rows': len(batch)})
+
+
+@dataclass
+class CopyLoadStats:
+    table: str
+    staged: int = 0
+    inserted: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.staged / self.elapsed if self.elapsed else 0.0
+
+
+class CopyCatalogSeeder(DjangoCatalogSeeder):
+    """
+    Seed the columnar transform output with binary COPY instead of INSERTs.
+
+    Every entity is copied into an ON COMMIT DROP staging table and merged
+    with one INSERT ... SELECT ... ON CONFLICT DO NOTHING. Foreign keys are
+    resolved by joining on names in SQL, and dimension slugs get the same
+    `-2`, `-3` suffixes AutoSlugField would give them. `seed_frames` and
+    `seed_stream` work unchanged, and `seed` converts the row DTOs to frames
+    first; per-table timings accumulate in `stats`.
+    """
+
+    def __init__(self, batch_size: int = 5000) -> None:
+        super().__init__(batch_size=batch_size)
+        self.stats: Dict[str, CopyLoadStats] = {}
+
+    def seed(self, dto: CatalogResultDTO) -> None:
+        self.seed_frames(self.frames_from_result(dto))
+
+    @staticmethod
+    def frames_from_result(dto: CatalogResultDTO) -> CatalogFramesDTO:
+        """Columnar view of the row transform output, with the slugs and image URLs `_seed_products` would use."""
+        def frame(items, columns) -> pd.DataFrame:
+            return pd.DataFrame(
+                {column: pd.Series([getattr(item, column) for item in items], dtype="string") for column in columns}
+            )
+
+        images_map = DjangoCatalogSeeder._build_images_map(dto.images)
+        products = frame(
+            dto.products,
+            ["gender", "product_display_name", "article_type", "base_colour", "season", "usage"],
+        )
+        products["product_id"] = pd.Series([item.product_id for item in dto.products], dtype="Int64")
+        products["year"] = pd.Series([item.year for item in dto.products], dtype="Int64")
+        products["image_url"] = pd.Series([images_map.get(item.product_id) for item in dto.products], dtype="string")
+        products["slug"] = pd.Series(
+            [f"{slugify(item.product_display_name or '') or 'product'}-{item.product_id}" for item in dto.products],
+            dtype="string",
+        )
+
+        return CatalogFramesDTO(
+            master_categories=frame(dto.master_categories, ["name"]),
+            sub_categories=frame(dto.sub_categories, ["master_category", "name"]),
+            article_types=frame(dto.article_types, ["sub_category", "name"]),
+            base_colours=frame(dto.base_colours, ["name"]),
+            seasons=frame(dto.seasons, ["name"]),
+            usage_types=frame(dto.usage_types, ["name"]),
+            products=products[list(PRODUCT_FRAME_COLUMNS)],
+        )
+
+    def _seed_frame(self, frames: CatalogFramesDTO, maps: DimensionMaps, show_progress: bool = True) -> None:
+        master_table = MasterCategory._meta.db_table
+        sub_table = SubCategory._meta.db_table
+
+        with connection.cursor() as cursor:
+            self._load_dimension(
+                cursor, MasterCategory, frames.master_categories,
+                staging_columns=[("name", "text")],
+                select_sql="SELECT s.name, s.base_slug FROM {staging} s",
+                key_columns=["name"],
+            )
+            self._load_dimension(
+                cursor, SubCategory, frames.sub_categories,
+                staging_columns=[("master_category", "text"), ("name", "text")],
+                select_sql=f"""
+                    SELECT m.id AS master_category_id, s.name, s.base_slug
+                    FROM {{staging}} s
+                    JOIN {master_table} m ON m.name = s.master_category
+                """,
+                key_columns=["master_category_id", "name"],
+            )
+            self._load_dimension(
+                cursor, ArticleType, frames.article_types,
+                staging_columns=[("sub_category", "text"), ("name", "text")],
+                select_sql=f"""
+                    SELECT sc.id AS sub_category_id, s.name, s.base_slug
+                    FROM {{staging}} s
+                    JOIN (SELECT name, MIN(id) AS id FROM {sub_table} GROUP BY name) sc
+                      ON sc.name = s.sub_category
+                """,
+                key_columns=["sub_category_id", "name"],
+            )
+            for model, frame in (
+                (BaseColour, frames.base_colours),
+                (Season, frames.seasons),
+                (UsageType, frames.usage_types),
+            ):
+                self._load_dimension(
+                    cursor, model, frame,
+                    staging_columns=[("name", "text")],
+                    select_sql="SELECT s.name, s.base_slug FROM {staging} s",
+                    key_columns=["name"],
+                )
+
+            self._load_products(cursor, frames.products)
+
+    def _load_dimension(self, cursor, model, frame: pd.DataFrame, staging_columns, select_sql: str, key_columns) -> None:
+        table = model._meta.db_table
+        staging = f"staging_{table}"
+        frame = frame.assign(base_slug=slugify_series(frame["name"]))
+        start_time = time.perf_counter()
+
+        staged = self._copy_to_staging(cursor, staging, staging_columns + [("base_slug", "text")], frame)
+
+        keys = ", ".join(key_columns)
+        key_match = " AND ".join(f"d.{column} = n.{column}" for column in key_columns)
+        cursor.execute(
+            f"""
+            WITH incoming AS ({select_sql.format(staging=staging)}),
+            new AS (
+                SELECT DISTINCT ON ({keys}) n.*
+                FROM incoming n
+                WHERE NOT EXISTS (SELECT 1 FROM {table} d WHERE {key_match})
+                ORDER BY {keys}
+            ),
+            numbered AS (
+                SELECT n.*,
+                       row_number() OVER (PARTITION BY n.base_slug ORDER BY {keys})
+                       + COALESCE((
+                           SELECT MAX(CASE WHEN d.slug = n.base_slug THEN 1
+                                           ELSE substring(d.slug FROM '-([0-9]+)$')::int END)
+                           FROM {table} d
+                           WHERE d.slug = n.base_slug OR d.slug ~ ('^' || n.base_slug || '-[0-9]+$')
+                       ), 0) AS suffix
+                FROM new n
+            ),
+            inserted AS (
+                INSERT INTO {table} ({keys}, slug)
+                SELECT {keys},
+                       CASE WHEN suffix = 1 THEN base_slug ELSE base_slug || '-' || suffix END
+                FROM numbered
+                ON CONFLICT DO NOTHING
+                RETURNING 1
+            )
+            SELECT count(*) FROM inserted
+            """
+        )
+        self._record(table, staged, cursor.fetchone()[0], time.perf_counter() - start_time)
+
+    def _load_products(self, cursor, products: pd.DataFrame) -> None:
+        table = Product._meta.db_table
+        start_time = time.perf_counter()
+
+        staging = f"staging_{table}"
+        staged = self._copy_to_staging(cursor, staging, PRODUCT_STAGING_COLUMNS, products)
+        cursor.execute(
+            f"""
+            WITH inserted AS (
+                INSERT INTO {table} ({PRODUCT_INSERT_COLUMNS}, ratings_sum, ratings_count, created_at, updated_at)
+                SELECT {PRODUCT_INSERT_COLUMNS}, 0, 0, now(), now()
+                FROM ({self._resolved_products_sql(staging)}) r
+                ON CONFLICT DO NOTHING
+                RETURNING 1
+            )
+            SELECT count(*) FROM inserted
+            """
+        )
+        inserted = cursor.fetchone()[0]
+        self._record(table, staged, inserted, time.perf_counter() - start_time)
+
+        if inserted:
+            publish(PRODUCT_CHANGED, payload={'source': 'seed_catalog', 'rows': inserted})
+
+    @staticmethod
+    def _resolved_products_sql(staging: str) -> str:
+        """Staged products with dimension names resolved to ids and the feed row hash attached."""
+        return f"""
+            SELECT s.product_id, s.gender, s.year, s.product_display_name, s.image_url, s.slug,
+                   at.id AS article_type_id, bc.id AS base_colour_id, se.id AS season_id, ut.id AS usage_type_id,
+                   {PRODUCT_CONTENT_HASH_SQL} AS content_hash
+            FROM {staging} s
+            LEFT JOIN (
+                SELECT name, MIN(id) AS id FROM {ArticleType._meta.db_table} GROUP BY name
+            ) at ON at.name = s.article_type
+            LEFT JOIN {BaseColour._meta.db_table} bc ON bc.name = s.base_colour
+            LEFT JOIN {Season._meta.db_table} se ON se.name = s.season
+            LEFT JOIN {UsageType._meta.db_table} ut ON ut.name = s.usage
+        """
+
+    @staticmethod
+    def _copy_to_staging(cursor, staging: str, columns, frame: pd.DataFrame) -> int:
+        """Binary COPY the given `(column, postgres type)` columns of `frame` into a fresh temp table."""
+        names = [name for name, _ in columns]
+        cursor.execute(
+            f"CREATE TEMP TABLE {staging} ({', '.join(f'{name} {pg_type}' for name, pg_type in columns)}) ON COMMIT DROP"
+        )
+
+        values = [frame[name].astype(object).where(frame[name].notna(), None).tolist() for name in names]
+        with cursor.copy(f"COPY {staging} ({', '.join(names)}) FROM STDIN (FORMAT BINARY)") as copy:
+            copy.set_types([pg_type for _, pg_type in columns])
+            for row in zip(*values):
+                copy.write_row(row)
+
+        cursor.execute(f"ANALYZE {staging}")
+        return len(frame)
+
+    def _record(self, table: str, staged: int, inserted: int, elapsed: float) -> None:
+        stats = self.stats.setdefault(table, CopyLoadStats(table=table))
+        stats.staged += staged
+        stats.inserted += inserted
+        stats.elapsed += elapsed
@@ -0,0 +1,172 @@
+import time
+from dataclasses import dataclass
+from typing import Iterable, List
+
+import pandas as pd
+from django.db import connection, transaction
+from django.db.models import ProtectedError, RestrictedError
+
+from apps.catalog.models import Product
+from apps.outbox.publisher import PRODUCT_CHANGED, publish
+from etl.dto import CatalogFramesDTO
+from etl.load import PRODUCT_INSERT_COLUMNS, PRODUCT_STAGING_COLUMNS, CopyCatalogSeeder
+
+SEEN_PRODUCTS_TABLE = "sync_seen_products"
+
+
+@dataclass
+class CatalogSyncResult:
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    deleted: int = 0
+    kept: int = 0
+
+
+class CatalogSyncer(CopyCatalogSeeder):
+    """
+    Apply a catalog feed incrementally instead of insert-only.
+
+    Products are staged with binary COPY like in CopyCatalogSeeder, then one
+    upsert inserts new product ids and rewrites existing rows only when the
+    feed row's content hash differs from the stored `content_hash`; unchanged
+    rows are not written at all. Slugs are kept on update so product URLs stay
+    stable.
+
+    With `delete_missing`, products absent from the feed are deleted after the
+    last chunk. Products still referenced by orders or carts (PROTECT) are
+    kept and counted in `result.kept`.
+
+    Every changed batch publishes PRODUCT_CHANGED with the affected ids, so
+    the outbox consumer refreshes the catalog views and the
+    favorite summaries for just those products.
+    """
+
+    def __init__(self, batch_size: int = 5000, delete_missing: bool = False) -> None:
+        super().__init__(batch_size=batch_size)
+        self.delete_missing = delete_missing
+        self.result = CatalogSyncResult()
+
+    def sync_frames(self, frames: CatalogFramesDTO) -> CatalogSyncResult:
+        self._start()
+        self.seed_frames(frames)
+        return self._finish()
+
+    def sync_stream(self, chunks: Iterable[CatalogFramesDTO], queue_size: int = 2) -> CatalogSyncResult:
+        self._start()
+        self.seed_stream(chunks, queue_size=queue_size)
+        return self._finish()
+
+    def _start(self) -> None:
+        self.result = CatalogSyncResult()
+        with connection.cursor() as cursor:
+            cursor.execute(f"DROP TABLE IF EXISTS {SEEN_PRODUCTS_TABLE}")
+            cursor.execute(f"CREATE TEMP TABLE {SEEN_PRODUCTS_TABLE} (product_id int4 PRIMARY KEY)")
+
+    def _finish(self) -> CatalogSyncResult:
+        try:
+            if self.delete_missing:
+                self._delete_missing()
+        finally:
+            with connection.cursor() as cursor:
+                cursor.execute(f"DROP TABLE IF EXISTS {SEEN_PRODUCTS_TABLE}")
+        return self.result
+
+    def _load_products(self, cursor, products: pd.DataFrame) -> None:
+        table = Product._meta.db_table
+        start_time = time.perf_counter()
+
+        staging = f"staging_{table}"
+        staged = self._copy_to_staging(cursor, staging, PRODUCT_STAGING_COLUMNS, products)
+        cursor.execute(
+            f"""
+            WITH incoming AS (
+                SELECT DISTINCT ON (product_id) *
+                FROM ({self._resolved_products_sql(staging)}) r
+                ORDER BY product_id
+            ),
+            seen AS (
+                INSERT INTO {SEEN_PRODUCTS_TABLE} (product_id)
+                SELECT product_id FROM incoming
+                ON CONFLICT DO NOTHING
+                RETURNING 1
+            ),
+            upserted AS (
+                INSERT INTO {table} ({PRODUCT_INSERT_COLUMNS}, ratings_sum, ratings_count, created_at, updated_at)
+                SELECT {PRODUCT_INSERT_COLUMNS}, 0, 0, now(), now()
+                FROM incoming
+                ON CONFLICT (product_id) DO UPDATE
+                SET gender = EXCLUDED.gender,
+                    year = EXCLUDED.year,
+                    product_display_name = EXCLUDED.product_display_name,
+                    image_url = EXCLUDED.image_url,
+                    article_type_id = EXCLUDED.article_type_id,
+                    base_colour_id = EXCLUDED.base_colour_id,
+                    season_id = EXCLUDED.season_id,
+                    usage_type_id = EXCLUDED.usage_type_id,
+                    content_hash = EXCLUDED.content_hash,
+                    updated_at = EXCLUDED.updated_at
+                WHERE {table}.content_hash IS DISTINCT FROM EXCLUDED.content_hash
+                RETURNING id, (xmax = 0) AS inserted
+            )
+            SELECT (SELECT count(*) FROM incoming),
+                   (SELECT count(*) FROM seen),
+                   count(*) FILTER (WHERE inserted),
+                   count(*) FILTER (WHERE NOT inserted),
+                   COALESCE(array_agg(id), '{{}}')
+            FROM upserted
+            """
+        )
+        incoming, _, inserted, updated, changed_ids = cursor.fetchone()
+
+        self.result.inserted += inserted
+        self.result.updated += updated
+        self.result.unchanged += incoming - inserted - updated
+        self._record(table, staged, inserted + updated, time.perf_counter() - start_time)
+
+        if changed_ids:
+            publish(
+                PRODUCT_CHANGED,
+                changed_ids,
+                {'source': 'sync_catalog', 'inserted': inserted, 'updated': updated},
+            )
+
+    def _delete_missing(self) -> None:
+        """Delete products that were not in the feed, batch by batch through the ORM so cascades apply."""
+        after_id = 0
+        while True:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"""
+                    SELECT p.id
+                    FROM {Product._meta.db_table} p
+                    WHERE p.id > %s
+                      AND NOT EXISTS (SELECT 1 FROM {SEEN_PRODUCTS_TABLE} s WHERE s.product_id = p.product_id)
+                    ORDER BY p.id
+                    LIMIT %s
+                    """,
+                    [after_id, self._batch_size],
+                )
+                product_ids = [row[0] for row in cursor.fetchall()]
+            if not product_ids:
+                return
+
+            try:
+                self._delete_products(product_ids)
+            except (ProtectedError, RestrictedError):
+                for product_id in product_ids:
+                    try:
+                        self._delete_products([product_id])
+                    except (ProtectedError, RestrictedError):
+                        self.result.kept += 1
+
+            after_id = product_ids[-1]
+
+    def _delete_products(self, product_ids: List[int]) -> None:
+        with transaction.atomic():
+            # Favorite summaries of the affected collections are refreshed by
+            # the favorites app's Product delete signals.
+            Product.objects.filter(pk__in=product_ids).delete()
+            publish(PRODUCT_CHANGED, product_ids, {'source': 'sync_catalog', 'deleted': len(product_ids)})
+
+        self.result.deleted += len(product_ids)
@@ -0,0 +1,118 @@
+from typing import Iterator, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+class GenerationEngine:
+    """
+    Column-at-a-time random data for the fixture generators.
+
+    Everything is drawn from one `numpy.random.Generator`, so passing the
+    same `seed` reproduces a whole seeding run. Methods return NumPy arrays
+    covering every row at once; per-owner data (ratings of a product, items
+    of a cart) is described by a `counts` array and expanded with
+    `group_ids` / `positions_in_group`.
+    """
+
+    def __init__(self, seed: Optional[int] = None) -> None:
+        self.seed = seed
+        self.rng = np.random.default_rng(seed)
+
+    def categorical(self, weights: Sequence[float], size: int) -> np.ndarray:
+        """Indices into `weights`, drawn proportionally to them."""
+        weights = np.asarray(weights, dtype=float)
+        return self.rng.choice(len(weights), size=size, p=weights / weights.sum())
+
+    def chance(self, probability: float, size: int) -> np.ndarray:
+        return self.rng.random(size) < probability
+
+    def integers(self, low, high, size: Optional[int] = None) -> np.ndarray:
+        """Uniform integers in [low, high]; bounds may be arrays."""
+        return self.rng.integers(low, high, size=size, endpoint=True)
+
+    def bucketed_integers(self, buckets: Sequence[Tuple[int, int]], weights: Sequence[float], size: int) -> np.ndarray:
+        """Pick a (low, high) bucket per row by `weights`, then a uniform integer inside it."""
+        bounds = np.asarray(buckets, dtype=np.int64)
+        picked = bounds[self.categorical(weights, size)]
+        return self.integers(picked[:, 0], picked[:, 1])
+
+    def cents(self, low: float, high: float, size: int) -> np.ndarray:
+        """Uniform prices in [low, high], as integer cents."""
+        return self.integers(round(low * 100), round(high * 100), size=size)
+
+    def jittered_profiles(self, archetypes: Sequence[Sequence[float]], weights: Sequence[float], size: int,
+                          jitter: float = 0.08) -> np.ndarray:
+        """One probability distribution per row: a weighted archetype with each weight jittered by +-`jitter`."""
+        archetypes = np.asarray(archetypes, dtype=float)
+        picked = archetypes[self.categorical(weights, size)]
+        jittered = np.maximum(1e-6, picked * (1.0 + self.rng.uniform(-jitter, jitter, size=picked.shape)))
+        return jittered / jittered.sum(axis=1, keepdims=True)
+
+    def draw_from_profiles(self, profiles: np.ndarray, groups: np.ndarray) -> np.ndarray:
+        """For every row, an outcome index drawn from `profiles[groups[row]]` (inverse CDF, no Python loop)."""
+        cdf = np.cumsum(profiles, axis=1)
+        draws = self.rng.random(len(groups)) * cdf[groups, -1]
+        return (draws[:, None] >= cdf[groups]).sum(axis=1)
+
+    def unique_samples(self, pool_size: int, counts: np.ndarray) -> np.ndarray:
+        """
+        Indices into a pool of `pool_size`, `counts[g]` distinct ones per group.
+
+        Everything is drawn with replacement and only the in-group duplicates
+        are redrawn, which converges in a few rounds while counts are small
+        compared to the pool (favorites, cart items). Rows are ordered by
+        group, like `group_ids(counts)`; counts are capped at `pool_size`.
+        """
+        counts = np.minimum(counts, pool_size)
+        groups = self.group_ids(counts)
+        picks = self.rng.integers(0, pool_size, size=len(groups))
+
+        while True:
+            order = np.lexsort((picks, groups))
+            sorted_groups, sorted_picks = groups[order], picks[order]
+            duplicated = np.zeros(len(order), dtype=bool)
+            duplicated[1:] = (sorted_groups[1:] == sorted_groups[:-1]) & (sorted_picks[1:] == sorted_picks[:-1])
+            if not duplicated.any():
+                return picks
+            redraw = order[duplicated]
+            picks[redraw] = self.rng.integers(0, pool_size, size=len(redraw))
+
+    @staticmethod
+    def sliding_windows(pool_size: int, counts: np.ndarray, groups: np.ndarray, positions: np.ndarray) -> np.ndarray:
+        """
+        Indices into a pool for consecutive, wrapping windows of `counts[g]` rows.
+
+        Group g starts where group g-1 stopped, so neighbouring owners get
+        different pool members; `groups`/`positions` select which rows of the
+        expansion to return (see `iter_group_chunks`).
+        """
+        offsets = (np.cumsum(counts) - counts) % pool_size
+        return (offsets[groups] + positions) % pool_size
+
+    @staticmethod
+    def group_ids(counts: np.ndarray) -> np.ndarray:
+        return np.repeat(np.arange(len(counts)), counts)
+
+    @staticmethod
+    def positions_in_group(counts: np.ndarray) -> np.ndarray:
+        starts = np.cumsum(counts) - counts
+        return np.arange(int(counts.sum())) - np.repeat(starts, counts)
+
+    @classmethod
+    def iter_group_chunks(cls, counts: np.ndarray, max_rows: int) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Yield `(groups, positions)` for the rows of consecutive groups, about `max_rows` rows at a time.
+
+        Lets callers expand billions of rows while holding one chunk in memory.
+        """
+        ends = np.cumsum(counts)
+        first = 0
+        while first < len(counts):
+            consumed = ends[first - 1] if first else 0
+            last = max(int(np.searchsorted(ends, consumed + max_rows, side='right')), first + 1)
+            chunk_counts = counts[first:last]
+            yield (
+                np.repeat(np.arange(first, last), chunk_counts),
+                cls.positions_in_group(chunk_counts),
+            )
+            first = last
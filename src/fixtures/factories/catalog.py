@@ -0,0 +1,104 @@
+from decimal import Decimal
+
+import factory
+
+from apps.catalog.choices import GenderChoices, SeasonChoices
+from apps.catalog.models import (
+    ArticleType,
+    BaseColour,
+    MasterCategory,
+    Product,
+    Season,
+    SubCategory,
+    UsageType,
+)
+from apps.inventories.models import Currency, ProductInventory
+
+
+class MasterCategoryFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = MasterCategory
+        django_get_or_create = ('name',)
+
+    name = 'Apparel'
+
+
+class SubCategoryFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = SubCategory
+        django_get_or_create = ('master_category', 'name')
+
+    master_category = factory.SubFactory(MasterCategoryFactory)
+    name = 'Topwear'
+
+
+class ArticleTypeFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = ArticleType
+        django_get_or_create = ('sub_category', 'name')
+
+    sub_category = factory.SubFactory(SubCategoryFactory)
+    name = 'Tshirts'
+
+
+class BaseColourFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = BaseColour
+        django_get_or_create = ('name',)
+
+    name = 'Navy Blue'
+
+
+class SeasonFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = Season
+        django_get_or_create = ('name',)
+
+    name = SeasonChoices.SUMMER
+
+
+class UsageTypeFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = UsageType
+        django_get_or_create = ('name',)
+
+    name = 'Casual'
+
+
+class ProductFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = Product
+
+    product_id = factory.Sequence(lambda n: 10000 + n)
+    gender = GenderChoices.MEN
+    year = 2012
+    product_display_name = factory.Sequence(lambda n: f"Test Tshirt {n}")
+    image_url = factory.Sequence(lambda n: f"https://example.com/images/{n}.jpg")
+    article_type = factory.SubFactory(ArticleTypeFactory)
+    base_colour = factory.SubFactory(BaseColourFactory)
+    season = factory.SubFactory(SeasonFactory)
+    usage_type = factory.SubFactory(UsageTypeFactory)
+
+
+class CurrencyFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = Currency
+        django_get_or_create = ('code',)
+
+    code = 'USD'
+    numeric_code = 840
+    name = 'US Dollar'
+    symbol = '$'
+    decimals = 2
+
+
+class ProductInventoryFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = ProductInventory
+
+    product = factory.SubFactory(ProductFactory)
+    base_price = Decimal('20.00')
+    currency = factory.SubFactory(CurrencyFactory)
+    stock_quantity = 10
+    reserved_quantity = 0
+    is_active = True
@@ -1,14 +1,14 @@
-import random
-from typing import List, Tuple
+from typing import Dict, List, Optional, Tuple
 
+import numpy as np
 from django.contrib.auth import get_user_model
 from django.db import connection
 from django.utils import timezone
-from tqdm import tqdm
 
 from apps.catalog.models import Product
 from apps.cart.models import Cart, CartItem
-from fixtures.utils import copy_insert_data
+from fixtures.engine import GenerationEngine
+from fixtures.utils import copy_columns
 
 
 class CartsGenerator:
@@ -19,17 +19,19 @@ class CartsGenerator:
             quantity_range: Tuple[int, int] = (1, 5),
             exclude_username: str = "admin",
             batch_size: int = 50000,
+            seed: Optional[int] = None,
     ):
         self.user_fraction = user_fraction
         self.items_range = items_range
         self.quantity_range = quantity_range
         self.exclude_username = exclude_username
         self.batch_size = batch_size
+        self.engine = GenerationEngine(seed)
         self.User = get_user_model()
 
     def generate(self):
-        product_ids = list(Product.objects.values_list("id", flat=True))
-        if not product_ids:
+        product_ids = np.fromiter(Product.objects.values_list("id", flat=True).iterator(), dtype=np.int64)
+        if not len(product_ids):
             return
 
         selected_user_ids = self._pick_users()
@@ -38,39 +40,40 @@ class CartsGenerator:
 
         now = timezone.now()
 
-        carts_rows = [(user_id, now, now) for user_id in selected_user_ids]
-        copy_insert_data(
+        copy_columns(
             Cart,
             ["user", "created_at", "updated_at"],
-            carts_rows,
+            [np.asarray(selected_user_ids, dtype=np.int64), now, now],
+            batch_size=self.batch_size,
         )
 
         cart_map = dict(Cart.objects.filter(user_id__in=selected_user_ids).values_list("user_id", "id"))
         if not cart_map:
             return
 
-        items_rows = []
-        for user_id in tqdm(selected_user_ids, desc="Preparing carts with items"):
-            cart_id = cart_map.get(user_id)
-            if not cart_id:
-                continue
-            items_count = random.randint(self.items_range[0], self.items_range[1])
-            used_products = set()
-
-            for _ in range(items_count):
-                product_id = random.choice(product_ids)
-                while product_id in used_products:
-                    product_id = random.choice(product_ids)
-                used_products.add(product_id)
-                quantity = random.randint(self.quantity_range[0], self.quantity_range[1])
-                items_rows.append((cart_id, product_id, quantity, now, now))
-
-        if items_rows:
-            copy_insert_data(
-                CartItem,
-                ["cart", "product", "quantity", "created_at", "updated_at"],
-                items_rows,
-            )
+        cart_ids = np.fromiter(
+            (cart_map[user_id] for user_id in selected_user_ids if user_id in cart_map), dtype=np.int64
+        )
+        items = self.build_items(len(cart_ids), len(product_ids))
+
+        copy_columns(
+            CartItem,
+            ["cart", "product", "quantity", "created_at", "updated_at"],
+            [cart_ids[items["cart_index"]], product_ids[items["product_index"]], items["quantity"], now, now],
+            batch_size=self.batch_size,
+        )
+
+    def build_items(self, carts_count: int, products_count: int) -> Dict[str, np.ndarray]:
+        """Item rows for `carts_count` carts: distinct products per cart and their quantities."""
+        counts = self.engine.integers(self.items_range[0], self.items_range[1], size=carts_count)
+        product_index = self.engine.unique_samples(products_count, counts)
+        cart_index = self.engine.group_ids(np.minimum(counts, products_count))
+
+        return {
+            "cart_index": cart_index,
+            "product_index": product_index,
+            "quantity": self.engine.integers(self.quantity_range[0], self.quantity_range[1], size=len(cart_index)),
+        }
 
     def _pick_users(self) -> List[int]:
         users_table = self.User._meta.db_table
@@ -90,9 +93,8 @@ class CartsGenerator:
                 rows = cursor.fetchmany(self.batch_size)
                 if not rows:
                     break
-                for (user_id,) in rows:
-                    if random.random() <= self.user_fraction:
-                        picked.append(user_id)
+                user_ids = np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows))
+                picked.extend(user_ids[self.engine.rng.random(len(rows)) <= self.user_fraction].tolist())
         return picked
 
     @staticmethod
@@ -1,6 +1,6 @@
-import random
-from typing import List
+from typing import Dict, List, Optional
 
+import numpy as np
 from django.contrib.auth import get_user_model
 from django.db import connection
 from django.utils.text import slugify
@@ -8,8 +8,10 @@ from django.utils import timezone
 from tqdm import tqdm
 
 from apps.catalog.models import Product
-from apps.favorites.models import FavoriteCollection, FavoriteItem
-from fixtures.utils import copy_insert_data
+from apps.favorites.models import POSITION_GAP, FavoriteCollection, FavoriteItem
+from apps.outbox.publisher import FAVORITE_CHANGED
+from fixtures.engine import GenerationEngine
+from fixtures.utils import copy_columns, copy_insert_data
 
 User = get_user_model()
 
@@ -17,6 +19,9 @@ User = get_user_model()
 
 class FavoriteCollectionsGenerator:
 
+    def __init__(self, seed: Optional[int] = None):
+        self.engine = GenerationEngine(seed)
+
     def select_users_and_create_collections(self, percentage: float = 30.0) -> List[int]:
         users_without_collections = list(User.objects.filter(
             favorite_collections__isnull=True
@@ -27,7 +32,8 @@ class FavoriteCollectionsGenerator:
             return []
 
         selected_count = max(1, int(len(users_without_collections) * percentage / 100))
-        selected_users = random.sample(users_without_collections, selected_count)
+        picked = self.engine.rng.choice(len(users_without_collections), size=selected_count, replace=False)
+        selected_users = [users_without_collections[index] for index in picked.tolist()]
 
         print(f"Selected {len(selected_users):,} users to receive a default favorite collection.")
 
@@ -45,6 +51,10 @@ class FavoriteCollectionsGenerator:
                 'Default favorite collection',
                 True,
                 False,
+                POSITION_GAP,
+                0,
+                '[]',
+                '[]',
                 current_time,
                 current_time,
             ))
@@ -52,7 +62,8 @@ class FavoriteCollectionsGenerator:
 
         copy_insert_data(
             FavoriteCollection,
-            ['user_id', 'name', 'slug', 'description', 'is_default', 'is_public', 'created_at', 'updated_at'],
+            ['user_id', 'name', 'slug', 'description', 'is_default', 'is_public', 'next_position',
+             'items_count', 'total_values', 'cover_items', 'created_at', 'updated_at'],
             collections_data
         )
 
@@ -72,6 +83,14 @@ class FavoriteCollectionsGenerator:
 
 
 class FavoriteItemsGenerator:
+    NOTES = [
+        "Love this item!", "Want to buy later", "Great quality",
+        "Perfect for summer", "Gift idea", "Waiting for sale",
+        "Favorite color", "Must have",
+    ]
+
+    def __init__(self, seed: Optional[int] = None):
+        self.engine = GenerationEngine(seed)
 
     def generate_for_users(
             self,
@@ -83,17 +102,11 @@ class FavoriteItemsGenerator:
             print("No user IDs provided for favorite item generation.")
             return
 
-        all_products = list(Product.objects.values_list('id', flat=True))
-        if not all_products:
+        product_ids = np.fromiter(Product.objects.values_list('id', flat=True).iterator(), dtype=np.int64)
+        if not len(product_ids):
             print("No products found to add to favorites.")
             return
 
-        favorite_items_data = []
-        notes = [
-            "Love this item!", "Want to buy later", "Great quality",
-            "Perfect for summer", "Gift idea", "Waiting for sale",
-            "Favorite color", "Must have",
-        ]
         current_time = timezone.now()
 
         collections = list(FavoriteCollection.objects.filter(
@@ -101,29 +114,43 @@ class FavoriteItemsGenerator:
             is_default=True
         ).values_list('id', flat=True))
 
-        for collection_id in tqdm(collections, desc="Preparing favorite items"):
-            items_count = random.randint(min_items, max_items)
-            selected_products = random.sample(all_products, min(items_count, len(all_products)))
-
-            for position, product_id in enumerate(selected_products, start=1):
-                note = ""
-                if random.random() < 0.1:
-                    note = random.choice(notes)
-
-                favorite_items_data.append((
-                    collection_id,
-                    product_id,
-                    position,
-                    note,
-                    current_time
-                ))
+        items = self.build_items(len(collections), len(product_ids), min_items, max_items)
+        print(f"Generated {len(items['product_index']):,} favorite items to be inserted.")
 
-        print(f"Generated {len(favorite_items_data):,} favorite items to be inserted.")
-        copy_insert_data(
+        copy_columns(
             FavoriteItem,
             ['collection_id', 'product_id', 'position', 'note', 'created_at'],
-            favorite_items_data
+            [
+                np.asarray(collections, dtype=np.int64)[items['collection_index']],
+                product_ids[items['product_index']],
+                items['position'],
+                items['note'],
+                current_time,
+            ],
+            event_topic=FAVORITE_CHANGED,
         )
+        FavoriteCollection.sync_next_positions(collections)
+
+        for i in tqdm(range(0, len(collections), 1000), desc="Refreshing collection summaries"):
+            FavoriteCollection.refresh_summaries(collections[i:i + 1000])
+
+    def build_items(self, collections_count: int, products_count: int, min_items: int,
+                    max_items: int) -> Dict[str, np.ndarray]:
+        """Item rows for `collections_count` collections: distinct products, gap-spaced positions, a few notes."""
+        engine = self.engine
+        counts = np.minimum(engine.integers(min_items, max_items, size=collections_count), products_count)
+        product_index = engine.unique_samples(products_count, counts)
+
+        notes = np.asarray([""] + self.NOTES, dtype=object)
+        with_note = engine.chance(0.1, len(product_index))
+        note_index = np.where(with_note, engine.integers(1, len(self.NOTES), size=len(product_index)), 0)
+
+        return {
+            'collection_index': engine.group_ids(counts),
+            'product_index': product_index,
+            'position': (engine.positions_in_group(counts) + 1) * POSITION_GAP,
+            'note': notes[note_index],
+        }
 
     @staticmethod
     def clear_all_items_except_admin() -> None:
@@ -137,3 +164,12 @@ class FavoriteItemsGenerator:
                                                    WHERE user_id NOT IN (SELECT id FROM accounts_user WHERE is_superuser = TRUE));
                            """)
             print(f"{cursor.rowcount} favorite items deleted.")
+
+            cursor.execute("""
+                           UPDATE favorites_favoritecollection
+                           SET items_count   = 0,
+                               total_values  = '[]'::jsonb,
+                               cover_items   = '[]'::jsonb,
+                               next_position = %s
+                           WHERE user_id NOT IN (SELECT id FROM accounts_user WHERE is_superuser = TRUE);
+                           """, [POSITION_GAP])
@@ -1,13 +1,17 @@
-import random
 from decimal import Decimal
 from contextlib import nullcontext
-from typing import List
+from typing import Dict, List, Optional
 
+import numpy as np
 from django.db import transaction
+from django.utils import timezone
 from tqdm import tqdm
 
 from apps.inventories.models import Currency, ProductInventory
 from apps.catalog.models import Product
+from apps.outbox.publisher import INVENTORY_CHANGED, publish
+from fixtures.engine import GenerationEngine
+from fixtures.utils import copy_columns
 
 
 class CurrenciesGenerator:
@@ -55,9 +59,10 @@ class CurrenciesGenerator:
 class ProductInventoryGenerator:
     """Generate product inventory data efficiently"""
 
-    def __init__(self, batch_size: int = 1000, use_transaction_per_batch: bool = False):
+    def __init__(self, batch_size: int = 1000, use_transaction_per_batch: bool = False, seed: Optional[int] = None):
         self.batch_size = batch_size
         self.use_transaction_per_batch = use_transaction_per_batch
+        self.engine = GenerationEngine(seed)
 
         self.stock_distribution = {
             0: 10,  # out of stock (0)
@@ -68,6 +73,7 @@ class ProductInventoryGenerator:
             5: 7,  # 61–80
             6: 3,  # 81–100
         }
+        self.stock_buckets = [(0, 0), (1, 10), (11, 20), (21, 40), (41, 60), (61, 80), (81, 100)]
 
         self.price_ranges = {
             'default': (5, 50),
@@ -79,104 +85,88 @@ class ProductInventoryGenerator:
 
     def generate(self) -> None:
         """Generate inventory for all products"""
-        products = list(Product.objects.select_related(
-            'article_type',
-            'article_type__sub_category',
-            'article_type__sub_category__master_category'
-        ).values_list('pk', flat=True))
+        product_ids = np.fromiter(Product.objects.values_list('pk', flat=True).iterator(), dtype=np.int64)
 
-        if not products:
+        if not len(product_ids):
             print("No products found to generate inventory for")
             return
 
-        try:
-            usd_currency = Currency.objects.get(code='USD')
-        except Currency.DoesNotExist:
+        if not Currency.objects.filter(code='USD').exists():
             print("USD currency not found. Please generate currencies first.")
             return
 
-        total_products = len(products)
+        total_products = len(product_ids)
         print(f"Generating inventory for {total_products} products...")
 
-        inventory_batch = []
-        batch_count = 0
-
-        progress_bar = tqdm(products, desc="Generating inventory", unit="products")
-
-        for product_id in progress_bar:
-            inventory = self._create_inventory_for_product(product_id, usd_currency)
-            inventory_batch.append(inventory)
-
-            if len(inventory_batch) >= self.batch_size:
-                self._bulk_create_inventory(inventory_batch)
-                batch_count += 1
-                progress_bar.set_postfix(batches=batch_count)
-                inventory_batch = []
+        columns = self.build_columns(total_products)
+        current_time = timezone.now()
+        values = [
+            product_ids,
+            self._to_decimals(columns['base_price']),
+            self._to_decimals(columns['sale_price']),
+            'USD',
+            columns['stock_quantity'],
+            columns['reserved_quantity'],
+            columns['is_active'],
+            current_time,
+            current_time,
+        ]
 
-        if inventory_batch:
-            self._bulk_create_inventory(inventory_batch)
+        step = self.batch_size if self.use_transaction_per_batch else total_products
+        batch_count = 0
+        for start in tqdm(range(0, total_products, step), desc="Copying inventory", unit="batches"):
+            self._copy_inventory([
+                value[start:start + step] if isinstance(value, (np.ndarray, list)) else value
+                for value in values
+            ])
             batch_count += 1
 
         print(f"Generated inventory for {total_products} products in {batch_count} batches")
 
-    def _create_inventory_for_product(self, product_id: int, currency: Currency) -> ProductInventory:
-        """Create inventory record for a single product"""
-
-        base_price = Decimal(str(round(random.uniform(5.0, 1000.0), 2)))
-
-        sale_price = None
-        if random.random() < 0.15:
-            discount_percent = random.uniform(0.05, 0.20)
-            sale_price = Decimal(str(round(float(base_price) * (1 - discount_percent), 2)))
+    def build_columns(self, count: int) -> Dict[str, np.ndarray]:
+        """Prices (in cents), stock and flags for `count` products, one array per column."""
+        engine = self.engine
 
-        stock_quantity = self._generate_stock_quantity()
+        base_price = engine.cents(5.0, 1000.0, count)
+        on_sale = engine.chance(0.15, count)
+        discount = engine.rng.uniform(0.05, 0.20, size=count)
+        sale_price = np.where(on_sale, np.round(base_price * (1 - discount)), -1).astype(np.int64)
 
-        if stock_quantity > 0:
-            max_reserved = min(stock_quantity, max(1, int(stock_quantity * 0.2)))
-            reserved_quantity = random.randint(0, max_reserved)
-        else:
-            reserved_quantity = 0
-
-        is_active = stock_quantity > 0 or random.random() < 0.95
-
-        return ProductInventory(
-            product_id=product_id,
-            base_price=base_price,
-            sale_price=sale_price,
-            currency=currency,
-            stock_quantity=stock_quantity,
-            reserved_quantity=reserved_quantity,
-            is_active=is_active,
+        stock_quantity = engine.bucketed_integers(
+            [self.stock_buckets[bucket] for bucket in self.stock_distribution],
+            list(self.stock_distribution.values()),
+            count,
         )
+        max_reserved = np.minimum(stock_quantity, np.maximum(1, (stock_quantity * 0.2).astype(np.int64)))
+        reserved_quantity = np.where(stock_quantity > 0, engine.integers(0, max_reserved), 0)
 
-    def _generate_stock_quantity(self) -> int:
-        """Generate stock quantity based on distribution weights"""
-        categories = list(self.stock_distribution.keys())
-        weights = list(self.stock_distribution.values())
-
-        bucket = random.choices(categories, weights=weights, k=1)[0]
-
-        ranges = {
-            0: (0, 0),
-            1: (1, 10),
-            2: (11, 20),
-            3: (21, 40),
-            4: (41, 60),
-            5: (61, 80),
-            6: (81, 100),
-        }
+        is_active = (stock_quantity > 0) | engine.chance(0.95, count)
 
-        low, high = ranges[bucket]
-        if low == high:
-            return low
-        return random.randint(low, high)
+        return {
+            'base_price': base_price,
+            'sale_price': sale_price,
+            'stock_quantity': stock_quantity,
+            'reserved_quantity': reserved_quantity,
+            'is_active': is_active,
+        }
 
-    def _bulk_create_inventory(self, inventory_batch: List[ProductInventory]) -> None:
-        """Bulk create inventory records"""
-        transaction_context = transaction.atomic() if self.use_transaction_per_batch else nullcontext()
-        with transaction_context:
-            ProductInventory.objects.bulk_create(
-                inventory_batch,
-                batch_size=self.batch_size,
-                ignore_conflicts=True
+    @staticmethod
+    def _to_decimals(cents: np.ndarray) -> List[Optional[Decimal]]:
+        """Cents to Decimal prices; negative cents mark a missing price."""
+        return [Decimal(value).scaleb(-2) if value >= 0 else None for value in cents.tolist()]
+
+    @staticmethod
+    def _copy_inventory(values: list) -> None:
+        """COPY one batch of inventory rows; existing records are skipped, like ignore_conflicts did."""
+        _, inserted = copy_columns(
+            ProductInventory,
+            ['product', 'base_price', 'sale_price', 'currency', 'stock_quantity', 'reserved_quantity',
+             'is_active', 'created_at', 'updated_at'],
+            values,
+        )
+        if inserted:
+            publish(
+                INVENTORY_CHANGED,
+                values[0].tolist(),
+                {'prices': True, 'stock': True, 'source': 'seed_inventories'}
             )
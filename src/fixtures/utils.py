@@ -1,7 +1,11 @@
-from typing import List
+from itertools import repeat
+from typing import Iterable, List, Optional, Sequence, Tuple
 
+import numpy as np
 from django.db import models, transaction, connection
 
+from apps.outbox.publisher import publish
+
 
 def get_postgres_type(field: models.Field) -> str:
     if isinstance(field, (models.ForeignKey, models.IntegerField, models.PositiveIntegerField,
@@ -11,11 +15,13 @@ def get_postgres_type(field: models.Field) -> str:
         return 'boolean'
     elif isinstance(field, models.DateTimeField):
         return 'timestamp with time zone'
+    elif isinstance(field, models.JSONField):
+        return 'jsonb'
     else:
         return 'text'
 
 
-def copy_insert_data(model: type[models.Model], columns: List[str], data: List[tuple]):
+def copy_insert_data(model: type[models.Model], columns: List[str], data: List[tuple], event_topic: Optional[str] = None):
     if not data:
         return
 
@@ -50,6 +56,93 @@ def copy_insert_data(model: type[models.Model], columns: List[str], data: List[t
             SELECT {quoted_column_list} FROM {quoted_temp_table_name};
         """)
 
+        if event_topic:
+            publish(event_topic, payload={'source': table_name, 'rows': len(data)})
+
+
+def copy_rows(
+        model: type[models.Model],
+        columns: List[str],
+        rows: Iterable[tuple],
+        event_topic: Optional[str] = None,
+) -> Tuple[int, int]:
+    """
+    Binary COPY `rows` into `model`'s table while they are being generated.
+
+    An empty table is copied into directly; otherwise rows go through a temp
+    table and are merged with ON CONFLICT DO NOTHING, so existing rows are
+    skipped instead of failing the load. Returns `(copied, inserted)`.
+    """
+    table_name = model._meta.db_table
+    quote_name = connection.ops.quote_name
+
+    fields = [model._meta.get_field(column) for column in columns]
+    pg_types = [field.db_type(connection).split('(')[0].strip() for field in fields]
+    column_list = ", ".join(quote_name(field.column) for field in fields)
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f"SELECT EXISTS (SELECT 1 FROM {quote_name(table_name)})")
+        direct = not cursor.fetchone()[0]
+
+        target = quote_name(table_name)
+        if not direct:
+            target = quote_name(f"temp_copy_{table_name}")
+            column_definitions = ", ".join(
+                f"{quote_name(field.column)} {pg_type}" for field, pg_type in zip(fields, pg_types)
+            )
+            cursor.execute(f"CREATE TEMP TABLE {target} ({column_definitions}) ON COMMIT DROP;")
+
+        copied = 0
+        with cursor.copy(f"COPY {target} ({column_list}) FROM STDIN (FORMAT BINARY)") as copy_context:
+            copy_context.set_types(pg_types)
+            for row in rows:
+                copy_context.write_row(row)
+                copied += 1
+
+        inserted = copied
+        if not direct:
+            cursor.execute(f"""
+                INSERT INTO {quote_name(table_name)} ({column_list})
+                SELECT {column_list} FROM {target}
+                ON CONFLICT DO NOTHING;
+            """)
+            inserted = cursor.rowcount
+
+        if event_topic and inserted:
+            publish(event_topic, payload={'source': table_name, 'rows': inserted})
+
+    return copied, inserted
+
+
+def iter_column_rows(values: Sequence, batch_size: int = 50000) -> Iterable[tuple]:
+    """
+    Turn column arrays (NumPy arrays or lists) into row tuples, `batch_size` rows at a time.
+
+    Non-sequence values (a timestamp, a constant) are repeated on every row.
+    """
+    arrays = [value for value in values if isinstance(value, (np.ndarray, list))]
+    total = len(arrays[0]) if arrays else 0
+
+    for start in range(0, total, batch_size):
+        chunk = [
+            value[start:start + batch_size].tolist() if isinstance(value, np.ndarray)
+            else value[start:start + batch_size] if isinstance(value, list)
+            else repeat(value)
+            for value in values
+        ]
+        yield from zip(*chunk)
+
+
+def copy_columns(
+        model: type[models.Model],
+        columns: List[str],
+        values: Sequence,
+        event_topic: Optional[str] = None,
+        batch_size: int = 50000,
+) -> Tuple[int, int]:
+    """`copy_rows` fed from whole generated columns, see `iter_column_rows`."""
+    return copy_rows(model, columns, iter_column_rows(values, batch_size), event_topic=event_topic)
+
 
 def get_approximate_table_count(model: type[models.Model]) -> int:
     if connection.vendor != "postgresql":
@@ -134,7 +134,7 @@ class CollectionReorderHandler extends BaseComponent {
 
         if (this.dragState.placeholder && newIndex !== -1 && newIndex !== oldIndex) {
             this.dragState.placeholder.parentNode.insertBefore(draggedItem, this.dragState.placeholder);
-            void this.saveNewOrder();
+            void this.saveMove(draggedItem);
         } else {
             this.dragState.draggedItem.parentNode.insertBefore(draggedItem, this.dragState.items[oldIndex].nextSibling);
         }
@@ -180,25 +180,38 @@ class CollectionReorderHandler extends BaseComponent {
         return Array.from(grid.children).indexOf(this.dragState.placeholder);
     }
 
-    async saveNewOrder() {
+    async saveMove(movedItem) {
         const grid = document.querySelector(this.selectors.grid);
         if (!grid) return;
 
         const collectionId = grid.dataset.collectionId;
         const url = this.reorderUrl.replace('{id}', collectionId);
-        const items = Array.from(grid.querySelectorAll(this.selectors.item));
 
-        const payload = {
-            items: items.map((item, index) => ({
-                item_id: parseInt(item.dataset.itemId),
-                position: index + 1
-            }))
-        };
+        let nextItem = movedItem.nextElementSibling;
+        while (nextItem && !nextItem.matches(this.selectors.item)) {
+            nextItem = nextItem.nextElementSibling;
+        }
+
+        let previousItem = movedItem.previousElementSibling;
+        while (previousItem && !previousItem.matches(this.selectors.item)) {
+            previousItem = previousItem.previousElementSibling;
+        }
+
+        // Anchor on a neighbour from this page: with no next item, "after the
+        // item above" keeps the move on this page instead of the collection's end.
+        const move = {item_id: parseInt(movedItem.dataset.itemId)};
+        if (nextItem) {
+            move.before_id = parseInt(nextItem.dataset.itemId);
+        } else if (previousItem) {
+            move.after_id = parseInt(previousItem.dataset.itemId);
+        }
+
+        const payload = {moves: [move]};
 
         try {
             const response = await this.httpClient.sendJSON(url, payload);
             await this.httpClient.handleResponse(response, grid, {
-                onSuccess: (data) => this.handleReorderSuccess(data, items),
+                onSuccess: (data) => this.handleReorderSuccess(data),
                 onError: (error) => this.handleReorderError(error),
                 onLoginRedirect: () => this.handleLogoutDetection(),
             });
@@ -207,11 +220,7 @@ class CollectionReorderHandler extends BaseComponent {
         }
     }
 
-    handleReorderSuccess(data, items) {
-        items.forEach((item, index) => {
-            item.dataset.position = index + 1;
-        });
-
+    handleReorderSuccess(data) {
         MessageManager.showGlobalMessage(
             data.message || 'Items reordered successfully!',
             'success',